@@ -0,0 +1,102 @@
+"""
+Benchmark Listener chord matching and dispatch without a real keyboard.
+
+Pushes synthetic key events (hotkey chords mixed with unrelated typing) through
+a ReplayKeySource and reports hook throughput, per-event hook latency and the
+queue wait of dispatched callbacks.
+
+Run from the `source` directory:
+    python ../experimental/bench_listener/bench_listener.py --events 2000000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+import types
+
+SOURCE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'source')
+sys.path.insert(0, SOURCE)
+
+# utils/__init__ imports the screen capture, detection and GUI modules (cv2, mss,
+# ttkbootstrap, color.cfg). Register a bare package instead, so only the
+# listener modules load and the bench runs headless.
+if 'utils' not in sys.modules:
+    package          = types.ModuleType('utils')
+    package.__path__ = [os.path.join(SOURCE, 'utils')]
+    sys.modules['utils'] = package
+
+from utils.key_source import KeyEvent, ReplayKeySource
+from utils.listener   import Listener
+
+
+HOTKEYS = ['alt+s', 'esc', 'alt+q', 'ctrl+shift+x', 'alt+r', 'alt+d']
+NOISE   = list('qwertyuiopasdfghjklzxcvbnm1234567890')
+
+
+def make_events(source: ReplayKeySource, count: int, chord_ratio: float, seed: int):
+    rng    = random.Random(seed)
+    events = []
+    while len(events) < count:
+        if rng.random() < chord_ratio:
+            codes = [source.scan_codes(key)[0] for key in rng.choice(HOTKEYS).split('+')]
+        else:
+            codes = [source.scan_codes(rng.choice(NOISE))[0]]
+        events.extend(KeyEvent('down', code) for code in codes)
+        events.extend(KeyEvent('up', code) for code in reversed(codes))
+    return events[:count]
+
+
+def percentile(values, q):
+    return values[min(int(q * len(values)), len(values) - 1)] if values else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--events'     , type=int  , default=1_000_000)
+    parser.add_argument('--chord-ratio', type=float, default=0.05, help='Share of key strokes that are hotkeys')
+    parser.add_argument('--debounce-ms', type=int  , default=0)
+    parser.add_argument('--sample'     , type=int  , default=100, help='Time every N-th event individually')
+    parser.add_argument('--seed'       , type=int  , default=0)
+    args = parser.parse_args()
+
+    source   = ReplayKeySource()
+    listener = Listener(max_callback_workers=1, debounce_ms=args.debounce_ms, max_queue=64, source=source)
+    for idx, hotkey in enumerate(HOTKEYS):
+        listener.add_hotkey(hotkey, lambda: None, priority=idx < 3)
+    events = make_events(source, args.events, args.chord_ratio, args.seed)
+    source.events.extend(events)
+
+    # Throughput: replay everything through the hook
+    start   = time.perf_counter()
+    source.play()
+    elapsed = time.perf_counter() - start
+
+    # Per-event hook latency on a sample
+    on_event = listener._on_event
+    samples  = []
+    for event in events[::args.sample]:
+        t0 = time.perf_counter_ns()
+        on_event(event)
+        samples.append(time.perf_counter_ns() - t0)
+    samples.sort()
+
+    time.sleep(0.2)  # Let the lanes drain
+    metrics = listener.metrics()
+    listener.stop()
+
+    print(f'Events        : {len(events):,}')
+    print(f'Throughput    : {len(events) / max(elapsed, 1e-9):,.0f} events/s')
+    if samples:
+        print(f'Hook latency  : p50 {percentile(samples, 0.5) / 1e3:.2f}us | '
+              f'p99 {percentile(samples, 0.99) / 1e3:.2f}us | max {samples[-1] / 1e3:.2f}us')
+    else:
+        print('Hook latency  : no samples (raise --events or lower --sample)')
+    for lane, stats in metrics.items():
+        print(f'Queue wait [{lane:>8}]: n={stats["n"]} | p50 {stats["p50"]:.3f}ms | p99 {stats["p99"]:.3f}ms | '
+              f'max {stats["max"]:.3f}ms | merged {stats["merged"]} | dropped {stats["dropped"]}')
+
+
+if __name__ == '__main__':
+    main()
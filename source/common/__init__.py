@@ -0,0 +1,25 @@
+"""Helpers shared by pygomo and utils: latency tracing, process resources and move notation.
+
+Nothing here imports pygomo or utils, so either package can use these modules
+without pulling in the other.
+"""
+
+from .tracing   import Tracer, tracer, span, traced
+from .resources import ResourceLimits, available_cpus, partition_cpus, pin_current_thread
+from .notation  import parse_moves, format_moves
+
+
+__all__ = [
+    "Tracer",
+    "tracer",
+    "span",
+    "traced",
+
+    "ResourceLimits",
+    "available_cpus",
+    "partition_cpus",
+    "pin_current_thread",
+
+    "parse_moves",
+    "format_moves",
+]
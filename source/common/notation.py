@@ -0,0 +1,69 @@
+"""Move-string notation shared by the board helpers and the headless tools.
+
+A move string is a concatenation of cells such as 'h8i9j10': a column letter
+followed by the row number counted from the bottom. Coordinates are (x, y)
+with y counted from the top, as the engine and the screen use them.
+"""
+
+import re
+import numpy as np
+from functools import lru_cache
+
+
+# One letter followed by its row number; anything else between moves is ignored
+_MOVE_PATTERN = re.compile(r"([A-Za-z])(\d+)")
+
+
+def parse_moves(move_string: str, size_x: int = 15, size_y: int = 15) -> np.ndarray:
+    """
+    Parse a string of moves into an array of coordinates in a single pass.
+
+    Moves outside the grid are dropped; separators and stray characters are ignored.
+
+    Args:
+        move_string: String of concatenated moves (e.g., 'a1b2c3').
+        size_x: Grid width (number of columns).
+        size_y: Grid height (number of rows).
+
+    Returns:
+        Array of shape (n, 2) and dtype int32 holding (x, y) for each valid move.
+    """
+    pairs = _MOVE_PATTERN.findall(move_string)
+    if not pairs:
+        return np.empty((0, 2), dtype=np.int32)
+    letters, numbers = zip(*pairs)
+    coords           = np.empty((len(pairs), 2), dtype=np.int32)
+    coords[:, 0]     = np.frombuffer("".join(letters).lower().encode("ascii"), dtype=np.uint8) - 97
+    # Row numbers longer than 9 digits can never be on the grid
+    coords[:, 1]     = size_y - np.fromiter((int(n) if len(n) < 10 else 0 for n in numbers),
+                                            dtype=np.int32, count=len(numbers))
+    in_bounds        = ((coords[:, 0] < size_x) & (coords[:, 1] >= 0) & (coords[:, 1] < size_y))
+    return coords[in_bounds]
+
+
+@lru_cache(maxsize=8)
+def _cell_names(size_x: int, size_y: int) -> np.ndarray:
+    """Lookup table of move strings indexed by [x, y]."""
+    return np.array([[f"{chr(97 + x)}{size_y - y}" for y in range(size_y)] for x in range(size_x)],
+                    dtype=object)
+
+
+def format_moves(coords: np.ndarray, size_x: int = 15, size_y: int = 15) -> str:
+    """
+    Format coordinates back into a concatenated move string (inverse of parse_moves).
+
+    Args:
+        coords: Array-like of shape (n, 2) holding (x, y) coordinates.
+        size_x: Grid width (number of columns).
+        size_y: Grid height (number of rows).
+
+    Returns:
+        Move string (e.g., 'a1b2c3').
+
+    Raises:
+        ValueError: If a coordinate lies outside the grid.
+    """
+    coords = np.asarray(coords, dtype=np.int32).reshape(-1, 2)
+    if coords.size and ((coords < 0).any() or (coords[:, 0] >= size_x).any() or (coords[:, 1] >= size_y).any()):
+        raise ValueError(f"Coordinates out of a {size_x}x{size_y} grid")
+    return "".join(_cell_names(size_x, size_y)[coords[:, 0], coords[:, 1]])
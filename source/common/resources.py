@@ -0,0 +1,169 @@
+"""Scheduling and memory limits for engine processes and latency-critical threads."""
+
+import ctypes
+import logging
+import os
+import sys
+from typing import Any, Callable, Dict, List, Optional, Sequence
+import psutil
+
+
+_WINDOWS = sys.platform.startswith("win")
+
+
+class ResourceLimits:
+    """Resource settings applied to an engine process when it starts.
+
+    OS-level settings (affinity, priority, I/O priority, address-space cap) are
+    applied through psutil / setrlimit; engine-level ones (memory, threads) are
+    sent as Gomocup INFO options.
+
+    Attributes:
+        cpus: CPU indices the engine may run on, or None for all.
+        nice: POSIX nice value (mapped to a priority class on Windows).
+        ionice: I/O priority class: 'idle', 'best_effort' or 'realtime' (POSIX),
+            'idle' maps to very low I/O priority on Windows.
+        max_memory_mb: Memory cap in MiB; sent as INFO max_memory and, on POSIX,
+            enforced with RLIMIT_AS (plus `rlimit_slack_mb` for code and stacks).
+        threads: Search threads, sent as INFO thread_num.
+    """
+
+    IONICE_CLASSES = ("idle", "best_effort", "realtime")
+
+    def __init__(
+        self,
+        cpus           : Optional[Sequence[int]] = None,
+        nice           : Optional[int]           = None,
+        ionice         : Optional[str]           = None,
+        max_memory_mb  : Optional[int]           = None,
+        threads        : Optional[int]           = None,
+        rlimit_slack_mb: int                     = 256
+    ):
+        """
+        Raises:
+            ValueError: If a setting is out of range.
+        """
+        if cpus is not None and not cpus:
+            raise ValueError("cpus must not be empty")
+        if ionice is not None and ionice not in self.IONICE_CLASSES:
+            raise ValueError(f"Unsupported ionice class '{ionice}'. Valid options: {', '.join(self.IONICE_CLASSES)}")
+        if max_memory_mb is not None and max_memory_mb <= 0:
+            raise ValueError("max_memory_mb must be positive")
+        if threads is not None and threads < 1:
+            raise ValueError("threads must be at least 1")
+        self.cpus            = list(cpus) if cpus is not None else None
+        self.nice            = nice
+        self.ionice          = ionice
+        self.max_memory_mb   = max_memory_mb
+        self.threads         = threads
+        self.rlimit_slack_mb = rlimit_slack_mb
+
+    def with_cpus(self, cpus: Optional[Sequence[int]]) -> "ResourceLimits":
+        """Return a copy pinned to other CPUs (e.g. one slice per pooled engine)."""
+        return ResourceLimits(cpus, self.nice, self.ionice, self.max_memory_mb, self.threads, self.rlimit_slack_mb)
+
+    def protocol_options(self) -> Dict[str, Any]:
+        """Return the INFO options carrying the engine-level limits."""
+        options = {}
+        if self.max_memory_mb is not None:
+            options["max_memory"] = self.max_memory_mb * 1024 * 1024
+        if self.threads is not None:
+            options["thread_num"] = self.threads
+        return options
+
+    def preexec(self) -> Optional[Callable[[], None]]:
+        """Return a Popen preexec_fn enforcing the address-space cap (POSIX only)."""
+        if _WINDOWS or self.max_memory_mb is None:
+            return None
+        limit = (self.max_memory_mb + self.rlimit_slack_mb) * 1024 * 1024
+
+        def apply_rlimit():
+            import resource
+            resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+        return apply_rlimit
+
+    def apply(self, pid: int) -> None:
+        """Apply affinity and priorities to a running process.
+
+        Settings the OS refuses (e.g. raising priority without privileges) are
+        logged and skipped rather than failing the engine start.
+        """
+        process = psutil.Process(pid)
+        if self.cpus is not None:
+            self._try(process.cpu_affinity, self.cpus)
+        if self.nice is not None:
+            self._try(process.nice, _priority_class(self.nice) if _WINDOWS else self.nice)
+        if self.ionice is not None:
+            if _WINDOWS:
+                self._try(process.ionice, psutil.IOPRIO_VERYLOW if self.ionice == "idle" else psutil.IOPRIO_NORMAL)
+            else:
+                ioclass = {"idle"       : psutil.IOPRIO_CLASS_IDLE,
+                           "best_effort": psutil.IOPRIO_CLASS_BE,
+                           "realtime"   : psutil.IOPRIO_CLASS_RT}[self.ionice]
+                self._try(process.ionice, ioclass)
+
+    @staticmethod
+    def _try(setter: Callable, *args) -> None:
+        try:
+            setter(*args)
+        except (psutil.Error, OSError, AttributeError, ValueError) as e:
+            logging.warning(f"Could not apply {getattr(setter, '__name__', setter)}{args}: {e}")
+
+
+def _priority_class(nice: int) -> int:
+    """Map a POSIX nice value to the closest Windows priority class."""
+    if nice <= -10:
+        return psutil.HIGH_PRIORITY_CLASS
+    if nice < 0:
+        return psutil.ABOVE_NORMAL_PRIORITY_CLASS
+    if nice == 0:
+        return psutil.NORMAL_PRIORITY_CLASS
+    if nice < 10:
+        return psutil.BELOW_NORMAL_PRIORITY_CLASS
+    return psutil.IDLE_PRIORITY_CLASS
+
+
+def available_cpus() -> List[int]:
+    """Return the CPUs this process may run on."""
+    try:
+        return sorted(psutil.Process().cpu_affinity())
+    except (psutil.Error, AttributeError):
+        return list(range(os.cpu_count() or 1))
+
+
+def partition_cpus(count: int, reserved: int = 0, cpus: Optional[Sequence[int]] = None) -> List[List[int]]:
+    """Split CPUs into `count` disjoint slices after keeping `reserved` CPUs aside.
+
+    The reserved CPUs are the first ones; use `available_cpus()[:reserved]` for
+    the capture/detect threads.
+
+    Raises:
+        ValueError: If there are fewer CPUs than slices.
+    """
+    cpus   = list(cpus) if cpus is not None else available_cpus()
+    usable = cpus[reserved:]
+    if count < 1 or len(usable) < count:
+        raise ValueError(f"Cannot split {len(usable)} CPU(s) into {count} slice(s)")
+    size = len(usable) // count
+    return [usable[i * size:(i + 1) * size] for i in range(count)]
+
+
+def pin_current_thread(cpus: Sequence[int]) -> bool:
+    """Restrict the calling thread to `cpus` (used for capture/detect threads).
+
+    Returns:
+        True if the affinity was applied.
+    """
+    try:
+        if _WINDOWS:
+            mask   = sum(1 << cpu for cpu in cpus)
+            kernel = ctypes.windll.kernel32
+            kernel.GetCurrentThread.restype       = ctypes.c_void_p
+            kernel.SetThreadAffinityMask.argtypes = (ctypes.c_void_p, ctypes.c_size_t)
+            return kernel.SetThreadAffinityMask(kernel.GetCurrentThread(), mask) != 0
+        # On Linux, pid 0 means the calling thread
+        os.sched_setaffinity(0, set(cpus))
+        return True
+    except (AttributeError, OSError) as e:
+        logging.warning(f"Could not pin thread to CPUs {list(cpus)}: {e}")
+        return False
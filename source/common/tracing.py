@@ -0,0 +1,163 @@
+"""Lightweight latency tracing with a fixed-size ring buffer.
+
+Spans are timed with perf_counter_ns and written into preallocated slots. The
+slot index comes from itertools.count, whose next() is atomic under the GIL, so
+recording takes no lock; when the buffer is full the oldest spans are overwritten.
+"""
+
+import csv
+import itertools
+import json
+import os
+import threading
+import time
+from functools import wraps
+from typing    import Callable, Dict, List, Optional, Tuple
+
+
+class _Span:
+    """Context manager recording one span; kept minimal to stay cheap."""
+
+    __slots__ = ("_tracer", "_name", "_start")
+
+    def __init__(self, tracer: "Tracer", name: str):
+        self._tracer = tracer
+        self._name   = name
+        self._start  = 0
+
+    def __enter__(self) -> "_Span":
+        self._start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self._tracer.record(self._name, self._start, time.perf_counter_ns())
+
+
+class Tracer:
+    """Records named spans and summarises or exports them.
+
+    Attributes:
+        enabled: When False, span() and record() are no-ops.
+    """
+
+    def __init__(self, capacity: int = 1 << 16, enabled: bool = True):
+        """
+        Args:
+            capacity: Number of spans kept before the oldest are overwritten.
+
+        Raises:
+            ValueError: If capacity is not positive.
+        """
+        if capacity < 1:
+            raise ValueError("capacity must be positive")
+        self.enabled                   = enabled
+        self._capacity                 = capacity
+        self._names   : List[str]      = []
+        self._name_ids: Dict[str, int] = {}
+        self._name_lock                = threading.Lock()
+        self._reset_slots()
+
+    def _reset_slots(self) -> None:
+        self._name_of = [0] * self._capacity
+        self._thread  = [0] * self._capacity
+        self._start   = [0] * self._capacity
+        self._end     = [0] * self._capacity
+        self._seq     = itertools.count()
+        self._written = 0
+
+    def _name_id(self, name: str) -> int:
+        name_id = self._name_ids.get(name)
+        if name_id is None:
+            with self._name_lock:
+                name_id = self._name_ids.get(name)
+                if name_id is None:
+                    name_id = len(self._names)
+                    self._names.append(name)
+                    self._name_ids[name] = name_id
+        return name_id
+
+    def record(self, name: str, start_ns: int, end_ns: int) -> None:
+        """Record a finished span measured with perf_counter_ns."""
+        if not self.enabled:
+            return
+        index               = next(self._seq)
+        slot                = index % self._capacity
+        self._end[slot]     = 0  # Mark the slot as being written
+        self._name_of[slot] = self._name_id(name)
+        self._thread[slot]  = threading.get_ident()
+        self._start[slot]   = start_ns
+        self._end[slot]     = end_ns
+        if index >= self._written:
+            self._written = index + 1
+
+    def span(self, name: str) -> _Span:
+        """Return a context manager timing the enclosed block as `name`."""
+        return _Span(self, name)
+
+    def traced(self, name: Optional[str] = None) -> Callable:
+        """Decorator timing every call of a function (named after it by default)."""
+        def decorator(func: Callable) -> Callable:
+            span_name = name or func.__qualname__
+
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                start = time.perf_counter_ns()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.record(span_name, start, time.perf_counter_ns())
+            return wrapper
+        return decorator
+
+    def reset(self) -> None:
+        """Forget every recorded span."""
+        self._reset_slots()
+
+    def spans(self) -> List[Tuple[str, int, int, int]]:
+        """Return recorded spans as (name, thread id, start ns, end ns), oldest first."""
+        count = min(self._written, self._capacity)
+        spans = []
+        for slot in range(count):
+            end = self._end[slot]
+            if end:
+                spans.append((self._names[self._name_of[slot]], self._thread[slot], self._start[slot], end))
+        spans.sort(key=lambda item: item[2])
+        return spans
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Return count and p50/p95/p99/max duration (ms) per span name."""
+        durations: Dict[str, List[int]] = {}
+        for name, _, start, end in self.spans():
+            durations.setdefault(name, []).append(end - start)
+        result = {}
+        for name, values in durations.items():
+            values.sort()
+            pick = lambda q: values[min(int(q * len(values)), len(values) - 1)] / 1e6
+            result[name] = {"n": len(values), "p50": pick(0.50), "p95": pick(0.95), "p99": pick(0.99), "max": values[-1] / 1e6}
+        return result
+
+    def export_chrome(self, path: str) -> None:
+        """Write the spans as a Chrome trace (chrome://tracing, Perfetto)."""
+        pid    = os.getpid()
+        events = [
+            {"name": name, "ph": "X", "pid": pid, "tid": tid, "ts": start / 1e3, "dur": (end - start) / 1e3}
+            for name, tid, start, end in self.spans()
+        ]
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+    def export_csv(self, path: str) -> None:
+        """Write the spans as CSV: name, thread, start_ns, end_ns, duration_ns."""
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["name", "thread", "start_ns", "end_ns", "duration_ns"])
+            for name, tid, start, end in self.spans():
+                writer.writerow([name, tid, start, end, end - start])
+
+
+# Process-wide tracer used by the instrumented modules
+tracer = Tracer()
+span   = tracer.span
+traced = tracer.traced
@@ -1,15 +1,29 @@
 """Pygomo: A Python module for interacting with Gomoku engines."""
 
-from .types     import PlayResult, Evaluate, Mate, Move, TimeOut
-from .io_helper import StdoutReader
-from .protocol  import IProtocol, IProtocolHandler, ProtocolFactory, ProtocolHandler
-from .engine    import Engine
-from .gomocup   import GomocupProtocol, GomocupProtocolHandler
+from .types           import PlayResult, Evaluate, Mate, Move, TimeOut
+from .io_helper       import StdoutReader
+from .protocol        import IProtocol, IProtocolHandler, ProtocolFactory, ProtocolHandler
+from .engine          import Engine
+from .gomocup         import GomocupProtocol, GomocupProtocolHandler
+from .supervisor      import EngineSupervisor
+from .records         import GameRecordWriter, GameRecordReader, RECORD_DTYPE, zobrist
+from common.tracing   import Tracer, tracer, span, traced
+from common.resources import ResourceLimits, available_cpus, partition_cpus, pin_current_thread
 
 
 __all__ = [
     # Các lớp lõi mà người dùng chắc chắn cần
     "Engine",
+    "EngineSupervisor",
+    "GameRecordWriter",
+    "GameRecordReader",
+    "RECORD_DTYPE",
+    "zobrist",
+
+    "ResourceLimits",
+    "available_cpus",
+    "partition_cpus",
+    "pin_current_thread",
     "ProtocolFactory",
         
     "IProtocol",
@@ -26,4 +40,9 @@ __all__ = [
     "GomocupProtocol",
     "GomocupProtocolHandler",
     "ProtocolHandler",
+
+    "Tracer",
+    "tracer",
+    "span",
+    "traced",
 ]
\ No newline at end of file
@@ -0,0 +1,315 @@
+"""Columnar export of game records and vectorized queries over them.
+
+Game records (see records.py) are converted to Arrow tables and written as a
+Parquet dataset partitioned by date and engine:
+
+    root/date=2025-07-10/engine=rapfi/part-<source>-<offset>-0.parquet
+
+Exports are incremental: root/_exports.json remembers how many records of each
+record file were exported, so re-exporting a growing file only appends its new
+records. game_id restarts in every record file, so games are told apart by
+`game_key`, the capture time (ns) of their first move.
+
+Queries operate on whole columns with numpy, so comparing engine builds over
+thousands of games is a scan rather than a log parse. pyarrow is optional and
+only needed by this module.
+
+Run with:
+    python -m pygomo.analytics export games.agrec DATASET --engine NAME
+    python -m pygomo.analytics report DATASET [--baseline A --candidate B]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import numpy as np
+from typing   import Dict, Optional, Sequence
+from .records import GameRecordReader, ENGINE
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.compute
+        import pyarrow.dataset
+        return pyarrow
+    except ImportError:
+        raise RuntimeError("pyarrow is required for analytics export (pip install pyarrow)") from None
+
+
+# Record fields exported as plain columns (pv is exported as a fixed-size list)
+COLUMNS = ("game_id", "ply", "x", "y", "player", "flags", "time_ns", "think_ms",
+           "score", "board_hash", "nodes", "nps", "depth", "seldepth")
+
+# Export progress per record file, kept next to the data (ignored by dataset discovery)
+STATE_FILE = "_exports.json"
+
+
+def game_starts(records: np.ndarray) -> np.ndarray:
+    """Return the capture time (ns) of each record's game start, vectorized.
+
+    Only games that start inside `records` get their true start; pass the whole
+    file to look up games of a slice (see export_parquet()).
+    """
+    if not len(records):
+        return np.empty(0, dtype=np.uint64)
+    ids    = records["game_id"]
+    starts = np.flatnonzero(np.r_[True, ids[1:] != ids[:-1]])
+    return np.repeat(records["time_ns"][starts], np.diff(np.r_[starts, len(ids)]))
+
+
+def game_dates(records: np.ndarray, starts: Optional[np.ndarray] = None) -> np.ndarray:
+    """Return the UTC date (datetime64[D]) of each record's game start, vectorized."""
+    starts = game_starts(records) if starts is None else starts
+    return starts.astype("datetime64[ns]").astype("datetime64[D]")
+
+
+def records_to_table(records: np.ndarray, engine: str, starts: Optional[np.ndarray] = None):
+    """Convert a structured record array into an Arrow table with game_key/date/engine columns.
+
+    Args:
+        records: Structured record array.
+        engine: Engine name stored in the engine column.
+        starts: Game start time of each record; computed from `records` if None.
+    """
+    pa     = _pyarrow()
+    starts = game_starts(records) if starts is None else starts
+    arrays = {name: pa.array(np.ascontiguousarray(records[name])) for name in COLUMNS}
+    pv     = np.ascontiguousarray(records["pv"]).reshape(-1)
+    arrays["pv"]       = pa.FixedSizeListArray.from_arrays(pa.array(pv), records["pv"].shape[1])
+    arrays["game_key"] = pa.array(starts.astype(np.int64))
+    arrays["date"]     = pa.array(game_dates(records, starts).astype(str))
+    arrays["engine"]   = pa.DictionaryArray.from_arrays(pa.array(np.zeros(len(records), dtype=np.int32)),
+                                                        pa.array([engine]))
+    return pa.table(arrays)
+
+
+def _load_state(root: str) -> Dict[str, Dict[str, int]]:
+    try:
+        with open(os.path.join(root, STATE_FILE), "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_state(root: str, state: Dict[str, Dict[str, int]]) -> None:
+    os.makedirs(root, exist_ok=True)
+    path = os.path.join(root, STATE_FILE)
+    with open(path + ".tmp", "w") as f:
+        json.dump(state, f, indent=1)
+    os.replace(path + ".tmp", path)
+
+
+def export_parquet(path: str, root: str, engine: str, compression: str = "zstd", chunk_size: int = 1 << 20) -> int:
+    """Append the records of a game record file not exported yet to a Parquet dataset.
+
+    Batches of `chunk_size` records are converted and written one at a time.
+    Part files are named after the file and the first exported record, so an
+    export interrupted before its progress was saved is overwritten, not
+    duplicated, by the next run. A record file that was replaced (shorter, or a
+    different first record) is exported again from the start.
+
+    Args:
+        path: Game record file.
+        root: Dataset directory.
+        engine: Engine name used as the partition value.
+        compression: Parquet codec.
+        chunk_size: Records converted per batch.
+
+    Returns:
+        Number of records exported by this call.
+
+    Raises:
+        RuntimeError: If pyarrow is not installed.
+    """
+    pa      = _pyarrow()
+    reader  = GameRecordReader(path)
+    records = reader.records
+    source  = os.path.realpath(path)
+    state   = _load_state(root)
+    done    = state.get(source, {})
+    offset  = done.get("records", 0)
+    first   = int(records["time_ns"][0]) if len(records) else 0
+    if offset > len(records) or done.get("first", first) != first:
+        offset = 0
+    if offset == len(records):
+        return 0
+
+    # Games continuing from an earlier export (or spanning batches) keep the key of their first move
+    ids        = records["game_id"]
+    bounds     = np.flatnonzero(np.r_[True, ids[1:] != ids[:-1]])
+    game_ids   = ids[bounds]
+    start_time = records["time_ns"][bounds]
+
+    def batches():
+        for chunk in reader.iter_chunks(chunk_size, offset):
+            starts = start_time[np.searchsorted(game_ids, chunk["game_id"])]
+            yield from records_to_table(chunk, engine, starts).to_batches()
+
+    schema = records_to_table(records[:0], engine).schema
+    key    = hashlib.sha1(source.encode()).hexdigest()[:12]
+    pa.dataset.write_dataset(
+        pa.RecordBatchReader.from_batches(schema, batches()),
+        root,
+        format                 = "parquet",
+        partitioning           = ["date", "engine"],
+        partitioning_flavor    = "hive",
+        basename_template      = f"part-{key}-{offset}-{{i}}.parquet",
+        existing_data_behavior = "overwrite_or_ignore",
+        file_options           = pa.dataset.ParquetFileFormat().make_write_options(compression=compression),
+    )
+    state[source] = {"records": len(records), "first": first}
+    _save_state(root, state)
+    return len(records) - offset
+
+
+def load(root: str, engines: Optional[Sequence[str]] = None, since: Optional[str] = None, columns=None):
+    """Read a dataset, pruning partitions by engine and date (YYYY-MM-DD).
+
+    Raises:
+        RuntimeError: If pyarrow is not installed.
+    """
+    pa      = _pyarrow()
+    pc      = pa.compute
+    dataset = pa.dataset.dataset(root, format="parquet", partitioning="hive")
+    filter_ = None
+    if engines:
+        filter_ = pc.field("engine").isin(list(engines))
+    if since:
+        cond    = pc.field("date") >= since
+        filter_ = cond if filter_ is None else filter_ & cond
+    return dataset.to_table(columns=columns, filter=filter_)
+
+
+def _column(table, name: str) -> np.ndarray:
+    column = table.column(name)
+    if hasattr(column.type, "value_type"):  # Dictionary-encoded (partition columns)
+        column = column.cast(column.type.value_type)
+    return column.to_numpy()
+
+
+def _own_moves(table) -> Dict[str, np.ndarray]:
+    """Our moves sorted by engine, game and ply, as numpy columns."""
+    engine = _column(table, "engine").astype(str)
+    date   = _column(table, "date").astype(str)
+    game   = _column(table, "game_key")
+    ply    = _column(table, "ply")
+    mask   = _column(table, "player") == ENGINE
+    order  = np.lexsort((ply[mask], game[mask], engine[mask]))
+    cols   = {"engine": engine, "date": date, "game_key": game, "game_id": _column(table, "game_id"), "ply": ply}
+    for name in ("score", "think_ms", "nps", "depth"):
+        cols[name] = _column(table, name)
+    return {name: values[mask][order] for name, values in cols.items()}
+
+
+def eval_swing(table) -> Dict[str, np.ndarray]:
+    """Change of our evaluation between consecutive own moves of a game.
+
+    Returns:
+        Columns engine, date, game_key, game_id, ply, swing (score - previous
+        score); the first own move of every game has swing 0.
+    """
+    moves = _own_moves(table)
+    score = moves["score"].astype(np.int64)
+    swing = np.diff(score, prepend=score[:1])
+    same  = np.r_[False, (moves["game_key"][1:] == moves["game_key"][:-1])
+                       & (moves["engine"][1:] == moves["engine"][:-1])]
+    swing[~same] = 0
+    return {"engine": moves["engine"], "date": moves["date"], "game_key": moves["game_key"],
+            "game_id": moves["game_id"], "ply": moves["ply"], "swing": swing}
+
+
+def time_usage(table, max_ply: int = 225) -> Dict[str, np.ndarray]:
+    """Mean think time (ms) of our moves per ply, for each engine.
+
+    Returns:
+        {engine: array of length max_ply with the mean think time (NaN if no data)}.
+    """
+    moves  = _own_moves(table)
+    ply    = np.minimum(moves["ply"], max_ply - 1)
+    result = {}
+    for engine in np.unique(moves["engine"]):
+        mask   = moves["engine"] == engine
+        total  = np.bincount(ply[mask], weights=moves["think_ms"][mask], minlength=max_ply)
+        count  = np.bincount(ply[mask], minlength=max_ply)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            result[str(engine)] = total / count
+    return result
+
+
+def nps_summary(table) -> Dict[str, Dict[str, float]]:
+    """Median/p10/p90 nps and mean depth of our searched moves per engine."""
+    moves  = _own_moves(table)
+    result = {}
+    for engine in np.unique(moves["engine"]):
+        mask = (moves["engine"] == engine) & (moves["nps"] > 0)
+        if not mask.any():
+            continue
+        nps  = moves["nps"][mask]
+        result[str(engine)] = {
+            "moves" : int(mask.sum()),
+            "median": float(np.median(nps)),
+            "p10"   : float(np.percentile(nps, 10)),
+            "p90"   : float(np.percentile(nps, 90)),
+            "depth" : float(moves["depth"][mask].mean()),
+        }
+    return result
+
+
+def nps_regression(table, baseline: str, candidate: str, threshold: float = 0.05) -> Dict[str, float]:
+    """Compare the median nps of two engine builds.
+
+    Returns:
+        Baseline and candidate medians, the relative change, and `regressed`
+        (1.0 when the candidate is slower by more than `threshold`).
+
+    Raises:
+        ValueError: If either engine has no searched moves in the table.
+    """
+    summary = nps_summary(table)
+    for engine in (baseline, candidate):
+        if engine not in summary:
+            raise ValueError(f"No searched moves for engine '{engine}'")
+    base   = summary[baseline]["median"]
+    cand   = summary[candidate]["median"]
+    change = (cand - base) / base if base else 0.0
+    return {"baseline": base, "candidate": cand, "change": change, "regressed": float(change < -threshold)}
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Export game records to Parquet and report on them.")
+    sub    = parser.add_subparsers(dest="command", required=True)
+
+    export = sub.add_parser("export", help="Append the new records of a game record file to a dataset")
+    export.add_argument("records")
+    export.add_argument("root")
+    export.add_argument("--engine", default=None, help="Partition value (defaults to the record file name)")
+
+    report = sub.add_parser("report", help="Summarise a dataset")
+    report.add_argument("root")
+    report.add_argument("--since", default=None, help="First date (YYYY-MM-DD)")
+    report.add_argument("--baseline", default=None)
+    report.add_argument("--candidate", default=None)
+    args = parser.parse_args(argv)
+
+    if args.command == "export":
+        engine = args.engine or os.path.splitext(os.path.basename(args.records))[0]
+        print(f"Exported {export_parquet(args.records, args.root, engine)} records for '{engine}'")
+        return
+
+    table = load(args.root, since=args.since)
+    for engine, stats in nps_summary(table).items():
+        print(f"{engine}: {stats['moves']} moves | nps median {stats['median']:.0f} "
+              f"(p10 {stats['p10']:.0f}, p90 {stats['p90']:.0f}) | depth {stats['depth']:.1f}")
+    swings = eval_swing(table)
+    if len(swings["swing"]):
+        print(f"Largest eval swing: {np.abs(swings['swing']).max()}")
+    if args.baseline and args.candidate:
+        result = nps_regression(table, args.baseline, args.candidate)
+        print(f"NPS {args.baseline} -> {args.candidate}: {result['change'] * 100:+.1f}%"
+              f"{' (regression)' if result['regressed'] else ''}")
+
+
+if __name__ == "__main__":
+    main()
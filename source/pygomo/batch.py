@@ -0,0 +1,221 @@
+"""Batch analysis of many positions on a pool of engines.
+
+Positions come from a text file, one move string per line (optionally
+"id<TAB>moves"), or from a game record file, in which case every position
+where we were to move is analysed. Positions are spread over an EnginePool;
+results are appended to a JSON-lines file as soon as each finishes, so an
+interrupted run resumes where it stopped by skipping ids already in the output.
+
+Output lines:
+    {"id": "...", "moves": "h8i9", "result": PlayResult.to_dict()}
+    {"id": "...", "moves": "h8i9", "error": "..."}   (retried on resume)
+
+Every move of a line ("moves", result "move" and info "pv") is written in the
+move-string notation of the input (see common/notation.py).
+
+Run with:
+    python -m pygomo.batch ENGINE POSITIONS OUTPUT [--workers N] [--time MS | --nodes N]
+"""
+
+import argparse
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing             import Iterator, List, Optional, Sequence, Set, Tuple
+from common.notation    import parse_moves, format_moves
+from common.resources   import ResourceLimits
+from .records           import GameRecordReader, ENGINE
+from .server            import EnginePool, to_board
+from .types             import Move, PlayResult
+
+
+Position = Tuple[str, List[Tuple[int, int, int]]]
+
+
+def read_text_positions(path: str, board_size: int = 15) -> Iterator[Position]:
+    """Yield (id, BOARD triples) from a file of move strings; the last move is the opponent's."""
+    name = os.path.basename(path)
+    with open(path, "r") as f:
+        for number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            pos_id, _, moves = line.rpartition("\t")
+            coords           = parse_moves(moves, board_size, board_size)
+            yield pos_id or f"{name}:{number}", to_board(coords.tolist())
+
+
+def read_record_positions(path: str, every_ply: bool = False) -> Iterator[Position]:
+    """Yield the positions of a game record file where we were to move (or every ply)."""
+    reader = GameRecordReader(path)
+    for start, stop in reader.game_bounds():
+        game  = reader.records[start:stop]
+        moves = GameRecordReader.moves(game).tolist()
+        for ply in range(1, len(moves)):
+            if every_ply or moves[ply][2] == ENGINE:
+                # The side to move is "1" for the engine: flip players when it was the opponent's turn
+                board = [tuple(m) for m in moves[:ply]]
+                if moves[ply][2] != ENGINE:
+                    board = [(x, y, 3 - player) for x, y, player in board]
+                yield f"{int(game['game_id'][0])}:{ply}", board
+
+
+def result_entry(result: PlayResult, board_size: int = 15) -> dict:
+    """Return PlayResult.to_dict() with the move and PV in move-string notation."""
+    def cell(move: Move) -> str:
+        return format_moves([move.to_num()], board_size, board_size)
+
+    entry = result.to_dict()
+    if result.move is not None:
+        entry["move"] = cell(result.move)
+    if "pv" in result.info:
+        entry["info"]["pv"] = [cell(move) for move in result.info["pv"]]
+    return entry
+
+
+def read_done(path: str) -> Set[str]:
+    """Return ids with a result in an existing output file (errors and torn lines are ignored)."""
+    done = set()
+    if not os.path.exists(path):
+        return done
+    with open(path, "r") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if "result" in entry:
+                done.add(entry["id"])
+    return done
+
+
+class ResultWriter:
+    """Appends JSON lines from many threads, flushing each line."""
+
+    def __init__(self, path: str):
+        self._lock = threading.Lock()
+        needs_nl   = os.path.exists(path) and os.path.getsize(path) > 0 and not self._ends_with_newline(path)
+        self._file = open(path, "a")
+        if needs_nl:
+            self._file.write("\n")  # Terminate a line torn by an interruption
+
+    @staticmethod
+    def _ends_with_newline(path: str) -> bool:
+        with open(path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b"\n"
+
+    def write(self, entry: dict) -> None:
+        line = json.dumps(entry) + "\n"
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+def run(
+    pool          : EnginePool,
+    positions     : Iterator[Position],
+    output        : str,
+    turn_time     : int,
+    nodes         : Optional[int] = None,
+    board_size    : int           = 15,
+    workers       : int           = 1,
+    progress_every: int           = 100
+) -> Tuple[int, int, int]:
+    """Analyse positions on the pool and stream results to `output`.
+
+    Returns:
+        (analysed, failed, skipped) counts.
+    """
+    done      = read_done(output)
+    writer    = ResultWriter(output)
+    in_flight = threading.BoundedSemaphore(2 * workers)
+    counts    = {"ok": 0, "failed": 0}
+    lock      = threading.Lock()
+    started   = time.monotonic()
+    skipped   = 0
+
+    def analyse(pos_id: str, board: List[Tuple[int, int, int]]) -> None:
+        entry = {"id": pos_id}
+        try:
+            entry["moves"] = format_moves([(x, y) for x, y, _ in board], board_size, board_size)
+            with pool.lease() as engine:
+                if nodes is not None:
+                    engine.protocol.configure({"max_node": nodes})
+                try:
+                    result = engine.protocol.analyse(board, turn_time)
+                finally:
+                    if nodes is not None:
+                        # Pooled engines are shared: lift the limit (0 = none) for the next lessee
+                        engine.protocol.configure({"max_node": 0})
+                entry["result"] = result_entry(result, board_size)
+        except Exception as e:
+            entry["error"] = str(e) or type(e).__name__
+        finally:
+            in_flight.release()
+        writer.write(entry)
+        with lock:
+            counts["ok" if "result" in entry else "failed"] += 1
+            total = counts["ok"] + counts["failed"]
+            if total % progress_every == 0:
+                rate = total / max(time.monotonic() - started, 1e-9)
+                logging.info(f"{total} analysed ({counts['failed']} failed), {rate:.1f} positions/s")
+
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="Batch")
+    try:
+        for pos_id, board in positions:
+            if pos_id in done:
+                skipped += 1
+                continue
+            in_flight.acquire()  # Keep memory flat: only a few positions are queued at a time
+            executor.submit(analyse, pos_id, board)
+    except KeyboardInterrupt:
+        logging.warning("Interrupted; finishing running positions (rerun to resume)")
+        executor.shutdown(wait=True, cancel_futures=True)
+    finally:
+        # Workers write until they finish: close the file only after them, whatever stopped the loop
+        executor.shutdown(wait=True)
+        writer.close()
+    return counts["ok"], counts["failed"], skipped
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Analyse many positions on a pool of engines.")
+    parser.add_argument("engine", help="Path to the engine executable")
+    parser.add_argument("positions", help="Move-string file, or a game record file (.agrec)")
+    parser.add_argument("output", help="JSON-lines result file (appended; rerun to resume)")
+    parser.add_argument("--protocol", default="gomocup")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Number of engine processes")
+    parser.add_argument("--threads", type=int, default=1, help="Search threads per engine")
+    parser.add_argument("--time", type=int, default=1000, help="Time budget per position (ms)")
+    parser.add_argument("--nodes", type=int, default=None,
+                        help="Node budget per position (INFO max_node; --time stays the upper bound)")
+    parser.add_argument("--board-size", type=int, default=15)
+    parser.add_argument("--every-ply", action="store_true", help="With records: analyse every ply, not just ours")
+    parser.add_argument("--pin", action="store_true", help="Pin every engine to its own CPUs")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    if args.positions.endswith(".agrec"):
+        positions = read_record_positions(args.positions, args.every_ply)
+    else:
+        positions = read_text_positions(args.positions, args.board_size)
+
+    pool = EnginePool(args.engine, args.protocol, args.workers, args.board_size,
+                      limits=ResourceLimits(threads=args.threads), pin=args.pin)
+    try:
+        ok, failed, skipped = run(pool, positions, args.output, args.time, args.nodes,
+                                  args.board_size, args.workers)
+    finally:
+        pool.close()
+    logging.info(f"Done: {ok} analysed, {failed} failed, {skipped} already in {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,24 +1,39 @@
 """Engine management for Gomoku engines."""
 
 import subprocess
-from .protocol  import ProtocolFactory, ProtocolHandler
-from .io_helper import StdoutReader
+import threading
+from contextlib       import contextmanager
+from typing           import Iterator, List, Optional
+from common.resources import ResourceLimits
+from common.tracing   import span
+from .protocol        import ProtocolFactory, ProtocolHandler
+from .io_helper       import StdoutReader
 
 
 class Engine:
     """Manages a Gomoku engine subprocess.
 
+    The pipes are binary: stdout is read in large chunks by the protocol handler
+    and commands sent inside `batch()` are coalesced into one write and flush.
+
+    The engine remembers whether a search (TURN, BEGIN or BOARD) is still
+    unanswered, so settle() can stop it and drop its late answer before the
+    engine is handed to a new game or pool lessee.
+
     Attributes:
         id: Process ID of the engine.
         protocol: Protocol instance for communication.
     """
 
-    def __init__(self, path: str, protocol_type: str):
+    SEARCH_COMMANDS = ("TURN", "BEGIN", "BOARD")
+
+    def __init__(self, path: str, protocol_type: str, limits: Optional[ResourceLimits] = None):
         """Initialize the engine with a given protocol.
 
         Args:
             path: Path to the engine executable.
             protocol_type: Type of protocol (e.g., 'gomocup').
+            limits: CPU affinity, priority and memory/thread limits for the engine.
 
         Raises:
             FileNotFoundError: If the engine executable is not found.
@@ -27,21 +42,56 @@ class Engine:
         try:
             self._engine = subprocess.Popen(
                 path,
-                stdin    = subprocess.PIPE,
-                stdout   = subprocess.PIPE,
-                bufsize  = 1,
-                universal_newlines=True,
+                stdin       = subprocess.PIPE,
+                stdout      = subprocess.PIPE,
+                bufsize     = -1,
+                preexec_fn  = limits.preexec() if limits else None,
             )
         except FileNotFoundError:
             raise FileNotFoundError(f"Engine executable not found at: {path}")
 
         self.id           = self._engine.pid
+        self.limits       = limits
+        self._write_lock  = threading.Lock()
+        self._searching   = False
+        self._local       = threading.local()
         self._std_reader  = ProtocolHandler.create(protocol_type, self._engine.stdout).get()
         self.protocol     = ProtocolFactory.create(
             protocol_type,
             self._send,
             self._receive,
+            self.batch,
         )
+        if limits is not None:
+            limits.apply(self.id)
+            self.protocol.configure(limits.protocol_options())
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """Coalesce every command sent by this thread inside the block into one write.
+
+        Batches nest; the outermost block flushes. Commands sent from other
+        threads (e.g. a hotkey sending STOP) are not delayed.
+        """
+        pending: List[bytes] = getattr(self._local, "pending", None)
+        if pending is not None:
+            yield
+            return
+        self._local.pending = []
+        try:
+            yield
+        finally:
+            pending             = self._local.pending
+            self._local.pending = None
+            if pending:
+                self._write(b"".join(pending))
+
+    def _write(self, data: bytes) -> None:
+        if self._engine.poll() is not None:
+            raise RuntimeError("Engine process has terminated unexpectedly")
+        with self._write_lock:
+            self._engine.stdin.write(data)
+            self._engine.stdin.flush()
 
     def _send(self, *command: str) -> None:
         """Send a command to the engine.
@@ -54,9 +104,15 @@ class Engine:
         """
         if self._engine.poll() is not None:
             raise RuntimeError("Engine process has terminated unexpectedly")
-        cmd = " ".join(str(c).upper() if i == 0 else str(c) for i, c in enumerate(command))
-        self._engine.stdin.write(f"{cmd}\n")
-        self._engine.stdin.flush()
+        cmd     = " ".join(str(c).upper() if i == 0 else str(c) for i, c in enumerate(command))
+        data    = f"{cmd}\n".encode()
+        if cmd.split(None, 1)[0] in self.SEARCH_COMMANDS:
+            self._searching = True
+        pending = getattr(self._local, "pending", None)
+        if pending is not None:
+            pending.append(data)
+            return
+        self._write(data)
 
     def _receive(self, name: str, reset: bool = False, timeout: float = 0.0) -> str:
         """Receive a message from the engine.
@@ -69,11 +125,77 @@ class Engine:
         Returns:
             The received message, or empty string if none.
         """
-        return self._std_reader.get(name, reset=reset, timeout=timeout)
+        if timeout <= 0:
+            # Non-blocking polls are too frequent and too short to be worth a span
+            line = self._std_reader.get(name, reset=reset, timeout=timeout)
+        else:
+            with span(f"Engine._receive:{name}"):
+                line = self._std_reader.get(name, reset=reset, timeout=timeout)
+        if line and name == "coord":
+            self._searching = False
+        return line
+
+    def is_searching(self) -> bool:
+        """Return True while a search command has not been answered with a move."""
+        return self._searching
+
+    def settle(self, timeout: float = 1.0) -> bool:
+        """Stop a running search and drop every pending answer and ponder state.
+
+        Call before the engine serves another game or request, so a late move
+        from the previous search can't be read as the answer to the next one.
+
+        Args:
+            timeout: Maximum time (seconds) to wait for the stopped search's move.
+
+        Returns:
+            True if the engine is idle, False if it never answered STOP (it
+            should then be restarted).
+        """
+        idle = True
+        if self._searching and self.is_alive():
+            try:
+                self.protocol.stop()
+                idle = bool(self._std_reader.get("coord", timeout=timeout))
+            except RuntimeError:
+                idle = False
+        self._searching = False
+        self._std_reader.get("coord"  , reset=True)
+        self._std_reader.get("message", reset=True)
+        self.protocol.clear_ponder()
+        return idle
+
+    def is_alive(self) -> bool:
+        """Return True while the engine process is running."""
+        return self._engine.poll() is None
 
     def terminate(self) -> None:
-        """Terminate the engine process."""
+        """Terminate the engine process, killing it if it ignores END for a second."""
 
         # Terminate engine by protocol command
-        self.protocol.quit()
-        self._engine.wait(timeout=1.0)
\ No newline at end of file
+        try:
+            self.protocol.quit()
+            self._engine.wait(timeout=1.0)
+        except (RuntimeError, OSError, subprocess.TimeoutExpired):
+            pass
+        self.kill()
+
+    def kill(self, timeout: float = 1.0) -> None:
+        """Kill the engine process, reap it and release its pipes and reader thread.
+
+        Args:
+            timeout: Maximum time (seconds) to wait for the process to exit.
+        """
+        if self.is_alive():
+            self._engine.kill()
+        try:
+            self._engine.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            pass
+        # The reader sees EOF once the process is gone; only then close the pipes under it
+        self._std_reader.stop()
+        for pipe in (self._engine.stdin, self._engine.stdout):
+            try:
+                pipe.close()
+            except OSError:
+                pass
\ No newline at end of file
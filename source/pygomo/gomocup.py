@@ -1,25 +1,29 @@
 """Gomocup protocol implementation for Gomoku engines."""
 
 import re
-from typing     import Callable, Dict, TextIO
-from .io_helper import StdoutReader
-from .types     import PlayResult, TimeOut
-from .protocol  import IProtocol, IProtocolHandler
+from contextlib     import nullcontext
+from threading      import Lock
+from typing         import Any, Callable, ContextManager, Dict, IO, Iterable, Optional, Tuple
+from common.tracing import traced
+from .io_helper     import StdoutReader
+from .types         import PlayResult, TimeOut
+from .protocol      import IProtocol, IProtocolHandler
 
 
 class GomocupProtocolHandler(IProtocolHandler):
     """Handles Gomocup protocol output."""
 
-    def __init__(self, stream: TextIO):
+    def __init__(self, stream: IO):
         """Initialize with an engine output stream.
 
         Args:
-            stream: Text stream from the engine.
+            stream: Binary (preferred) or text stream from the engine.
         """
         self._stdout_reader = StdoutReader(stream)
-        self._stdout_reader.add_category("coord"  , self._is_coord)
-        self._stdout_reader.add_category("message", self._is_message)
-        self._stdout_reader.add_category("output" , self._is_output)
+        # Search info is only ever read as "the latest one"; keep a single slot
+        self._stdout_reader.add_category("coord"  , self._is_coord  , policy="ring", maxlen=64)
+        self._stdout_reader.add_category("message", self._is_message, policy="latest")
+        self._stdout_reader.add_category("output" , self._is_output , policy="ring", maxlen=256)
 
     def _is_coord(self, line: str) -> bool:
         """Check if a line contains coordinates."""
@@ -39,18 +43,41 @@ class GomocupProtocolHandler(IProtocolHandler):
 
 
 class GomocupProtocol(IProtocol):
-    """Implements the Gomocup protocol for Gomoku engines."""
-
-    def __init__(self, sender: Callable, reader: Callable):
+    """Implements the Gomocup protocol for Gomoku engines.
+
+    Options passed to configure() are compared against a shadow copy of what the
+    engine already has and only the changes are staged. Staged options are sent
+    in one write by commit(), which runs automatically right before TURN, BOARD
+    and any other command.
+
+    Pondering: Gomocup has no ponder command, so ponder() plays the predicted
+    opponent reply with TURN and lets the engine search on the opponent's time.
+    On a hit the running search is simply awaited; on a miss the search is
+    stopped and both the prediction and the engine's answer are taken back.
+    """
+
+    def __init__(
+        self,
+        sender: Callable,
+        reader: Callable,
+        batch : Callable[[], ContextManager] = nullcontext
+    ):
         """Initialize with sender and reader functions.
 
         Args:
             sender: Function to send commands.
             reader: Function to receive responses.
+            batch: Context manager factory that coalesces sends into one write.
         """
-        self._sender = sender
-        self._reader = reader
-
+        self._sender                      = sender
+        self._reader                      = reader
+        self._batch                       = batch
+        self._options_lock                = Lock()
+        self._options    : Dict[str, Any] = {}
+        self._pending    : Dict[str, Any] = {}
+        self._ponder_move: Optional[str]  = None
+
+    @traced("GomocupProtocol.play")
     def play(self, move: str, time_left: int) -> "PlayResult":
         """Request a move from the engine.
 
@@ -73,17 +100,104 @@ class GomocupProtocol(IProtocol):
             raise TimeOut(f"Timeout: Engine did not return move after {time_left}ms")
         return PlayResult(best_move, info)
 
+    def analyse(self, moves: Iterable[Tuple[int, int, int]], turn_time: int, timeout: float = None) -> "PlayResult":
+        """Search a whole position for a fixed time and return the engine's move.
+
+        Args:
+            moves: (x, y, player) triples of the position, as for send_board().
+            turn_time: Time budget for this search in milliseconds.
+            timeout: Maximum time to wait (seconds); defaults to twice the budget.
+
+        Returns:
+            PlayResult with the engine's move and info.
+
+        Raises:
+            TimeOut: If no move is returned in time.
+        """
+        timeout = timeout if timeout is not None else max(2 * turn_time / 1000.0, 1.0)
+        # Drop answers left over from an earlier, aborted search
+        self._reader("coord"  , reset=True)
+        self._reader("message", reset=True)
+        self.configure({"timeout_turn": turn_time, "time_left": 2 ** 31 - 1})
+        self.send_board(moves)
+        best_move = self._reader("coord"  , timeout=timeout)
+        info      = self._reader("message", reset=True)
+        if not best_move:
+            self.stop()
+            raise TimeOut(f"Timeout: Engine did not return move after {turn_time}ms")
+        return PlayResult(best_move, info)
+
     def stop(self) -> None:
         """Stop the engine's computation."""
         self._sender("stop")
 
+    def ponder(self, predicted: str, time_left: int) -> None:
+        """Start searching on the opponent's time, assuming `predicted` is their reply.
+
+        Args:
+            predicted: Predicted opponent move (e.g., '5,5'), usually PV[1].
+            time_left: Time remaining in milliseconds.
+        """
+        self.configure({"time_left": time_left})
+        self.send_move(predicted)
+        self._ponder_move = predicted
+
+    def pondering(self) -> Optional[str]:
+        """Return the move being pondered on, or None."""
+        return self._ponder_move
+
+    def ponder_hit(self) -> None:
+        """The opponent played the predicted move: keep the running search."""
+        self._ponder_move = None
+
+    def clear_ponder(self) -> None:
+        """Forget the ponder prediction (the search itself is stopped by Engine.settle)."""
+        self._ponder_move = None
+
+    def ponder_miss(self, timeout: float = 1.0) -> bool:
+        """The opponent played something else: abort the search and undo the prediction.
+
+        Args:
+            timeout: Maximum time (seconds) to wait for the aborted search's move.
+
+        Returns:
+            True if the engine position was restored, False if the engine never
+            answered the aborted search (the caller should resend the position).
+        """
+        predicted         = self._ponder_move
+        self._ponder_move = None
+        if predicted is None:
+            return True
+        self.stop()
+        answer = self._reader("coord", timeout=timeout)
+        if not answer:
+            return False
+        with self._batch():
+            self._sender("takeback", answer.replace(" ", ""))
+            self._sender("takeback", predicted)
+        return True
+
     def quit(self) -> None:
         """End the engine session."""
         self._sender("end")
 
     def send_move(self, move: str) -> None:
-        """Send a move to the engine."""
-        self._sender("turn", move)
+        """Send a move to the engine, committing staged options first."""
+        with self._batch():
+            self.commit()
+            self._sender("turn", move)
+
+    def send_board(self, moves: Iterable[Tuple[int, int, int]]) -> None:
+        """Send a whole position with BOARD, committing staged options first.
+
+        Args:
+            moves: (x, y, player) triples in play order; player is 1 for own
+                stones and 2 for the opponent's.
+        """
+        lines = "\n".join(f"{x},{y},{player}" for x, y, player in moves)
+        with self._batch():
+            self.commit()
+            self._sender(f"board\n{lines}\ndone" if lines else "board\ndone")
 
     def is_ready(self, board_size: int = 15, timeout: float = 0.0) -> bool:
         """Check if the engine is ready.
@@ -95,18 +209,45 @@ class GomocupProtocol(IProtocol):
         Returns:
             True if the engine responds with 'ok', False otherwise.
         """
+        # A (re)started engine falls back to its defaults
+        with self._options_lock:
+            self._pending.update(self._options)
+            self._options.clear()
         self._sender("start", board_size)
         return self._reader("output", reset=True, timeout=timeout) == "ok"
 
     def send_command(self, *command: str) -> None:
-        """Send a generic command to the engine."""
-        self._sender(*command)
+        """Send a generic command to the engine, committing staged options first."""
+        with self._batch():
+            self.commit()
+            self._sender(*command)
 
     def configure(self, options: Dict) -> None:
-        """Configure engine options.
+        """Stage engine options; only values that differ from the engine's are kept.
 
         Args:
             options: Dictionary of option key-value pairs.
         """
-        for key, value in options.items():
-            self._sender("info", key, value)
+        with self._options_lock:
+            for key, value in options.items():
+                if key in self._options and self._options[key] == value:
+                    self._pending.pop(key, None)
+                else:
+                    self._pending[key] = value
+
+    def commit(self) -> None:
+        """Send every staged option in a single write."""
+        with self._options_lock:
+            if not self._pending:
+                return
+            pending       = self._pending
+            self._pending = {}
+            self._options.update(pending)
+        with self._batch():
+            for key, value in pending.items():
+                self._sender("info", key, value)
+
+    def options(self) -> Dict[str, Any]:
+        """Return the options the engine is known to have (committed values)."""
+        with self._options_lock:
+            return dict(self._options)
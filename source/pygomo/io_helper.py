@@ -1,67 +1,156 @@
-from queue     import Queue, Empty
-from threading import Thread, Lock, Event
-from typing    import TextIO, Callable, Dict
+import os
+from collections import deque
+from threading   import Thread, Condition, Event
+from typing      import BinaryIO, TextIO, Callable, Deque, Dict, Iterator, List, Union
+
+
+class _Channel:
+    """Bounded buffer of lines for one category, guarded by its own condition."""
+
+    __slots__ = ("buffer", "condition", "callbacks", "dropped")
+
+    def __init__(self, maxlen: int):
+        self.buffer   : Deque[str]                  = deque(maxlen=maxlen)
+        self.condition: Condition                   = Condition()
+        self.callbacks: List[Callable[[str], None]] = []
+        self.dropped  : int                         = 0
 
 
 class StdoutReader:
     """Asynchronously reads and categorizes stdout from an engine process.
 
-    Attributes:
-        max_queue_size: Maximum number of messages per category queue.
+    Each category keeps its lines according to a policy:
+        - "ring":   bounded FIFO; when full, the oldest line is dropped.
+        - "latest": a single slot holding only the most recent line.
+
+    Consumers blocked in get() are woken as soon as a matching line arrives, and
+    subscribers registered with subscribe() are called from the reader thread.
+
+    Binary streams are read in large chunks and split on b"\\n"; only non-empty
+    lines are decoded. Text streams fall back to readline().
     """
 
-    def __init__(self, stream: TextIO):
-        self._stream: StdoutReader     = stream
-        self._queues: Dict[str, Queue] = {}
-        self._filters                  = {}
-        self._thread                   = Thread(target=self._populate_queue, daemon=True)
-        self._stop_event               = Event()
-        self._thread.daemon            = True
+    POLICIES       = ("ring", "latest")
+    DEFAULT_MAXLEN = 1024
+    CHUNK_SIZE     = 65536
+
+    def __init__(self, stream: Union[BinaryIO, TextIO]):
+        self._stream  : Union[BinaryIO, TextIO]          = stream
+        self._channels: Dict[str, _Channel]              = {}
+        self._filters : Dict[str, Callable[[str], bool]] = {}
+        self._thread                                     = Thread(target=self._populate_queue, daemon=True)
+        self._stop_event                                 = Event()
+        self._thread.daemon                              = True
         self._thread.start()
 
     def stop(self):
         self._stop_event.set()
         self._thread.join(timeout=1.0)
 
-    def add_category(self, category: str, filter_func: Callable[[str], bool]) -> None:
+    def add_category(
+        self,
+        category   : str,
+        filter_func: Callable[[str], bool],
+        policy     : str = "ring",
+        maxlen     : int = DEFAULT_MAXLEN
+    ) -> None:
         """Add a category with a filter function for output lines.
 
         Args:
             category: Name of the category.
             filter_func: Function to determine if a line belongs to the category.
+            policy: Retention policy, "ring" or "latest".
+            maxlen: Capacity of a "ring" category (ignored for "latest").
 
         Raises:
-            ValueError: If the category already exists.
+            ValueError: If the category already exists or the policy is invalid.
         """
-        if category in self._queues:
+        if category in self._channels:
             raise ValueError(f"Category '{category}' already exists.")
-        self._queues[category]  = Queue()
-        self._filters[category] = filter_func
+        if policy not in self.POLICIES:
+            raise ValueError(f"Unsupported policy '{policy}'. Valid options: {', '.join(self.POLICIES)}")
+        if maxlen < 1:
+            raise ValueError("maxlen must be at least 1")
+        self._channels[category] = _Channel(1 if policy == "latest" else maxlen)
+        self._filters[category]  = filter_func
 
-    def _populate_queue(self) -> None:
-        """Read lines from the stream and distribute to category queues."""
+    def subscribe(self, category: str, callback: Callable[[str], None]) -> None:
+        """Call `callback(line)` from the reader thread for every line of a category.
+
+        Callbacks must be quick; they run before the next line is read.
+
+        Raises:
+            ValueError: If the category is invalid.
+        """
+        self._channel(category).callbacks.append(callback)
+
+    def _iter_text_lines(self) -> Iterator[str]:
+        """Yield lines from a text stream, one readline() at a time."""
         while not self._stop_event.is_set():
             line = self._stream.readline()
             if line == "":  # EOF
+                return
+            yield line
+
+    def _iter_binary_lines(self) -> Iterator[bytes]:
+        """Yield lines from a binary stream using large chunked reads."""
+        read1 = getattr(self._stream, "read1", None)
+        if read1 is None:
+            fd    = self._stream.fileno()
+            read1 = lambda size: os.read(fd, size)
+        pending = b""
+        while not self._stop_event.is_set():
+            chunk = read1(self.CHUNK_SIZE)
+            if not chunk:  # EOF
                 break
+            lines   = (pending + chunk).split(b"\n")
+            pending = lines.pop()
+            yield from lines
+        if pending:
+            yield pending
 
-            line = line.strip().lower()
+    def _populate_queue(self) -> None:
+        """Read lines from the stream and distribute to category buffers."""
+        binary = "b" in getattr(self._stream, "mode", "") or not hasattr(self._stream, "encoding")
+        lines  = self._iter_binary_lines() if binary else self._iter_text_lines()
+        for line in lines:
+            if self._stop_event.is_set():
+                break
+
+            line = line.strip()
             if not line:
                 continue
+            if binary:
+                line = line.decode("utf-8", errors="replace")
+            line = line.lower()
 
             for category, filter_func in self._filters.items():
                 if filter_func(line):
-                    try:
-                        self._queues[category].put(line)
-                    except Exception:
-                        break
+                    channel = self._channels[category]
+                    with channel.condition:
+                        if len(channel.buffer) == channel.buffer.maxlen:
+                            channel.dropped += 1
+                        channel.buffer.append(line)
+                        channel.condition.notify_all()
+                    for callback in channel.callbacks:
+                        try:
+                            callback(line)
+                        except Exception:
+                            pass
                     break
 
+    def _channel(self, category: str) -> _Channel:
+        try:
+            return self._channels[category]
+        except KeyError:
+            valid_categories = ", ".join(self._channels.keys())
+            raise ValueError(f"Unsupported category '{category}'. Valid options: {valid_categories}")
+
     def get(self, category: str, timeout: float = 0.0, reset: bool = False) -> str:
-        """Retrieve a line from a category queue.
+        """Retrieve a line from a category.
 
         If reset is True, clears all but the most recent item and returns it.
-        If reset is False, returns the next item in the queue.
+        If reset is False, returns the next item in the buffer.
 
         Args:
             category: Category to retrieve from.
@@ -74,27 +163,37 @@ class StdoutReader:
         Raises:
             ValueError: If the category is invalid.
         """
-        if category not in self._queues:
-            valid_categories = ", ".join(self._queues.keys())
-            raise ValueError(f"Unsupported category '{category}'. Valid options: {valid_categories}")
-
-        queue = self._queues[category]
+        channel = self._channel(category)
+        with channel.condition:
+            buffer = channel.buffer
+            if not buffer and timeout > 0:
+                channel.condition.wait_for(lambda: buffer, timeout=timeout)
+            if not buffer:
+                return ""
+            if reset:
+                line = buffer[-1]
+                buffer.clear()
+                return line
+            return buffer.popleft()
+
+    def latest(self, category: str) -> str:
+        """Return the most recent line of a category without consuming it.
 
-        if reset:
-            items = []
-            while not queue.empty():
-                try:
-                    items.append(queue.get_nowait())
-                except Empty:
-                    break
-            
-            if items:
-                queue.put_nowait(items[-1])
+        Returns:
+            The most recent line, or empty string if none available.
 
+        Raises:
+            ValueError: If the category is invalid.
+        """
+        buffer = self._channel(category).buffer
         try:
-            return queue.get(block=timeout > 0, timeout=timeout)
-        except Empty:
+            return buffer[-1]
+        except IndexError:
             return ""
-        
+
+    def dropped(self, category: str) -> int:
+        """Return how many lines of a category were discarded because it was full."""
+        return self._channel(category).dropped
+
     def __del__(self):
-        self.stop()
\ No newline at end of file
+        self.stop()
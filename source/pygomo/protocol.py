@@ -1,7 +1,8 @@
 """Abstract protocol interfaces and utilities for Gomoku engines."""
 
 from abc        import ABC, abstractmethod
-from typing     import Callable, Dict, TextIO
+from contextlib import nullcontext
+from typing     import Callable, ContextManager, Dict, IO, Optional
 from .types     import PlayResult
 from .io_helper import StdoutReader
 
@@ -44,6 +45,15 @@ class IProtocol(ABC):
         """Configure engine options."""
         pass
 
+    @abstractmethod
+    def commit(self) -> None:
+        """Send configured options that have not reached the engine yet."""
+        pass
+
+    def clear_ponder(self) -> None:
+        """Forget any ponder search (protocols without pondering have nothing to clear)."""
+        pass
+
 
 class IProtocolHandler(ABC):
     """Abstract interface for handling protocol-specific output."""
@@ -58,13 +68,19 @@ class ProtocolFactory:
     """Factory for creating protocol instances."""
 
     @staticmethod
-    def create(protocol_type: str, sender: Callable, reader: Callable) -> IProtocol:
+    def create(
+        protocol_type: str,
+        sender       : Callable,
+        reader       : Callable,
+        batch        : Optional[Callable[[], ContextManager]] = None
+    ) -> IProtocol:
         """Create a protocol instance.
 
         Args:
             protocol_type: Type of protocol (e.g., 'gomocup').
             sender: Function to send commands.
             reader: Function to receive responses.
+            batch: Context manager factory that coalesces sends into one write.
 
         Returns:
             An IProtocol instance.
@@ -74,7 +90,7 @@ class ProtocolFactory:
         """
         from .gomocup import GomocupProtocol  # Avoid circular imports
         if protocol_type == "gomocup":
-            return GomocupProtocol(sender, reader)
+            return GomocupProtocol(sender, reader, batch or nullcontext)
         raise ValueError(f"Unsupported protocol: {protocol_type}")
 
 
@@ -82,7 +98,7 @@ class ProtocolHandler:
     """Factory for creating protocol handler instances."""
 
     @staticmethod
-    def create(protocol_type: str, stream: TextIO) -> IProtocolHandler:
+    def create(protocol_type: str, stream: IO) -> IProtocolHandler:
         """Create a protocol handler instance.
 
         Args:
@@ -0,0 +1,256 @@
+"""Compact binary game records: fixed-size move records, appended and memory-mapped.
+
+File layout:
+    header  16 bytes: magic b"AGREC\\0", version (u2), record size (u2), 6 reserved
+    records RECORD_DTYPE.itemsize bytes each, one per move, in play order
+
+Every record is self-contained (game id, ply, timestamps, Zobrist hash of the
+board after the move and the engine's search info), so the reader can map the
+whole file as a numpy structured array and filter millions of moves with
+vectorized expressions instead of building Python objects.
+"""
+
+import os
+import struct
+import time
+import numpy as np
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+from .types import Evaluate, Move
+
+
+MAGIC       = b"AGREC\0"
+VERSION     = 1
+HEADER      = struct.Struct("<6sHH6x")
+NO_MOVE     = 0xFFFF
+PV_LENGTH   = 4
+ENGINE      = 1
+OPPONENT    = 2
+
+# Flags
+FLAG_PONDER_HIT = 1 << 0
+FLAG_OPENING    = 1 << 1
+
+RECORD_DTYPE = np.dtype([
+    ("game_id"   , "<u4"),
+    ("ply"       , "<u2"),
+    ("x"         , "u1"),
+    ("y"         , "u1"),
+    ("player"    , "u1"),       # 1 = engine (us), 2 = opponent
+    ("flags"     , "u1"),
+    ("_reserved" , "<u2"),
+    ("time_ns"   , "<i8"),      # Wall clock (Unix epoch) when the move was recorded
+    ("think_ms"  , "<u4"),      # Engine time for our moves, 0 otherwise
+    ("score"     , "<i4"),      # Evaluate.numeric(); mates map to +/-(MATE_SCORE - distance)
+    ("board_hash", "<u8"),      # Zobrist hash of the board after the move
+    ("nodes"     , "<u8"),
+    ("nps"       , "<u8"),
+    ("depth"     , "<u2"),
+    ("seldepth"  , "<u2"),
+    ("pv"        , "<u2", (PV_LENGTH,)),  # Move.index() of the first PV moves, NO_MOVE if absent
+])
+_RECORD = struct.Struct("<IHBBBBHqIiQQQHH" + "H" * PV_LENGTH)
+assert _RECORD.size == RECORD_DTYPE.itemsize == 64
+
+# Fixed seed: hashes must be stable across runs and machines
+ZOBRIST = np.random.default_rng(0x5EED).integers(0, 2**64 - 1, size=(3, Move.MAX_SIZE, Move.MAX_SIZE), dtype=np.uint64)
+_ZOBRIST_KEYS = ZOBRIST.tolist()  # Python ints: faster to index per move than numpy scalars
+
+
+def zobrist(board: Iterable[Tuple[int, int, int]]) -> int:
+    """Return the Zobrist hash of (x, y, player) stones."""
+    value = 0
+    for x, y, player in board:
+        value ^= _ZOBRIST_KEYS[player][x][y]
+    return value
+
+
+def _search_fields(info: Optional[Dict]) -> Tuple[int, int, int, int, int, Tuple[int, ...]]:
+    """Extract (score, nodes, nps, depth, seldepth, pv) from PlayResult.info."""
+    if not info:
+        return 0, 0, 0, 0, 0, (NO_MOVE,) * PV_LENGTH
+    try:
+        score = int(round(info["ev"].numeric())) if isinstance(info.get("ev"), Evaluate) else 0
+    except ValueError:
+        score = 0
+    depth, _, seldepth = str(info.get("depth", "0-0")).partition("-")
+    # Moves off the interned grid have index -1, which the unsigned field can't hold
+    pv                 = [move.index() if move.index() >= 0 else NO_MOVE for move in info.get("pv", [])[:PV_LENGTH]]
+    pv                += [NO_MOVE] * (PV_LENGTH - len(pv))
+    return (score, int(info.get("node", 0)), int(info.get("nps", 0)),
+            int(depth or 0), int(seldepth or 0), tuple(pv))
+
+
+def _read_header(f) -> None:
+    header = f.read(HEADER.size)
+    if len(header) != HEADER.size:
+        raise ValueError("Truncated game record header")
+    magic, version, size = HEADER.unpack(header)
+    if magic != MAGIC:
+        raise ValueError("Not a game record file")
+    if version != VERSION or size != RECORD_DTYPE.itemsize:
+        raise ValueError(f"Unsupported game record version {version} (record size {size})")
+
+
+class GameRecordWriter:
+    """Appends move records to a game record file.
+
+    Records are buffered in memory and written with a single write() per flush;
+    a game is flushed when it ends, so a crash loses at most the current game's
+    unflushed tail. A partially written record at the end of the file is
+    ignored by the reader.
+    """
+
+    def __init__(self, path: str, flush_every: int = 64):
+        """
+        Args:
+            path: Record file; created with a header if missing.
+            flush_every: Number of buffered records that triggers a write.
+
+        Raises:
+            ValueError: If the file exists but is not a compatible record file.
+        """
+        self._path        = path
+        self._flush_every = flush_every
+        self._buffer      = bytearray()
+        self._pending     = 0
+        self._game_id     = 0
+        self._ply         = 0
+        self._hash        = 0
+
+        exists = os.path.exists(path) and os.path.getsize(path) > 0
+        if exists:
+            size  = os.path.getsize(path)
+            count = (size - HEADER.size) // RECORD_DTYPE.itemsize
+            with open(path, "rb") as f:
+                _read_header(f)
+                if count:
+                    # Game ids only grow: the last record holds the highest one
+                    f.seek(HEADER.size + (count - 1) * RECORD_DTYPE.itemsize)
+                    self._game_id = _RECORD.unpack(f.read(_RECORD.size))[0]
+        self._file = open(path, "ab")
+        if not exists:
+            self._file.write(HEADER.pack(MAGIC, VERSION, RECORD_DTYPE.itemsize))
+        elif (tail := (size - HEADER.size) % RECORD_DTYPE.itemsize):
+            # Drop a torn record left by a crash so new records stay aligned
+            self._file.truncate(size - tail)
+
+    def __enter__(self) -> "GameRecordWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    @property
+    def game_id(self) -> int:
+        return self._game_id
+
+    def new_game(self) -> int:
+        """Start a new game and return its id."""
+        self.flush()
+        self._game_id += 1
+        self._ply      = 0
+        self._hash     = 0
+        return self._game_id
+
+    def append(
+        self,
+        x       : int,
+        y       : int,
+        player  : int,
+        info    : Optional[Dict] = None,
+        think_ms: int            = 0,
+        flags   : int            = 0,
+        time_ns : Optional[int]  = None
+    ) -> int:
+        """
+        Append one move of the current game.
+
+        Args:
+            x, y: Board coordinates.
+            player: 1 for our (engine) move, 2 for the opponent's.
+            info: PlayResult.info of the search that produced the move, if any.
+            think_ms: Engine time spent on the move.
+            flags: FLAG_* bits.
+            time_ns: Unix time in nanoseconds; defaults to now.
+
+        Returns:
+            The Zobrist hash of the board after the move.
+
+        Raises:
+            ValueError: If the coordinates or player are out of range.
+        """
+        if not (0 <= x < Move.MAX_SIZE and 0 <= y < Move.MAX_SIZE) or player not in (ENGINE, OPPONENT):
+            raise ValueError(f"Invalid move record: {(x, y, player)}")
+        self._hash ^= _ZOBRIST_KEYS[player][x][y]
+        score, nodes, nps, depth, seldepth, pv = _search_fields(info)
+        self._buffer += _RECORD.pack(
+            self._game_id, self._ply, x, y, player, flags, 0,
+            time.time_ns() if time_ns is None else time_ns, think_ms, score,
+            self._hash, nodes, nps, depth, seldepth, *pv
+        )
+        self._ply     += 1
+        self._pending += 1
+        if self._pending >= self._flush_every:
+            self.flush()
+        return self._hash
+
+    def flush(self) -> None:
+        if self._buffer:
+            self._file.write(self._buffer)
+            self._file.flush()
+            self._buffer.clear()
+            self._pending = 0
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+
+class GameRecordReader:
+    """Memory-maps a game record file as a numpy structured array."""
+
+    def __init__(self, path: str):
+        """
+        Raises:
+            ValueError: If the file is not a compatible record file.
+        """
+        with open(path, "rb") as f:
+            _read_header(f)
+        count = (os.path.getsize(path) - HEADER.size) // RECORD_DTYPE.itemsize
+        self._records = (np.memmap(path, dtype=RECORD_DTYPE, mode="r", offset=HEADER.size, shape=(count,))
+                         if count else np.empty(0, dtype=RECORD_DTYPE))
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    @property
+    def records(self) -> np.ndarray:
+        """All records as a read-only structured array (fields: see RECORD_DTYPE)."""
+        return self._records
+
+    def game_bounds(self) -> np.ndarray:
+        """Return an (n, 2) array of [start, stop) record ranges, one per game."""
+        ids = self._records["game_id"]
+        if not len(ids):
+            return np.empty((0, 2), dtype=np.int64)
+        starts = np.flatnonzero(np.r_[True, ids[1:] != ids[:-1]])
+        stops  = np.r_[starts[1:], len(ids)]
+        return np.stack([starts, stops], axis=1)
+
+    def game(self, game_id: int) -> np.ndarray:
+        """Return the records of one game (a view, not a copy); ids are ascending in the file."""
+        ids   = self._records["game_id"]
+        start = np.searchsorted(ids, game_id, side="left")
+        stop  = np.searchsorted(ids, game_id, side="right")
+        return self._records[start:stop]
+
+    def iter_chunks(self, size: int = 1 << 20, offset: int = 0) -> Iterator[np.ndarray]:
+        """Yield consecutive views of at most `size` records, starting at record `offset`."""
+        for start in range(offset, len(self._records), size):
+            yield self._records[start:start + size]
+
+    @staticmethod
+    def moves(records: np.ndarray) -> np.ndarray:
+        """Return an (n, 3) int array of x, y, player for a slice of records."""
+        return np.stack([records["x"], records["y"], records["player"]], axis=1).astype(np.int32)
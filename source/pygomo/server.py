@@ -0,0 +1,446 @@
+"""Long-running analysis server that shares a pool of warm engines.
+
+Requests are JSON-RPC 2.0 objects, accepted either as HTTP POST bodies on
+localhost or as newline-delimited JSON over a UNIX socket. Every request leases
+one engine from the pool (queueing while all engines are busy), so several bots
+and scripts can share engines without paying startup cost and hash memory each.
+
+Methods:
+    analyse(moves, time)  -> PlayResult.to_dict()
+        moves: [[x, y], ...] in play order (the engine is the side to move),
+               or [[x, y, player], ...] with explicit Gomocup player ids.
+        time : search budget in milliseconds.
+    status()              -> {"size", "idle", "waiting", "lost"}
+
+Run with:
+    python -m pygomo.server ENGINE [--workers N] [--port 8765 | --unix PATH]
+"""
+
+import argparse
+import json
+import logging
+import os
+import queue
+import socket
+import socketserver
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib         import contextmanager
+from http.server        import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing             import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+from common.resources   import ResourceLimits, partition_cpus
+from .engine            import Engine
+from .types             import TimeOut
+
+
+class _LostSlot:
+    """Stands in the idle queue for an engine that could not be restarted."""
+
+    __slots__ = ("limits",)
+
+    def __init__(self, limits: ResourceLimits):
+        self.limits = limits
+
+
+class EnginePool:
+    """A fixed-size pool of started engines handed out one request at a time.
+
+    Engines are settled (search stopped, late answers dropped) before going back
+    to the idle queue. A slot whose engine could not be restarted stays in the
+    queue as a placeholder that is respawned by the next lease, so the pool never
+    shrinks silently.
+    """
+
+    def __init__(
+        self,
+        path         : str,
+        protocol_type: str                      = "gomocup",
+        size         : int                      = 1,
+        board_size   : int                      = 15,
+        ready_timeout: float                    = 10.0,
+        limits       : Optional[ResourceLimits] = None,
+        pin          : bool                     = False,
+        reserved_cpus: int                      = 0
+    ):
+        """
+        Args:
+            path: Path to the engine executable.
+            protocol_type: Type of protocol (e.g., 'gomocup').
+            size: Number of engine processes to keep loaded.
+            board_size: Board size sent with START.
+            ready_timeout: Maximum time (seconds) to wait for an engine to start.
+            limits: Priority, memory and thread limits applied to every engine.
+            pin: Give every engine its own disjoint slice of CPUs.
+            reserved_cpus: CPUs kept free of engines when pinning.
+
+        Raises:
+            ValueError: If size is not positive or the CPUs cannot be split.
+            RuntimeError: If an engine does not answer START.
+        """
+        if size < 1:
+            raise ValueError("size must be at least 1")
+        self._path          = path
+        self._protocol_type = protocol_type
+        self._board_size    = board_size
+        self._ready_timeout = ready_timeout
+        self._size          = size
+        self._idle          = queue.Queue()
+        self._waiting       = 0
+        self._lost          = 0
+        self._lock          = threading.Lock()
+        self._engines       : List[Engine] = []
+        limits              = limits or ResourceLimits()
+        slices              = partition_cpus(size, reserved_cpus, limits.cpus) if pin else [limits.cpus] * size
+        for cpus in slices:
+            engine = self._spawn(limits.with_cpus(cpus))
+            self._engines.append(engine)
+            self._idle.put(engine)
+
+    def _spawn(self, limits: ResourceLimits) -> Engine:
+        engine = Engine(self._path, self._protocol_type, limits)
+        if not engine.protocol.is_ready(self._board_size, timeout=self._ready_timeout):
+            engine.terminate()
+            raise RuntimeError(f"Engine {engine.id} did not answer START")
+        return engine
+
+    @contextmanager
+    def lease(self, timeout: Optional[float] = None) -> Iterator[Engine]:
+        """Borrow an idle engine for the duration of the block.
+
+        When the block ends, a search still running is stopped and its answer
+        dropped. An engine that died or ignores STOP is replaced by a fresh one.
+
+        Args:
+            timeout: Maximum time (seconds) to wait for an idle engine.
+
+        Raises:
+            TimeOut: If no engine became idle in time.
+            RuntimeError: If the slot's engine was lost and still can't be restarted.
+        """
+        with self._lock:
+            self._waiting += 1
+        try:
+            engine = self._idle.get(timeout=timeout)
+        except queue.Empty:
+            raise TimeOut(f"No idle engine after {timeout}s")
+        finally:
+            with self._lock:
+                self._waiting -= 1
+        if isinstance(engine, _LostSlot):
+            engine = self._respawn(engine)
+        try:
+            yield engine
+        finally:
+            self._release(engine)
+
+    def _respawn(self, slot: _LostSlot) -> Engine:
+        try:
+            engine = self._spawn(slot.limits)
+        except (RuntimeError, OSError) as e:
+            self._idle.put(slot)
+            raise RuntimeError(f"Engine slot is lost and could not be restarted: {e}") from e
+        with self._lock:
+            self._lost -= 1
+            self._engines.append(engine)
+        return engine
+
+    def _release(self, engine: Engine) -> None:
+        if engine.is_alive() and not engine.settle():
+            logging.warning(f"Engine {engine.id} ignored STOP, restarting")
+            engine.kill()
+        if engine.is_alive():
+            self._idle.put(engine)
+            return
+        logging.warning(f"Engine {engine.id} died, restarting")
+        engine.kill()  # Reap it and close its pipes
+        with self._lock:
+            if engine in self._engines:
+                self._engines.remove(engine)
+        try:
+            replacement = self._spawn(engine.limits)
+        except (RuntimeError, OSError) as e:
+            logging.error(f"Failed to restart engine {engine.id}: {e}")
+            with self._lock:
+                self._lost += 1
+            self._idle.put(_LostSlot(engine.limits))
+            return
+        with self._lock:
+            self._engines.append(replacement)
+        self._idle.put(replacement)
+
+    def status(self) -> Dict[str, int]:
+        """Return pool size, idle slots, requests waiting for an engine and slots whose engine is lost."""
+        with self._lock:
+            return {"size": self._size, "idle": self._idle.qsize(), "waiting": self._waiting, "lost": self._lost}
+
+    def close(self) -> None:
+        """Terminate every engine of the pool."""
+        with self._lock:
+            engines, self._engines = self._engines, []
+        for engine in engines:
+            try:
+                engine.terminate()
+            except Exception as e:
+                logging.warning(f"Failed to terminate engine {engine.id}: {e}")
+
+
+def to_board(moves: Sequence[Sequence[int]]) -> List[Tuple[int, int, int]]:
+    """Convert a move list into BOARD triples with the engine as the side to move.
+
+    Args:
+        moves: [[x, y], ...] in play order, or [[x, y, player], ...].
+
+    Raises:
+        ValueError: If a move is malformed.
+    """
+    board = []
+    for idx, move in enumerate(moves):
+        if len(move) == 3:
+            board.append((int(move[0]), int(move[1]), int(move[2])))
+        elif len(move) == 2:
+            # The last move belongs to the opponent (2), then alternate backwards
+            board.append((int(move[0]), int(move[1]), 2 if (len(moves) - 1 - idx) % 2 == 0 else 1))
+        else:
+            raise ValueError(f"Invalid move: {move}")
+    return board
+
+
+class AnalysisService:
+    """Dispatches JSON-RPC requests to an EnginePool."""
+
+    def __init__(self, pool: EnginePool, lease_timeout: Optional[float] = None):
+        self._pool          = pool
+        self._lease_timeout = lease_timeout
+
+    def analyse(self, moves: Sequence[Sequence[int]], time: int) -> Dict[str, Any]:
+        board = to_board(moves)
+        with self._pool.lease(self._lease_timeout) as engine:
+            return engine.protocol.analyse(board, int(time)).to_dict()
+
+    def status(self) -> Dict[str, int]:
+        return self._pool.status()
+
+    def handle(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Run one JSON-RPC request and build its response object."""
+        req_id = request.get("id") if isinstance(request, dict) else None
+        try:
+            method = request["method"]
+            params = request.get("params", {})
+            if method not in ("analyse", "status"):
+                return {"jsonrpc": "2.0", "id": req_id, "error": {"code": -32601, "message": f"Unknown method: {method}"}}
+            result = getattr(self, method)(**params) if isinstance(params, dict) else getattr(self, method)(*params)
+            return {"jsonrpc": "2.0", "id": req_id, "result": result}
+        except (KeyError, TypeError, ValueError) as e:
+            return {"jsonrpc": "2.0", "id": req_id, "error": {"code": -32602, "message": str(e)}}
+        except TimeOut as e:
+            return {"jsonrpc": "2.0", "id": req_id, "error": {"code": -32000, "message": str(e)}}
+        except Exception as e:
+            logging.exception("Analysis request failed")
+            return {"jsonrpc": "2.0", "id": req_id, "error": {"code": -32603, "message": str(e)}}
+
+
+def _make_http_handler(service: AnalysisService):
+    class _Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            try:
+                length  = int(self.headers.get("Content-Length", 0))
+                request = json.loads(self.rfile.read(length))
+                body    = service.handle(request)
+            except json.JSONDecodeError as e:
+                body    = {"jsonrpc": "2.0", "id": None, "error": {"code": -32700, "message": str(e)}}
+            data = json.dumps(body).encode()
+            self.send_response(200)
+            self.send_header("Content-Type"  , "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            logging.debug(format % args)
+
+    return _Handler
+
+
+def _make_unix_handler(service: AnalysisService, executor: ThreadPoolExecutor, max_in_flight: int = 32):
+    class _Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            # Requests on one connection run concurrently; responses carry their id.
+            # At most max_in_flight run at once: past that, the connection is not read.
+            write_lock = threading.Lock()
+            in_flight  = threading.BoundedSemaphore(max_in_flight)
+
+            def reply(body: Dict[str, Any]) -> None:
+                try:
+                    with write_lock:
+                        self.wfile.write(json.dumps(body).encode() + b"\n")
+                        self.wfile.flush()
+                except OSError:
+                    pass  # The client disconnected; its remaining answers are dropped
+
+            try:
+                for line in self.rfile:
+                    if not line.strip():
+                        continue
+                    try:
+                        request = json.loads(line)
+                    except json.JSONDecodeError as e:
+                        reply({"jsonrpc": "2.0", "id": None, "error": {"code": -32700, "message": str(e)}})
+                        continue
+                    in_flight.acquire()
+                    try:
+                        future = executor.submit(lambda r=request: reply(service.handle(r)))
+                    except RuntimeError:  # Server shutting down
+                        in_flight.release()
+                        break
+                    # Also runs for futures cancelled by shutdown()
+                    future.add_done_callback(lambda _: in_flight.release())
+            except OSError:
+                pass  # Connection reset while reading
+            finally:
+                # Let this connection's requests finish before its streams are closed
+                for _ in range(max_in_flight):
+                    in_flight.acquire()
+
+    return _Handler
+
+
+# socketserver only defines UnixStreamServer where AF_UNIX exists (not on Windows)
+HAS_UNIX_SOCKETS = hasattr(socket, "AF_UNIX")
+
+if HAS_UNIX_SOCKETS:
+    class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        daemon_threads = True
+
+
+class AnalysisServer:
+    """Serves an AnalysisService over localhost HTTP or a UNIX socket."""
+
+    def __init__(
+        self,
+        service  : AnalysisService,
+        host     : str           = "127.0.0.1",
+        port     : int           = 8765,
+        unix_path: Optional[str] = None,
+        workers  : int           = 8
+    ):
+        """
+        Args:
+            service: Service that runs the requests.
+            host: HTTP bind address (ignored with unix_path).
+            port: HTTP port (ignored with unix_path).
+            unix_path: Serve newline-delimited JSON on this UNIX socket instead of HTTP;
+                falls back to HTTP where UNIX sockets are unavailable.
+            workers: Threads running requests from UNIX-socket connections.
+        """
+        if unix_path and not HAS_UNIX_SOCKETS:
+            logging.warning(f"UNIX sockets are not supported here, serving HTTP on {host}:{port} instead")
+            unix_path = None
+        self._unix_path = unix_path
+        self._executor  = None
+        if unix_path:
+            if os.path.exists(unix_path):
+                os.unlink(unix_path)
+            self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="Analysis")
+            self._server   = _UnixServer(unix_path, _make_unix_handler(service, self._executor))
+        else:
+            self._server   = ThreadingHTTPServer((host, port), _make_http_handler(service))
+            self._server.daemon_threads = True
+
+    @property
+    def address(self) -> str:
+        """Address to give to AnalysisClient."""
+        if self._unix_path:
+            return self._unix_path
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def serve_forever(self) -> None:
+        self._server.serve_forever()
+
+    def shutdown(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+        if self._unix_path and os.path.exists(self._unix_path):
+            os.unlink(self._unix_path)
+
+
+class AnalysisClient:
+    """Minimal client for AnalysisServer (HTTP URL or UNIX socket path)."""
+
+    def __init__(self, address: str = "http://127.0.0.1:8765", timeout: Optional[float] = None):
+        self._address = address
+        self._timeout = timeout
+        self._next_id = 0
+        self._lock    = threading.Lock()
+
+    def call(self, method: str, **params) -> Any:
+        """Send one request and return its result.
+
+        Raises:
+            RuntimeError: If the server answered with an error, or a UNIX socket
+                address is used where UNIX sockets are unavailable.
+        """
+        with self._lock:
+            self._next_id += 1
+            req_id         = self._next_id
+        data = json.dumps({"jsonrpc": "2.0", "id": req_id, "method": method, "params": params}).encode()
+        if self._address.startswith("http"):
+            from urllib.request import Request, urlopen
+            request = Request(self._address, data=data, headers={"Content-Type": "application/json"})
+            with urlopen(request, timeout=self._timeout) as response:
+                body = json.loads(response.read())
+        else:
+            if not HAS_UNIX_SOCKETS:
+                raise RuntimeError("UNIX sockets are not supported here; use an http:// address")
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                sock.settimeout(self._timeout)
+                sock.connect(self._address)
+                sock.sendall(data + b"\n")
+                sock.shutdown(socket.SHUT_WR)
+                body = json.loads(sock.makefile("rb").readline())
+        if "error" in body:
+            raise RuntimeError(body["error"]["message"])
+        return body["result"]
+
+    def analyse(self, moves: Sequence[Sequence[int]], time: int) -> Dict[str, Any]:
+        return self.call("analyse", moves=[list(m) for m in moves], time=time)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Serve engine analysis over a local socket.")
+    parser.add_argument("engine", help="Path to the engine executable")
+    parser.add_argument("--protocol", default="gomocup")
+    parser.add_argument("--workers", type=int, default=max(1, (os.cpu_count() or 2) // 2),
+                        help="Number of engine processes to keep loaded")
+    parser.add_argument("--board-size", type=int, default=15)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", default=None, help="Serve on this UNIX socket path instead of HTTP")
+    parser.add_argument("--pin", action="store_true", help="Pin every engine to its own CPUs")
+    parser.add_argument("--reserve", type=int, default=0, help="CPUs kept free of engines when pinning")
+    parser.add_argument("--threads", type=int, default=None, help="Search threads per engine (INFO thread_num)")
+    parser.add_argument("--max-memory-mb", type=int, default=None, help="Memory cap per engine")
+    parser.add_argument("--nice", type=int, default=None, help="Engine nice value")
+    parser.add_argument("--ionice", choices=ResourceLimits.IONICE_CLASSES, default=None)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    limits = ResourceLimits(nice=args.nice, ionice=args.ionice, max_memory_mb=args.max_memory_mb, threads=args.threads)
+    pool   = EnginePool(args.engine, args.protocol, args.workers, args.board_size,
+                        limits=limits, pin=args.pin, reserved_cpus=args.reserve)
+    server = AnalysisServer(AnalysisService(pool), args.host, args.port, args.unix,
+                            workers=max(8, 2 * args.workers))
+    logging.info(f"Serving {args.workers} engine(s) on {server.address}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
+        pool.close()
+
+
+if __name__ == "__main__":
+    main()
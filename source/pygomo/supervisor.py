@@ -0,0 +1,269 @@
+"""Engine health monitoring with automatic restart and position resync."""
+
+import logging
+import threading
+import time
+from typing     import Callable, Dict, List, Optional, Tuple
+import psutil
+from .engine    import Engine
+
+
+Stone = Tuple[int, int, int]
+
+
+class EngineSupervisor:
+    """Watches an engine process and replaces it when it crashes or hangs.
+
+    The supervisor keeps the position the engine should know about (BOARD
+    triples: 1 = engine's stone, 2 = opponent's). When the process exits, or a
+    search runs past its deadline, or the engine sits idle while it should be
+    thinking, a new engine is started, the committed INFO options are restored
+    and, if a search was in flight, BOARD is resent from the tracked position so
+    the engine answers the pending move. Otherwise the resync happens on the
+    next turn (see begin_turn()).
+
+    Attributes:
+        restarts: Number of successful restarts.
+        last_recovery: Seconds taken by the last restart (detection to resync).
+    """
+
+    def __init__(
+        self,
+        engine       : Engine,
+        path         : str,
+        protocol_type: str                                       = "gomocup",
+        board_size   : int                                       = 15,
+        poll_interval: float                                     = 0.25,
+        idle_timeout : float                                     = 3.0,
+        idle_cpu     : float                                     = 1.0,
+        grace        : float                                     = 2.0,
+        ready_timeout: float                                     = 5.0,
+        max_restarts : int                                       = 3,
+        on_restart   : Optional[Callable[[Engine, float], None]] = None,
+        on_failure   : Optional[Callable[[str], None]]           = None
+    ):
+        """
+        Args:
+            engine: The running engine to supervise.
+            path: Engine executable used for restarts.
+            protocol_type: Type of protocol (e.g., 'gomocup').
+            board_size: Board size sent with START.
+            poll_interval: Seconds between health checks.
+            idle_timeout: Seconds a search may use less than `idle_cpu` percent CPU.
+            idle_cpu: CPU percent under which a searching engine counts as idle.
+            grace: Seconds allowed past a search's time budget.
+            ready_timeout: Seconds to wait for a restarted engine to answer START.
+            max_restarts: Restarts allowed per game before giving up.
+            on_restart: Called with (new engine, recovery seconds) after a restart.
+            on_failure: Called with a reason when the engine cannot be recovered.
+        """
+        self._engine        = engine
+        self._path          = path
+        self._protocol_type = protocol_type
+        self._board_size    = board_size
+        self._poll_interval = poll_interval
+        self._idle_timeout  = idle_timeout
+        self._idle_cpu      = idle_cpu
+        self._grace         = grace
+        self._ready_timeout = ready_timeout
+        self._max_restarts  = max_restarts
+        self._on_restart    = on_restart
+        self._on_failure    = on_failure
+
+        self._lock          = threading.RLock()
+        self._recovered     = threading.Condition(self._lock)
+        self._stop_event    = threading.Event()
+        self._position      : List[Stone]     = []
+        self._deadline      : Optional[float] = None
+        self._idle_since    : Optional[float] = None
+        self._resync        = False
+        self._failed        = False
+        self._process       = self._watch(engine)
+        self._cpu           = 0.0
+        self._rss           = 0
+        self.restarts       = 0
+        self.last_recovery  : Optional[float] = None
+
+        self._thread = threading.Thread(target=self._run, name="EngineSupervisor", daemon=True)
+        self._thread.start()
+
+    @staticmethod
+    def _watch(engine: Engine) -> Optional[psutil.Process]:
+        try:
+            process = psutil.Process(engine.id)
+            process.cpu_percent(None)  # Prime the CPU counter
+            return process
+        except psutil.Error:
+            return None
+
+    @property
+    def engine(self) -> Engine:
+        """The engine currently in use (changes after a restart)."""
+        return self._engine
+
+    # Position tracking --------------------------------------------------
+
+    def set_position(self, board: List[Stone]) -> None:
+        """Replace the tracked position (e.g. after sending BOARD)."""
+        with self._lock:
+            self._position = [tuple(stone) for stone in board]
+
+    def play(self, x: int, y: int, player: int) -> None:
+        """Append a stone to the tracked position (1 = engine, 2 = opponent)."""
+        with self._lock:
+            self._position.append((x, y, player))
+
+    def position(self) -> List[Stone]:
+        with self._lock:
+            return list(self._position)
+
+    def begin_search(self, budget: float) -> None:
+        """Mark that the engine is thinking and should answer within `budget` seconds."""
+        with self._lock:
+            self._deadline   = time.monotonic() + budget + self._grace
+            self._idle_since = None
+
+    def end_search(self) -> None:
+        with self._lock:
+            self._deadline   = None
+            self._idle_since = None
+
+    def needs_resync(self) -> bool:
+        """True if the engine was restarted between searches and lacks the position."""
+        return self._resync
+
+    def begin_turn(self, opponent_move: Tuple[int, int], budget: float, send: Callable[[Engine], None]) -> bool:
+        """Record the opponent's move, start the search and give the engine the move.
+
+        Runs under the supervisor lock, so a restart happens either before (the
+        engine lacks the position: BOARD with the move is sent instead of calling
+        `send`) or after (the restart's BOARD already includes the move).
+
+        Args:
+            opponent_move: (x, y) of the opponent's new stone.
+            budget: Seconds the engine has to answer.
+            send: Sends the move to the engine (TURN, BOARD or a ponder hit). It
+                runs under the lock and blocks the watchdog, so it must not wait
+                on the engine: abort a ponder search before calling begin_turn.
+
+        Returns:
+            True if `send` was called, False if BOARD was sent instead.
+        """
+        with self._lock:
+            self._position.append((opponent_move[0], opponent_move[1], 2))
+            self._deadline   = time.monotonic() + budget + self._grace
+            self._idle_since = None
+            if self._resync:
+                self._engine.protocol.send_board(self._position)
+                self._resync = False
+                return False
+            send(self._engine)
+            return True
+
+    # Monitoring ---------------------------------------------------------
+
+    def stats(self) -> Dict[str, float]:
+        """Return pid, CPU percent, RSS (bytes), restarts and last recovery time."""
+        return {
+            "pid"          : self._engine.id,
+            "cpu"          : self._cpu,
+            "rss"          : self._rss,
+            "restarts"     : self.restarts,
+            "last_recovery": self.last_recovery,
+        }
+
+    def wait_recovered(self, timeout: float) -> bool:
+        """Block until the current engine is alive (after a restart) or recovery failed.
+
+        Returns:
+            True if a live engine is available.
+        """
+        deadline = time.monotonic() + timeout
+        with self._recovered:
+            while not self._failed and not self._engine.is_alive():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._recovered.wait(remaining)
+            return not self._failed
+
+    def _check(self) -> Optional[str]:
+        """Return why the engine must be restarted, or None if it is healthy."""
+        if not self._engine.is_alive():
+            return "engine process exited"
+        try:
+            if self._process is not None:
+                self._cpu = self._process.cpu_percent(None)
+                self._rss = self._process.memory_info().rss
+        except psutil.Error:
+            return "engine process vanished"
+
+        now = time.monotonic()
+        if self._deadline is None:
+            return None
+        if now > self._deadline:
+            return "search exceeded its time budget"
+        if self._cpu < self._idle_cpu:
+            self._idle_since = self._idle_since or now
+            if now - self._idle_since > self._idle_timeout:
+                return f"engine idle for {now - self._idle_since:.1f}s during a search"
+        else:
+            self._idle_since = None
+        return None
+
+    def _run(self) -> None:
+        while not self._stop_event.wait(self._poll_interval):
+            with self._lock:
+                reason = self._check()
+                if reason is None:
+                    continue
+                if self.restarts >= self._max_restarts:
+                    self._fail(f"{reason}; gave up after {self.restarts} restarts")
+                    return
+                logging.warning(f"Engine {self._engine.id}: {reason}, restarting")
+                try:
+                    self._restart()
+                except Exception as e:
+                    self._fail(f"{reason}; restart failed: {e}")
+                    return
+
+    def _fail(self, reason: str) -> None:
+        logging.error(f"Engine supervisor: {reason}")
+        self._failed = True
+        self._recovered.notify_all()
+        if self._on_failure is not None:
+            self._on_failure(reason)
+
+    def _restart(self) -> None:
+        started   = time.monotonic()
+        old       = self._engine
+        options   = old.protocol.options()
+        searching = self._deadline is not None
+        old.kill()
+
+        engine = Engine(self._path, self._protocol_type, old.limits)
+        if not engine.protocol.is_ready(self._board_size, timeout=self._ready_timeout):
+            engine.kill()
+            raise RuntimeError(f"restarted engine did not answer START within {self._ready_timeout}s")
+        engine.protocol.configure(options)
+        if searching:
+            # The engine owes us a move: BOARD makes it think on the tracked position
+            engine.protocol.send_board(self._position)
+            self._deadline   = time.monotonic() + max(self._deadline - started, 0.0) + self._grace
+            self._idle_since = None
+        self._resync = not searching
+
+        self._engine       = engine
+        self._process      = self._watch(engine)
+        self.restarts     += 1
+        self.last_recovery = time.monotonic() - started
+        self._recovered.notify_all()
+        logging.warning(f"Engine restarted as {engine.id} in {self.last_recovery * 1000:.0f}ms")
+        if self._on_restart is not None:
+            self._on_restart(engine, self.last_recovery)
+
+    def stop(self) -> None:
+        """Stop supervising (the engine itself is left running)."""
+        self._stop_event.set()
+        if self._thread is not threading.current_thread():
+            self._thread.join(timeout=1.0)
@@ -1,13 +1,30 @@
 import re
 import math
-from typing import Dict, Tuple, Union
+import numpy as np
+from functools    import lru_cache
+from typing       import Dict, Iterable, Optional, Tuple, Union
+from numpy.typing import ArrayLike
 
 
 class Move:
-    """Represents a Gomoku move with multiple format support."""
+    """Represents a Gomoku move with multiple format support.
 
-    def __init__(self, move: Union[Tuple[int, int], str]):
-        """Initialize a move from various formats.
+    Moves are immutable and interned: every cell of a MAX_SIZE x MAX_SIZE grid
+    has exactly one Move instance, so construction is a table lookup, equal
+    moves are identical objects and both string forms are computed once.
+    Moves outside that grid are still supported but are not interned.
+    """
+
+    __slots__ = ("col", "row", "_index", "_alpha", "_strnum", "_hash")
+
+    MAX_SIZE     = 32
+    _CACHE_LIMIT = 8192
+
+    _table    : list              = []
+    _str_cache: Dict[str, "Move"] = {}
+
+    def __new__(cls, move: Union[Tuple[int, int], str]) -> "Move":
+        """Return the move for various formats.
 
         Args:
             move: Move in format (col, row), 'x,y', or 'a1'.
@@ -15,29 +32,73 @@ class Move:
         Raises:
             ValueError: If the move format is invalid.
         """
-        match move:
-            case str() if "," in move:
-                move = move.replace(" ", "")
-                try:
-                    self.col, self.row = map(int, move.split(","))
-                except ValueError:
-                    raise ValueError(f"Invalid move format: {move}")
-            case str():
-                move = move.replace(" ", "")
-                if not move or len(move) < 2:
-                    raise ValueError(f"Invalid move format: {move}")
-                col_letter = move[0].lower()
-                if not col_letter.isalpha():
-                    raise ValueError(f"Invalid column in move: {move}")
-                try:
-                    self.row = int(move[1:]) - 1
-                except ValueError:
-                    raise ValueError(f"Invalid row in move: {move}")
-                self.col = ord(col_letter) - 97
-            case tuple() if len(move) == 2:
-                self.col, self.row = move
-            case _:
+        if isinstance(move, str):
+            cached = cls._str_cache.get(move)
+            if cached is not None:
+                return cached
+            result = cls.from_num(*cls._parse(move))
+            if result._index >= 0:
+                if len(cls._str_cache) >= cls._CACHE_LIMIT:
+                    cls._str_cache.clear()
+                cls._str_cache[move] = result
+            return result
+        if isinstance(move, tuple) and len(move) == 2:
+            return cls.from_num(*move)
+        raise ValueError(f"Invalid move format: {move}")
+
+    @staticmethod
+    def _parse(move: str) -> Tuple[int, int]:
+        """Parse 'x,y' or 'a1' into (col, row)."""
+        move = move.replace(" ", "")
+        if "," in move:
+            try:
+                col, row = map(int, move.split(","))
+            except ValueError:
                 raise ValueError(f"Invalid move format: {move}")
+            return col, row
+        if not move or len(move) < 2:
+            raise ValueError(f"Invalid move format: {move}")
+        col_letter = move[0].lower()
+        if not col_letter.isalpha():
+            raise ValueError(f"Invalid column in move: {move}")
+        try:
+            row = int(move[1:]) - 1
+        except ValueError:
+            raise ValueError(f"Invalid row in move: {move}")
+        return ord(col_letter) - 97, row
+
+    @classmethod
+    def _create(cls, col: int, row: int, index: int) -> "Move":
+        self = object.__new__(cls)
+        object.__setattr__(self, "col"    , col)
+        object.__setattr__(self, "row"    , row)
+        object.__setattr__(self, "_index" , index)
+        object.__setattr__(self, "_alpha" , f"{chr(97 + col)}{row + 1}")
+        object.__setattr__(self, "_strnum", f"{col},{row}")
+        object.__setattr__(self, "_hash"  , hash((col, row)))
+        return self
+
+    @classmethod
+    def from_num(cls, col: int, row: int) -> "Move":
+        """Return the move at (col, row)."""
+        if 0 <= col < cls.MAX_SIZE and 0 <= row < cls.MAX_SIZE:
+            return cls._table[row * cls.MAX_SIZE + col]
+        return cls._create(col, row, -1)
+
+    @classmethod
+    def from_index(cls, index: int) -> "Move":
+        """Return the move for a flat cell index (row * MAX_SIZE + col).
+
+        Raises:
+            ValueError: If the index is outside the interned grid.
+        """
+        if not 0 <= index < len(cls._table):
+            raise ValueError(f"Invalid move index: {index}")
+        return cls._table[index]
+
+    def index(self) -> int:
+        """Return the flat cell index, or -1 for a move outside the interned grid."""
+        return self._index
 
     def to_num(self) -> Tuple[int, int]:
         """Return move as (col, row)."""
@@ -45,17 +106,45 @@ class Move:
 
     def to_alphabet(self) -> str:
         """Return move in algebraic notation (e.g., 'a1')."""
-        return f"{chr(97 + self.col)}{self.row + 1}"
+        return self._alpha
 
     def to_strnum(self) -> str:
         """Return move as string 'col,row'."""
-        return f"{self.col},{self.row}"
+        return self._strnum
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Move is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("Move is immutable")
+
+    def __eq__(self, other) -> bool:
+        if self is other:
+            return True
+        if isinstance(other, Move):
+            return self.col == other.col and self.row == other.row
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __reduce__(self):
+        return (Move, ((self.col, self.row),))
+
+    def __copy__(self) -> "Move":
+        return self
+
+    def __deepcopy__(self, memo) -> "Move":
+        return self
 
     def __str__(self) -> str:
-        return self.to_alphabet()
+        return self._alpha
 
     def __repr__(self) -> str:
-        return f"{self.to_alphabet()}"
+        return self._alpha
+
+
+Move._table = [Move._create(i % Move.MAX_SIZE, i // Move.MAX_SIZE, i) for i in range(Move.MAX_SIZE ** 2)]
 
 
 class Mate:
@@ -83,19 +172,59 @@ class Mate:
         return int(self._value[0] + self._value[2:])
 
 
+@lru_cache(maxsize=4096)
+def _parse_score(value: str) -> float:
+    """Parse a raw evaluation string into a numeric score (cached; evals repeat a lot)."""
+    return Evaluate(value).numeric()
+
+
 class Evaluate:
-    """Represents an engine evaluation (score or mate)."""
+    """Represents an engine evaluation (score or mate).
+
+    The raw value is parsed once at construction into a numeric score and an
+    optional signed mate distance, so score() and winrate() are plain lookups.
+    """
+
+    MATE_SCORE = 20000
+    SCALE      = 200.0
 
     def __init__(self, value: str):
         """Initialize with an evaluation value.
 
         Args:
             value: Evaluation value (e.g., '100', '+m5').
-
-        Raises:
-            ValueError: If the value is invalid.
         """
-        self._value = value
+        self._value                = value
+        self._mate : Optional[int] = None
+        self._score: float         = 0.0
+        self._error: Optional[str] = None
+        if "m" in value:
+            try:
+                self._mate  = Mate(value).step()
+                self._score = float(self._mate_score(self._mate))
+            except ValueError as e:
+                self._error = str(e)
+        else:
+            try:
+                self._score = float(value)
+            except ValueError:
+                self._score = 0.0
+        self._winrate = None
+
+    @classmethod
+    def from_score(cls, score: float) -> "Evaluate":
+        """Create an evaluation from a numeric score."""
+        return cls(str(score))
+
+    @classmethod
+    def from_mate(cls, step: int) -> "Evaluate":
+        """Create an evaluation from a signed mate distance (e.g., -3 for '-m3')."""
+        return cls(f"{'+' if step >= 0 else '-'}m{abs(step)}")
+
+    @classmethod
+    def _mate_score(cls, step: int) -> int:
+        """Map a signed mate distance to a centipawn-like score (shorter mates score higher)."""
+        return (cls.MATE_SCORE - abs(step)) if step >= 0 else (abs(step) - cls.MATE_SCORE)
 
     def score(self) -> Union[str, float, Mate]:
         """Return the evaluation score.
@@ -110,24 +239,76 @@ class Evaluate:
                 return self._value
         return Mate(self._value)
 
+    def numeric(self) -> float:
+        """Return the evaluation as a number, mapping mates to +/-(MATE_SCORE - distance)."""
+        if self._error:
+            raise ValueError(self._error)
+        return self._score
+
+    def mate(self) -> Optional[int]:
+        """Return the signed mate distance, or None for a plain score."""
+        return self._mate
+
     def winrate(self) -> float:
         """Calculate the win rate based on the evaluation.
 
         Returns:
             A value between 0 and 1 representing win probability.
         """
-        def _to_score(x: str) -> float:
-            if "m" not in x:
-                try:
-                    return float(x)
-                except ValueError:
-                    return 0.0
-            value = Mate(x).step()
-            # Simplified winrate for mate scores
-            return (20000 - abs(value)) + (2 * (abs(value) - 20000) & (value >> 31))
-
-        score = float(_to_score(self._value))
-        return 1 / (1 + math.e ** (-score / 200))
+        if self._winrate is None:
+            self._winrate = 1 / (1 + math.exp(-self.numeric() / self.SCALE))
+        return self._winrate
+
+    @classmethod
+    def winrates(cls, values: Iterable[Union[str, float, int, "Evaluate"]]) -> np.ndarray:
+        """Compute win rates for many evaluations with one vectorised logistic.
+
+        Args:
+            values: Raw evaluation strings, numeric scores or Evaluate objects.
+
+        Returns:
+            Float64 array of win rates, in input order.
+
+        Raises:
+            ValueError: If a value is a malformed mate string.
+        """
+        def _to_score(value) -> float:
+            if isinstance(value, Evaluate):
+                return value.numeric()
+            if isinstance(value, str):
+                return _parse_score(value)
+            return float(value)
+
+        scores = np.fromiter((_to_score(v) for v in values), dtype=np.float64)
+        return cls._logistic(scores)
+
+    @classmethod
+    def winrates_from_scores(cls, scores: ArrayLike, mates: Optional[ArrayLike] = None) -> np.ndarray:
+        """Compute win rates from numeric arrays.
+
+        Args:
+            scores: Numeric scores.
+            mates: Optional signed mate distances, same shape as scores; entries
+                equal to 0 mean "no mate" and use the score instead.
+
+        Returns:
+            Float64 array of win rates.
+        """
+        values = np.asarray(scores, dtype=np.float64)
+        if mates is not None:
+            mates  = np.asarray(mates, dtype=np.int64)
+            mated  = np.sign(mates) * (cls.MATE_SCORE - np.abs(mates))
+            values = np.where(mates != 0, mated, values)
+        return cls._logistic(values)
+
+    @classmethod
+    def _logistic(cls, scores: np.ndarray) -> np.ndarray:
+        # exp(-x) overflows to inf for very negative scores, which still yields 0.0
+        with np.errstate(over="ignore"):
+            return 1.0 / (1.0 + np.exp(-scores / cls.SCALE))
+
+    def __str__(self) -> str:
+        return self._value
 
     def is_winning(self) -> bool:
         """Check if the evaluation indicates a win."""
@@ -178,6 +359,22 @@ class PlayResult:
             }
         return {}
 
+    def to_dict(self) -> Dict:
+        """Return a JSON-serialisable view of the result."""
+        info = dict(self.info)
+        if isinstance(ev := info.get("ev"), Evaluate):
+            try:
+                info["winrate"] = ev.winrate()
+            except ValueError:
+                info["winrate"] = None
+            info["ev"] = str(ev)
+        if "pv" in info:
+            info["pv"] = [move.to_alphabet() for move in info["pv"]]
+        return {
+            "move": self.move.to_strnum() if self.move is not None else None,
+            "info": info,
+        }
+
     def parse_custom(self, pattern: str, keys: Tuple[str, ...]) -> None:
         """Parse info with a custom regex pattern.
 
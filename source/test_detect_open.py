@@ -1,5 +1,5 @@
 from utils import detect_opening
-from utils import screenshot_region
+from utils import CaptureService
 from utils import Listener
 import time
 import cv2
@@ -7,20 +7,23 @@ import cv2
 
 left, top, width, height = (530, 160, 519, 519)
 distance                 = width / 14
+capture                  = CaptureService((left, top, width, height))
 
 
 def show_image():
-    cv2.imshow('Image', screenshot_region(left, top, height, width))
+    # The viewer keeps the image open: copy it out of the shared buffer
+    cv2.imshow('Image', capture.snapshot().image)
     cv2.waitKey(0)
 
 
 def show_coordinates():
-    coordinates = detect_opening(left, top, width, height, distance)
+    with capture.read(timeout=1.0) as frame:
+        coordinates = detect_opening(left, top, width, height, distance, image=frame.image)
     for coord in coordinates:
         print(f"Coordinate: {coord}")
 
 
-with Listener(max_callback_workers=1, debounce_ms=500) as listener:
+with capture, Listener(max_callback_workers=1, debounce_ms=500) as listener:
     listener.add_hotkey('ctrl+d', show_image)
     listener.add_hotkey('ctrl+i', show_coordinates)
     listener.add_hotkey('esc', lambda: listener.signal_stop())
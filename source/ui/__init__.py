@@ -1,10 +1,13 @@
 from .view_model import ViewModel
 from .model      import Model
+from .session    import GameSession, SessionManager
 from .view       import View
 
 
 __all__  = [
     'ViewModel',
     'Model',
+    'GameSession',
+    'SessionManager',
     'View'
 ]
\ No newline at end of file
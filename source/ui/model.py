@@ -1,51 +1,88 @@
 from pygomo  import Engine
+from pygomo  import EngineSupervisor
+from pygomo  import ResourceLimits, available_cpus, pin_current_thread
+from pygomo  import GameRecordWriter
+from pygomo.records import FLAG_OPENING, FLAG_PONDER_HIT
 from pygomo  import Move
 from pygomo  import PlayResult
-from utils   import detect_board, detect_opening, detect_move
+from pygomo  import tracer
+from pygomo.server  import EnginePool
+from utils   import detect_board, detect_opening, detect_move, detect_stone
 from utils   import ScreenCapture
 from utils   import check_state, kill_process
 from utils   import Listener
-from utils   import DataBinding
+from utils   import DataBinding, Settings
 from utils   import LogText
 from utils   import Board
 from utils   import convert_time
+from utils   import CaptureService
+from utils   import TimeManager
 from typing  import List
+from .session import SessionManager
 import threading
 import os
-import time
 import keyboard
 
 class Model:
+    TRACE_FILE       = 'trace_last_game.json'
+    RECOVERY_TIMEOUT = 10.0
+    RECORD_FILE      = 'games.agrec'
+    # Capture/detect run on the first CPU(s); the engine gets the rest (on boxes with enough cores)
+    RESERVED_CPUS    = 1
+    MIN_CPUS_TO_PIN  = 4
+    # One grab per tick feeds move detection and click verification
+    CAPTURE_TICK_MS  = 16
+    CAPTURE_PADDING  = 4
+
     def __init__(self):            
         self.engine     = DataBinding('')
         self.time_match = DataBinding(60)
         self.time_plus  = DataBinding(0)
         self.mode       = DataBinding(True)
+        self.ponder     = DataBinding(False)
         self.text_box   = LogText()
+        self.settings   = Settings(time_match=self.time_match, time_plus=self.time_plus,
+                                   mode=self.mode, ponder=self.ponder)
 
         self.__state         : bool   = False    
         self.__engine_exec   : Engine = None
         self.__distance      : int    = None
         self.__board         : Board  = None
         self.__board_position: List[int, int, int, int] = None, None, None, None
+        self.__click_latency : List[float] = []
+        self.__supervisor    : EngineSupervisor = None
+        self.__capture       : CaptureService = None
+        self.__tables        : List[tuple] = []
+        self.__sessions      : SessionManager = None
         
         
 
         self.__game_lock = threading.Lock()
         self.__listener  = Listener(max_callback_workers=1, debounce_ms=500)
 
-        self.__listener.add_hotkey('alt+s', self.stop_game)
-        self.__listener.add_hotkey('esc'  , self.turn_off)
+        # Stop/quit run on the priority lane so a slow callback can't delay them
+        self.__listener.add_hotkey('alt+s', self.stop_game, priority=True, debounce_ms=100)
+        self.__listener.add_hotkey('esc'  , self.__on_escape, priority=True, debounce_ms=100)
+        self.__listener.add_hotkey('alt+q', self.__stop_engine_search, priority=True, debounce_ms=100)
         self.__listener.add_hotkey('ctrl+shift+x', self.start_game_thread)      
         self.__listener.add_hotkey('alt+r', self.text_box.clear)  
         self.__listener.add_hotkey('alt+d', self.__display_search_info)
-        self.__listener.add_hotkey('alt+q', self.__stop_engine_search)
+        self.__listener.add_hotkey('ctrl+shift+t', self.start_tables)
 
     def load_engine(self):
         assert os.path.exists(engine := self.engine.get())
-        self.__engine_exec = Engine(engine, 'gomocup')
+        self.__engine_exec = Engine(engine, 'gomocup', ResourceLimits(cpus=self.__engine_cpus()))
         print(f'Loaded: {self.__engine_exec.id}')
 
+    def __engine_cpus(self):
+        cpus = available_cpus()
+        return cpus[self.RESERVED_CPUS:] if len(cpus) >= self.MIN_CPUS_TO_PIN else None
+
+    def __reserve_game_cpus(self):
+        cpus = available_cpus()
+        if len(cpus) >= self.MIN_CPUS_TO_PIN:
+            pin_current_thread(cpus[:self.RESERVED_CPUS])
+
     def is_engine_available(self):
         return isinstance(self.__engine_exec, Engine)
 
@@ -56,6 +93,7 @@ class Model:
             self.__engine_exec = None
 
     def safe_kill_engine(self):
+        self.stop_tables()
         if self.is_engine_available() and check_state(self.__engine_exec.id):
             print('[Safe kill]')
             kill_process(self.__engine_exec.id)
@@ -66,16 +104,84 @@ class Model:
             self.__distance = self.__board_position[2] / 14
             self.__board    = Board((self.__board_position[0], self.__board_position[1]), 
                                     (self.__board_position[2], self.__board_position[3]), 
-                                    15, 15)
+                                    15, 15,
+                                    verifier=self.__verify_stone)
             self.text_box.set('Found board')
             return
         self.text_box.set('No board found')
 
+    def __verify_stone(self, x, y):
+        capture = self.__capture
+        if capture is None or not capture.is_running():
+            return detect_stone(*self.__board_position[:2], self.__distance, x, y)
+        # Sample the shared frame: a frame grabbed before the click just reads as "not yet"
+        with capture.read(self.__board_position, timeout=0) as frame:
+            return frame is not None and detect_stone(*self.__board_position[:2], self.__distance, x, y,
+                                                      image=frame.image)
+
+    def __board_capture(self) -> CaptureService:
+        left, top, width, height = self.__board_position
+        pad  = self.CAPTURE_PADDING
+        x, y = max(left - pad, 0), max(top - pad, 0)
+        cpus = available_cpus()
+        return CaptureService((x, y, left + width + pad - x, top + height + pad - y), self.CAPTURE_TICK_MS,
+                              cpus=cpus[:self.RESERVED_CPUS] if len(cpus) >= self.MIN_CPUS_TO_PIN else None)
+
+    def add_table(self, master):
+        # Extra boards played side by side, each with its own pooled engine
+        position = detect_board(*ScreenCapture(master).get())
+        if not all(position):
+            self.text_box.set('No board found')
+            return
+        self.__tables.append(position)
+        self.text_box.set(f'Table {len(self.__tables)} added at {position[:2]}')
+
+    def start_tables(self):
+        if self.__sessions is not None and self.__sessions.is_running():
+            self.text_box.set('Tables are already running')
+            return
+        if self.__game_lock.locked():
+            # Both would click with one mouse: tables and the main game never run together
+            self.text_box.set('Stop the game before starting tables')
+            return
+        if not self.__tables or not os.path.exists(engine := self.engine.get()):
+            self.text_box.set('Add tables and select an engine first')
+            return
+        settings = self.settings.snapshot()
+        cpus     = available_cpus()
+        pin      = len(cpus) >= max(self.MIN_CPUS_TO_PIN, len(self.__tables) + self.RESERVED_CPUS)
+        try:
+            pool = EnginePool(engine, 'gomocup', size=len(self.__tables), pin=pin, reserved_cpus=self.RESERVED_CPUS)
+        except (RuntimeError, ValueError, FileNotFoundError) as e:
+            self.text_box.set(f'[Tables] {e}')
+            return
+        self.__sessions = SessionManager(pool, log=self.text_box.set)
+        for idx, position in enumerate(self.__tables, 1):
+            self.__sessions.add_session(f'T{idx}', position, settings.time_match, settings.time_plus)
+        self.__sessions.start()
+
+    def stop_tables(self):
+        if self.__sessions is None:
+            return
+        sessions, self.__sessions = self.__sessions, None
+        sessions.stop()
+        sessions.pool.close()
+        self.text_box.set(f'[Tables] stopped: {sessions.status()}')
+
     def turn_off(self):
         if self.__state:
             self.stop_game()
+        self.stop_tables()
         self.terminate_engine()
 
+    def __on_escape(self):
+        # Priority lane: only raise the stop flags here, the teardown joins threads and waits on processes
+        self.stop_game()
+        if self.__sessions is not None:
+            for session in self.__sessions.sessions:
+                session.stop()
+        threading.Thread(target=self.turn_off, name='TurnOff', daemon=True).start()
+
     def turn_on(self):
         assert self.__board_position
         assert self.engine.get()
@@ -90,6 +196,9 @@ class Model:
         assert self.is_engine_available()
         assert self.__board_position
         assert self.__board
+        if self.__sessions is not None and self.__sessions.is_running():
+            self.text_box.set('Stop the tables before starting a game')
+            return
         if not self.__state and self.__game_lock.acquire(blocking=False):
             self.text_box.set("Starting game thread...")
             threading.Thread(target=self.start_game, daemon=True).start()
@@ -97,99 +206,275 @@ class Model:
             self.text_box.set("Cannot start game thread...")
             return
     
-    def __display_search_info(self, reset=False):
+    def __display_search_info(self, reset=False) -> dict:
         message = PlayResult(None, self.__engine_exec._receive('message', reset=reset)).info
-        self.text_box.set(f'DEPTH {message["depth"]} | Winrate {message["ev"].winrate() * 100:.2f}% | NODE {message["node"]} | NPS {message["nps"]} | PV {message["pv"][:5]}...') 
+        if message:
+            self.text_box.set(f'DEPTH {message["depth"]} | Winrate {message["ev"].winrate() * 100:.2f}% | NODE {message["node"]} | NPS {message["nps"]} | PV {message["pv"][:5]}...') 
+        return message
+
+    def __on_engine_restart(self, engine: Engine, recovery: float):
+        self.__engine_exec = engine
+        self.text_box.set(f'[Supervisor] engine restarted as {engine.id} in {recovery * 1000:.0f}ms')
+
+    def __on_engine_failure(self, reason: str):
+        self.text_box.set(f'[Supervisor] {reason}, stopping game')
+        self.__state = False
+
+    def __recover(self, error: Exception) -> bool:
+        # The engine died under us: wait for the supervisor to bring a new one up
+        self.text_box.set(f'[Engine] {error}')
+        if self.__supervisor is None or not self.__supervisor.wait_recovered(self.RECOVERY_TIMEOUT):
+            self.__state = False
+            return False
+        return True
 
     def __stop_engine_search(self):
         self.__engine_exec.protocol.stop()
 
+    @property
+    def click_latency(self) -> List[float]:
+        """Click-to-render latencies (seconds) of confirmed clicks in the last game."""
+        return list(self.__click_latency)
+
     def start_game(self, recursive=True):
-        def click(*coord):
+        # The game lock was taken by start_game_thread: release it whatever the game or its cleanup raises
+        try:
+            self.__play_game(recursive)
+        finally:
+            self.__game_lock.release()
+
+    def __play_game(self, recursive):
+        def click(x, y):
             # Check auto mode
-            if self.mode.get():
-                self.__board.click(*coord)
-            else:
+            if not self.settings.snapshot().mode:
                 self.text_box.set('Wait key: ALT + M to continue!')
                 keyboard.wait('alt+m')
-                self.__board.click(*coord)
+            try:
+                latency = self.__board.play_confirmed(x, y)
+            except RuntimeError as e:
+                # The move never showed up: stop instead of waiting on a turn that won't come
+                self.text_box.set(f'[Click] {e}, stopping game')
+                self.__state = False
+                return
+            self.__click_latency.append(latency)
+            self.text_box.set(f'[Click] confirmed in {latency * 1000:.1f}ms')
+
+        # Settings for this game are read once; in-game toggles come from fresh snapshots
+        settings    = self.settings.snapshot()
+        clock       = None
+        search_info = {}
+        move_flags  = 0
+        records     = None
+
+        def record(x: int, y: int, player: int, info: dict = None, flags: int = 0):
+            # Losing the record must never cost the game
+            nonlocal records
+            if records is None:
+                return
+            try:
+                records.append(x, y, player, info, think_ms=(info or {}).get('time', 0), flags=flags)
+            except (OSError, ValueError) as e:
+                self.text_box.set(f'[Record] disabled: {e}')
+                records = None
 
-        def calc_time_left(begin_at, during):
-            return int(begin_at - during + self.time_plus.get()) * 1000
-        
         def recursive_get_info() -> Move:
+            nonlocal search_info, move_flags
             while self.__state:
                 try:                    
                     # Represent to View
                     best_move = self.__engine_exec._receive('coord')
                     if best_move:
-                        best_move = Move(best_move)
-                        self.__display_search_info(reset=True)              
+                        best_move   = Move(best_move)
+                        search_info = self.__display_search_info(reset=True)
                         self.text_box.set('[BestMove]', best_move.to_alphabet())
+                        self.__supervisor.end_search()
+                        self.__supervisor.play(*best_move.to_num(), 1)
+                        record(*best_move.to_num(), 1, search_info, move_flags)
+                        move_flags  = 0
                         return best_move
-                except:
-                    continue
-            
-        def recursive_play(begin_time: int, cur_move: List[int]):
-            while self.__state:
+                except ValueError as e:
+                    self.text_box.set(f'[Engine] bad output: {e}')
+
+        def start_ponder(best_move: Move, time_left: int):
+            # Think on the opponent's time, assuming they answer with PV[1]
+            pv = search_info.get('pv', [])
+            if self.__state and self.settings.snapshot().ponder and len(pv) >= 2 and pv[0] == best_move:
+                self.__engine_exec.protocol.ponder(pv[1].to_strnum(), time_left)
+                self.text_box.set('[Ponder]', pv[1].to_alphabet())
+
+        def send_turn(move: Move):
+            record(*move.to_num(), 2)
+            resend = False
+
+            def send(engine: Engine):
+                nonlocal move_flags
+                protocol = engine.protocol
+                if resend:
+                    # The tracked position already holds the move
+                    protocol.send_board(self.__supervisor.position())
+                elif (pondered := protocol.pondering()) is None:
+                    protocol.send_command('turn', move.to_strnum())
+                else:
+                    # Ponder hit: the running search is already on the right position
+                    protocol.ponder_hit()
+                    move_flags = FLAG_PONDER_HIT
+                    self.text_box.set('[Ponder] hit')
+
+            protocol = self.__engine_exec.protocol
+            if (pondered := protocol.pondering()) is not None and pondered != move.to_strnum():
+                # Abort the ponder search before taking the supervisor lock: waiting
+                # for its answer (up to a second) must not hold up the watchdog
+                self.text_box.set('[Ponder] miss')
                 try:
-                    # Step 1: Set time_left
-                    time_start = time.perf_counter()
-                    self.__engine_exec.protocol.configure({'time_left': begin_time})
+                    if not protocol.ponder_miss():
+                        self.text_box.set('[Ponder] engine did not answer STOP, resending the position')
+                        self.__engine_exec.settle()
+                        resend = True
+                except RuntimeError as e:
+                    # The engine died: its replacement lacks the position and gets BOARD in begin_turn
+                    if not self.__recover(e):
+                        return
+            # The move is tracked before anything is sent: a restart from here on
+            # resends it with BOARD, and one that already happened gets BOARD instead of TURN
+            try:
+                self.__supervisor.begin_turn(move.to_num(), clock.engine_time_left() / 1000, send)
+            except RuntimeError as e:
+                # The engine died while receiving the move; its replacement gets BOARD with it
+                self.__recover(e)
 
-                    # Step 2: Get move || Manage by turn
-                    if (move := detect_move(*self.__board_position, self.__distance)) is not None and \
-                        move != cur_move:
-                        # Step 3: Send to engine
+        def recursive_play(cur_move: List[int]):
+            seq = self.__capture.seq
+            while self.__state:
+                try:
+                    # Step 1: Get move from the next shared frame || Manage by turn
+                    with self.__capture.read(self.__board_position, after=seq, timeout=1.0) as frame:
+                        if frame is None:
+                            continue
+                        seq        = frame.seq
+                        capture_at = frame.timestamp_ns
+                        with clock.phase('detect'):
+                            move   = detect_move(*self.__board_position, self.__distance, image=frame.image)
+                    if move is not None and move != cur_move:
+                        # Step 2: Our clock started when the opponent's stone was captured
+                        clock.start_turn(capture_at)
+                        cur_move = move  # Never handle the same stone twice, even if a step below fails
                         move     = Move(move)
-                        # FIX BUG ABOUT TIME
                         self.text_box.clear()
-                        self.text_box.set(f'--> Time Left: {convert_time(begin_time / 1000)}')
+                        self.text_box.set(f'--> Time Left: {convert_time(clock.time_left())} | Margin {clock.margin()}ms')
 
-                        self.__engine_exec.protocol.send_command('turn', move.to_strnum())
+                        # Step 3: Send to engine
+                        self.__engine_exec.protocol.configure({'time_left': clock.engine_time_left()})
+                        send_turn(move)
 
                         # Step 4: Display & click
-                        output   = recursive_get_info()
-                        cur_move = output.to_num()      # ,--- Update curmove, advoid duplicate
+                        with clock.phase(TimeManager.ENGINE_PHASE):
+                            output = recursive_get_info()
                         if output is not None:
-                            click(*self.__board.move_to_coord(*output.to_num()))
-
-                        # Step 5: Update time_left
+                            cur_move = output.to_num()  # ,--- Update curmove, advoid duplicate
+                            with clock.phase('click'):
+                                click(*cur_move)
 
-                        time_end   = time.perf_counter()
-                        begin_time = calc_time_left(begin_time / 1000, time_end - time_start)
-                except:
-                    continue
+                        # Step 5: Stop our clock
+                        clock.end_turn()
+                        if output is not None:
+                            start_ponder(output, clock.engine_time_left())
+                except RuntimeError as e:
+                    self.__recover(e)
+                except Exception as e:
+                    self.text_box.set(f'[Error] {e}')
         
 
         try:            
+            try:
+                clock = TimeManager(settings.time_match * 1000, settings.time_plus * 1000)
+            except (TypeError, ValueError) as e:
+                self.text_box.set(f'[Settings] invalid time control: {e}')
+                return
             self.__state = True
+            self.__reserve_game_cpus()
+            self.__click_latency.clear()
+            tracer.reset()
+            try:
+                records = GameRecordWriter(self.RECORD_FILE)
+                records.new_game()
+            except (OSError, ValueError) as e:
+                self.text_box.set(f'[Record] disabled: {e}')
+            self.__capture = self.__board_capture()
+            self.__capture.start()
+            self.__supervisor = EngineSupervisor(self.__engine_exec, self.engine.get(), 'gomocup',
+                                                 on_restart=self.__on_engine_restart,
+                                                 on_failure=self.__on_engine_failure)
             # Logic
             # -----
-            assert self.__engine_exec.protocol.is_ready(timeout=self.time_match.get()), 'Engine is not ready'
-            self.__engine_exec.protocol.configure({
-                'timeout_match': self.time_match.get() * 1000,
-                'time_left'    : self.time_match.get() * 1000,
-                'rule'         : 1
-            })            
-            time_start = time.perf_counter()
+            # Nothing from the previous game (ponder search, unread move) may leak into this one
+            self.__engine_exec.settle()
+            assert self.__engine_exec.protocol.is_ready(timeout=settings.time_match), 'Engine is not ready'
+            clock.start_turn()
             # STEP 1: Receive opening
-            opening    = detect_opening(*self.__board_position, self.__distance)
+            with self.__capture.read(self.__board_position, timeout=1.0) as frame:
+                assert frame is not None, 'No frame captured'
+                with clock.phase('detect'):
+                    opening = detect_opening(*self.__board_position, self.__distance, image=frame.image)
 
             # STEP 2: Send to Engine
-            moves_str  = "\n".join([f"{move[0]},{move[1]},{1 if len(opening) % 2 == idx % 2 else 2}" for idx, move in enumerate(opening)])
-            self.__engine_exec.protocol.send_command(f'board\n{moves_str}\ndone')
+            self.__engine_exec.protocol.configure({
+                'timeout_match': settings.time_match * 1000,
+                'time_left'    : clock.engine_time_left(),
+                'rule'         : 1
+            })            
+            board = [(move[0], move[1], 1 if len(opening) % 2 == idx % 2 else 2)
+                     for idx, move in enumerate(opening)]
+            self.__supervisor.set_position(board)
+            for x, y, player in board:
+                record(x, y, player, flags=FLAG_OPENING)
+            self.__supervisor.begin_search(clock.engine_time_left() / 1000)
+            try:
+                self.__engine_exec.protocol.send_board(board)
+            except RuntimeError as e:
+                # The search is already marked: the restarted engine gets this BOARD
+                if not self.__recover(e):
+                    return
 
             # Step 3: Represent
-            output     = recursive_get_info()
+            with clock.phase(TimeManager.ENGINE_PHASE):
+                output = recursive_get_info()
             if output is not None:
-                click(*self.__board.move_to_coord(*output.to_num()))
+                with clock.phase('click'):
+                    click(*output.to_num())
 
             # Step 4: Local update time
-            time_end   = time.perf_counter()
-            time_left  = calc_time_left(self.time_match.get(), time_end - time_start)
-            if recursive:
-                recursive_play(time_left, output.to_num())
+            clock.end_turn()
+            if output is not None:
+                start_ponder(output, clock.engine_time_left())
+            if recursive and output is not None:
+                recursive_play(output.to_num())
         finally:
             self.__state = False
-            self.__game_lock.release()
\ No newline at end of file
+            if self.is_engine_available() and not self.__engine_exec.settle():
+                self.text_box.set('[Engine] did not answer STOP at game end')
+            if self.__capture is not None:
+                stats = self.__capture.stats()
+                self.__capture.stop()
+                self.__capture = None
+                self.text_box.set(f'[Capture] {stats["frames"]} frames | {stats["skipped"]} skipped | '
+                                  f'{stats["late"]} late')
+            if records is not None:
+                records.close()
+            if self.__supervisor is not None:
+                self.__supervisor.stop()
+                if self.__supervisor.restarts:
+                    self.text_box.set(f'[Supervisor] {self.__supervisor.restarts} restart(s), '
+                                      f'last recovery {self.__supervisor.last_recovery * 1000:.0f}ms')
+                self.__supervisor = None
+            for name, stats in sorted(tracer.summary().items()):
+                self.text_box.set(f'[Trace] {name}: n={stats["n"]} | p50 {stats["p50"]:.1f}ms | '
+                                  f'p95 {stats["p95"]:.1f}ms | p99 {stats["p99"]:.1f}ms')
+            try:
+                tracer.export_chrome(self.TRACE_FILE)
+            except OSError as e:
+                self.text_box.set(f'[Trace] export failed: {e}')
+            if self.__click_latency:
+                ordered = sorted(self.__click_latency)
+                self.text_box.set(f'[Click] n={len(ordered)} | '
+                                  f'p50 {ordered[len(ordered) // 2] * 1000:.1f}ms | '
+                                  f'max {ordered[-1] * 1000:.1f}ms')
\ No newline at end of file
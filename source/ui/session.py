@@ -0,0 +1,332 @@
+"""Several independent games on different screen regions in one process.
+
+Every GameSession owns its board geometry, an engine leased from a shared
+EnginePool, its clock and a small state machine. The SessionManager runs one
+CaptureService over the union of all board regions and every session reads
+its own board as a view of the shared frame, so N tables cost one grab per
+tick instead of N (click verification included).
+"""
+
+import threading
+import time
+import numpy as np
+from typing         import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from pygomo         import Engine, Move, PlayResult
+from pygomo.server  import EnginePool
+from utils          import detect_opening, detect_move, detect_stone
+from utils          import Board, IInputBackend, InputBackendFactory
+from utils          import CaptureService
+from utils          import TimeManager
+
+
+Region = Tuple[int, int, int, int]  # left, top, width, height
+
+
+class GameSession:
+    """One game on one board region.
+
+    States:
+        IDLE -> OPENING -> (THINKING -> CLICKING -> WAITING)* -> STOPPED | FAILED
+    """
+
+    IDLE     = 'idle'
+    OPENING  = 'opening'
+    WAITING  = 'waiting'
+    THINKING = 'thinking'
+    CLICKING = 'clicking'
+    STOPPED  = 'stopped'
+    FAILED   = 'failed'
+
+    SEARCH_GRACE = 2.0  # Seconds an engine may answer past its time left before the session fails
+
+    def __init__(
+        self,
+        name      : str,
+        position  : Region,
+        manager   : "SessionManager",
+        time_match: int,
+        time_plus : int = 0
+    ):
+        """
+        Args:
+            name: Label used in log messages.
+            position: Board region (left, top, width, height) on screen.
+            manager: Manager providing frames, engines and the mouse.
+            time_match: Game time in seconds.
+            time_plus: Increment per move in seconds.
+
+        Raises:
+            ValueError: If the region is empty.
+        """
+        if None in position or position[2] <= 0 or position[3] <= 0:
+            raise ValueError(f"Invalid board region for session '{name}': {position}")
+        self.name        = name
+        self.position    = tuple(int(v) for v in position)
+        self.distance    = self.position[2] / 14
+        self.board       = Board(self.position[:2], self.position[2:], 15, 15,
+                                 backend  = manager.backend,
+                                 verifier = self._verify)
+        self._manager    = manager
+        self._time_match = time_match
+        self._time_plus  = time_plus
+        self._state      = self.IDLE
+        self._running    = False
+        self._thread     : Optional[threading.Thread] = None
+        self.moves       : List[Tuple[int, int, int]] = []
+        self.error       : Optional[str] = None
+
+    @property
+    def state(self) -> str:
+        return self._state
+
+    def _set_state(self, state: str) -> None:
+        self._state = state
+
+    def _log(self, *text) -> None:
+        self._manager.log(f'[{self.name}]', *text)
+
+    def start(self) -> None:
+        """Lease an engine and play on a background thread."""
+        if self._thread is not None and self._thread.is_alive():
+            raise RuntimeError(f"Session '{self.name}' is already running")
+        self._running = True
+        self.error    = None
+        self._thread  = threading.Thread(target=self._run, name=f"Session-{self.name}", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._running = False
+
+    def join(self, timeout: Optional[float] = None) -> None:
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self) -> None:
+        try:
+            with self._manager.pool.lease() as engine:
+                self._play(engine)
+            self._set_state(self.STOPPED)
+        except Exception as e:
+            # One table failing (dead engine, lost board) must not stop the others
+            self.error = str(e) or type(e).__name__
+            self._log(f'[Error] {self.error}')
+            self._set_state(self.FAILED)
+        finally:
+            self._running = False
+
+    def _read(self, after: int, detector: Callable[[np.ndarray], Any], since_ns: int = 0) -> Optional[Tuple[int, int, Any]]:
+        """Run `detector` on this board in the next frame newer than `after` grabbed after `since_ns`.
+
+        Returns:
+            (frame sequence, capture time in perf_counter_ns, detector result),
+            or None once the session stops.
+        """
+        capture = self._manager.capture
+        while self._running:
+            with capture.read(self.position, after, timeout=0.5) as frame:
+                if frame is None:
+                    continue
+                after = frame.seq
+                if frame.timestamp_ns >= since_ns:
+                    return frame.seq, frame.timestamp_ns, detector(frame.image)
+        return None
+
+    def _verify(self, x: int, y: int) -> bool:
+        # Click verification samples the shared frame instead of grabbing the screen again
+        with self._manager.capture.read(self.position, timeout=0) as frame:
+            return frame is not None and detect_stone(self.position[0], self.position[1], self.distance,
+                                                      x, y, image=frame.image)
+
+    def _think(self, engine: Engine, clock: TimeManager) -> Optional[Move]:
+        """Wait for the engine's move.
+
+        Raises:
+            RuntimeError: If the engine died or did not answer within its time left plus a grace period.
+        """
+        self._set_state(self.THINKING)
+        deadline = time.monotonic() + clock.engine_time_left() / 1000 + self.SEARCH_GRACE
+        while self._running:
+            if not engine.is_alive():
+                raise RuntimeError(f'Engine {engine.id} died while thinking')
+            if time.monotonic() > deadline:
+                raise RuntimeError(f'Engine {engine.id} did not answer in time')
+            best_move = engine._receive('coord', timeout=0.05)
+            if best_move:
+                info = PlayResult(None, engine._receive('message', reset=True)).info
+                move = Move(best_move)
+                if info:
+                    self._log(f'[BestMove] {move.to_alphabet()} | DEPTH {info["depth"]} | NPS {info["nps"]}')
+                return move
+        # Stopped mid-search: wait for the stopped search's move and drop it, so
+        # the engine goes back to the pool without a late answer in its queue
+        if not engine.settle():
+            self._log('[Engine] did not answer STOP')
+        return None
+
+    def _click(self, move: Move) -> bool:
+        self._set_state(self.CLICKING)
+        try:
+            with self._manager.mouse:
+                latency = self.board.play_confirmed(*move.to_num())
+        except RuntimeError as e:
+            self._log(f'[Click] {e}, stopping game')
+            self._running = False
+            return False
+        self.moves.append((*move.to_num(), 1))
+        self._log(f'[Click] {move.to_alphabet()} confirmed in {latency * 1000:.1f}ms')
+        return True
+
+    def _play(self, engine: Engine) -> None:
+        protocol = engine.protocol
+        clock    = TimeManager(self._time_match * 1000, self._time_plus * 1000)
+
+        def detect(image: np.ndarray):
+            with clock.phase('detect'):
+                return detect_move(*self.position, self.distance, image=image)
+
+        # Opening
+        self._set_state(self.OPENING)
+        if (result := self._read(0, lambda image: detect_opening(*self.position, self.distance, image=image))) is None:
+            return
+        seq, captured_ns, opening = result
+        clock.start_turn(captured_ns)
+        self.moves = [(move[0], move[1], 1 if len(opening) % 2 == idx % 2 else 2) for idx, move in enumerate(opening)]
+        protocol.configure({
+            'timeout_match': self._time_match * 1000,
+            'time_left'    : clock.engine_time_left(),
+            'rule'         : 1
+        })
+        protocol.send_board(self.moves)
+
+        cur_move = None
+        while self._running:
+            with clock.phase(TimeManager.ENGINE_PHASE):
+                output = self._think(engine, clock)
+            if output is None:
+                return
+            with clock.phase('click'):
+                if not self._click(output):
+                    return
+            clock.end_turn()
+            cur_move   = output.to_num()
+            clicked_ns = time.perf_counter_ns()
+
+            # Wait for the opponent's stone, in frames grabbed after our click rendered
+            self._set_state(self.WAITING)
+            move = None
+            while self._running and (move is None or move == cur_move):
+                if (result := self._read(seq, detect, clicked_ns)) is None:
+                    return
+                seq, captured_ns, move = result
+            if move is None or move == cur_move:
+                return
+
+            clock.start_turn(captured_ns)
+            self.moves.append((*move, 2))
+            protocol.configure({'time_left': clock.engine_time_left()})
+            protocol.send_command('turn', Move(move).to_strnum())
+
+
+class SessionManager:
+    """Runs several GameSessions off one shared capture and one engine pool.
+
+    Sessions are added before start(); the capture region is the union of their
+    boards, grabbed by a CaptureService every `tick_ms`.
+    """
+
+    def __init__(
+        self,
+        pool   : EnginePool,
+        log    : Callable[..., None]     = print,
+        tick_ms: float                   = 16.0,
+        backend: Optional[IInputBackend] = None
+    ):
+        """
+        Args:
+            pool: Engines leased by the sessions, one per running session.
+            log: Callable receiving log message parts.
+            tick_ms: Capture period in milliseconds.
+            backend: Input backend shared by all boards; picked by platform if None.
+        """
+        self.pool        = pool
+        self.log         = log
+        self.backend     = backend if backend is not None else InputBackendFactory.create()
+        self.mouse       = threading.Lock()  # One pointer: clicks of different tables must not interleave
+        self.capture     : Optional[CaptureService] = None
+        self._tick_ms    = tick_ms
+        self._sessions   : Dict[str, GameSession] = {}
+
+    @property
+    def sessions(self) -> List[GameSession]:
+        return list(self._sessions.values())
+
+    @property
+    def union(self) -> Optional[Region]:
+        """Screen region grabbed each tick (left, top, width, height)."""
+        return self.capture.region if self.capture is not None else None
+
+    def add_session(self, name: str, position: Region, time_match: int, time_plus: int = 0) -> GameSession:
+        """Register a board region as a new session.
+
+        Raises:
+            RuntimeError: If the manager is running.
+            ValueError: If the name is taken or the region is invalid.
+        """
+        if self.is_running():
+            raise RuntimeError("Cannot add a session while sessions are running")
+        if name in self._sessions:
+            raise ValueError(f"Session '{name}' already exists")
+        session = GameSession(name, position, self, time_match, time_plus)
+        self._sessions[name] = session
+        return session
+
+    def remove_session(self, name: str) -> None:
+        """
+        Raises:
+            RuntimeError: If the manager is running.
+        """
+        if self.is_running():
+            raise RuntimeError("Cannot remove a session while sessions are running")
+        self._sessions.pop(name, None)
+
+    @staticmethod
+    def union_of(regions: Sequence[Region]) -> Region:
+        """Return the smallest region containing every region."""
+        left   = min(r[0] for r in regions)
+        top    = min(r[1] for r in regions)
+        right  = max(r[0] + r[2] for r in regions)
+        bottom = max(r[1] + r[3] for r in regions)
+        return left, top, right - left, bottom - top
+
+    def start(self) -> None:
+        """Start the shared capture and every session.
+
+        Raises:
+            RuntimeError: If there is no session or already running.
+        """
+        if not self._sessions:
+            raise RuntimeError("No session to start")
+        if self.is_running():
+            raise RuntimeError("Sessions are already running")
+        self.capture = CaptureService(self.union_of([s.position for s in self._sessions.values()]), self._tick_ms)
+        self.capture.start()
+        for session in self._sessions.values():
+            session.start()
+        union = self.capture.region
+        self.log(f'[Sessions] {len(self._sessions)} table(s), capture {union[2]}x{union[3]}')
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop every session, then the capture."""
+        for session in self._sessions.values():
+            session.stop()
+        for session in self._sessions.values():
+            session.join(timeout)
+        if self.capture is not None:
+            self.capture.stop()
+
+    def is_running(self) -> bool:
+        return self.capture is not None and self.capture.is_running()
+
+    def status(self) -> Dict[str, str]:
+        """Return the state of every session."""
+        return {name: session.state for name, session in self._sessions.items()}
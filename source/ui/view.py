@@ -28,6 +28,7 @@ class View(ttk.Window):
         self.__timeP_var  = ttk.IntVar(self)
         self.__engine_var = ttk.StringVar(self)
         self.__switch_var = ttk.BooleanVar(self.__setting_frame)
+        self.__ponder_var = ttk.BooleanVar(self.__setting_frame)
 
         # Register handler
         self.__view_model = view_model
@@ -35,6 +36,7 @@ class View(ttk.Window):
         self.__view_model.timeP_entry.subscribe(self.__timeP_var)
         self.__view_model.engine_entry.subscribe(self.__engine_var)
         self.__view_model.switch_button.subscribe(self.__switch_var)
+        self.__view_model.ponder_button.subscribe(self.__ponder_var)
 
         # Label
         self.__label_1 = ttk.Label(self, text="Time (s):")
@@ -64,21 +66,29 @@ class View(ttk.Window):
         self.__set_engine_button = ttk.Button(self.__setting_frame, text='Select Engine', width=15)
         self.__detect_board      = ttk.Button(self.__setting_frame, text='Detect Board', width=15)
         self.__start_button      = ttk.Button(self.__setting_frame, text='Turn On', width=15)
+        self.__add_table_button  = ttk.Button(self.__setting_frame, text='Add Table', width=15)
+        self.__tables_button     = ttk.Button(self.__setting_frame, text='Start Tables', width=15)
 
         self.__setting_button.grid(column=0, columnspan=2, row=4, padx=5, pady=(2.5, 5), sticky='we')
         self.__set_engine_button.grid(column=1, row=0, padx=(5, 2.5), pady=5, sticky='we')
         self.__detect_board.grid(column=2, row=0, padx=(2.5, 2.5), pady=5, sticky='we')
         self.__start_button.grid(column=3, row=0, padx=(2.5, 5), pady=5, sticky='we')
+        self.__add_table_button.grid(column=2, row=1, padx=(2.5, 2.5), pady=(0, 5), sticky='we')
+        self.__tables_button.grid(column=3, row=1, padx=(2.5, 5), pady=(0, 5), sticky='we')
 
         # CheckButton        
         self.__switch = ttk.Checkbutton(self.__setting_frame, bootstyle='round-toggle', text='Auto', variable=self.__switch_var)
         self.__switch.grid(column=0, row=0, padx=(5, 2.5), pady=5, sticky='we')
+        self.__ponder = ttk.Checkbutton(self.__setting_frame, bootstyle='round-toggle', text='Ponder', variable=self.__ponder_var)
+        self.__ponder.grid(column=0, row=1, padx=(5, 2.5), pady=(0, 5), sticky='we')
 
         # Configure
         self.__setting_button.configure(command=self.__show_setting_frame)
         self.__detect_board.configure(command=lambda: self.__view_model.detect_board(self))
         self.__set_engine_button.configure(command=self.__view_model.select_engine)
         self.__start_button.configure(command=self.__view_model.turn_on)
+        self.__add_table_button.configure(command=lambda: self.__view_model.add_table(self))
+        self.__tables_button.configure(command=self.__view_model.start_tables)
         self.edit_textbox('set', f'AutoGomoku {self.VERSION} by NguyenMinh')
 
     def edit_textbox(self, mode: str, *text):
@@ -93,6 +103,7 @@ class View(ttk.Window):
         # Find and terminate engine if exist
         self.destroy()
         self.__view_model.safe_kill_engine()
+        self.__view_model.log_text.close()
 
     def __set_window(self):
         self.update_idletasks()
@@ -9,6 +9,7 @@ class ViewModel:
         self.timeP_entry   = self.__model.time_plus
         self.engine_entry  = self.__model.engine
         self.switch_button = self.__model.mode
+        self.ponder_button = self.__model.ponder
         self.log_text      = self.__model.text_box
 
     def safe_kill_engine(self):
@@ -17,6 +18,12 @@ class ViewModel:
     def detect_board(self, master):
         self.__model.detect_board(master)
 
+    def add_table(self, master):
+        self.__model.add_table(master)
+
+    def start_tables(self):
+        self.__model.start_tables()
+
     def select_engine(self):
         fn = askopenfilename(filetypes=[("Executable Files", "*.exe")], title="Select Engine")
         if fn != '':
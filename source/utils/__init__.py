@@ -1,30 +1,50 @@
 from .listener        import Listener, HotkeyError
+from .key_source      import KeyEvent, IKeySource, KeySourceFactory, ReplayKeySource
 from .contours        import group_overlapping_contours
 from .screen_capture  import ScreenCapture
-from .helper          import CustomArr, ArrangedArr, img_crop, screenshot, screenshot_region, LogText
+from .helper          import CustomArr, ArrangedArr, img_crop, screenshot, screenshot_region, screenshot_box, LogText
 from .helper          import convert_time
-from .board           import Board
-from .detect          import detect_board, detect_opening, detect_move
-from .data_binding    import DataBinding
+from .board           import Board, parse_moves, format_moves
+from .input_backend   import IInputBackend, InputBackendFactory, RecordingInputBackend
+from .capture_service import CaptureService, Frame
+from .detect          import detect_board, detect_opening, detect_move, detect_stone
+from .data_binding    import DataBinding, Settings, Snapshot
 from .proc            import check_state, kill_process
+from .time_manager    import TimeManager
 
 __all__ = [
     'Listener',
     'HotkeyError',
+    'KeyEvent',
+    'IKeySource',
+    'KeySourceFactory',
+    'ReplayKeySource',
     'group_overlapping_contours',
     'ScreenCapture',
     'CustomArr',
     'ArrangedArr',
     'Board',
+    'parse_moves',
+    'format_moves',
+    'IInputBackend',
+    'InputBackendFactory',
+    'RecordingInputBackend',
+    'CaptureService',
+    'Frame',
     'detect_board',
     'detect_opening',
     'detect_move',
+    'detect_stone',
     'img_crop',
     'screenshot',
     'screenshot_region',
+    'screenshot_box',
     'DataBinding',
+    'Settings',
+    'Snapshot',
     'check_state',
     'convert_time',
     'kill_process',
+    'TimeManager',
     'LogText'
 ]
\ No newline at end of file
@@ -1,7 +1,8 @@
 import time
-import win32api
-import win32con
-from typing import Tuple, List, Optional
+from typing          import Tuple, List, Optional, Callable, Sequence
+from common.notation import parse_moves, format_moves
+from common.tracing  import traced
+from .input_backend  import IInputBackend, InputBackendFactory
 
 
 def valid(move: str, size_x: int = 15, size_y: int = 15) -> bool:
@@ -56,24 +57,7 @@ def get(move_string: str, size_x: int = 15, size_y: int = 15) -> List[Tuple[int,
     Returns:
         List of (x, y) coordinate tuples for valid moves.
     """
-    moves = []
-    i     = 0
-    while i < len(move_string):
-        # Extract letter
-        if i >= len(move_string) or not move_string[i].isalpha():
-            i += 1
-            continue
-        letter = move_string[i]
-        i += 1
-        # Extract number
-        number = ""
-        while i < len(move_string) and move_string[i].isdigit():
-            number += move_string[i]
-            i += 1
-        move = letter + number
-        if valid(move, size_x, size_y):
-            moves.append(convert_move(move, size_y))
-    return moves
+    return [(x, y) for x, y in parse_moves(move_string, size_x, size_y).tolist()]
 
 
 class Board:
@@ -81,9 +65,21 @@ class Board:
     Simulates mouse clicks on a grid for board interactions.
 
     Maps move strings (e.g., 'a1') to screen coordinates based on a top-left point
-    and grid size, performing clicks for valid moves.
+    and grid size, performing clicks for valid moves. Clicks go through a pluggable
+    input backend; when a verifier is given, a click is confirmed by re-sampling the
+    target intersection instead of sleeping for a fixed time.
     """
-    def __init__(self, point: Tuple[int, int], size: Tuple[int, int], size_x: int, size_y: int):
+    def __init__(
+        self,
+        point         : Tuple[int, int],
+        size          : Tuple[int, int],
+        size_x        : int,
+        size_y        : int,
+        backend       : Optional[IInputBackend]              = None,
+        verifier      : Optional[Callable[[int, int], bool]] = None,
+        verify_timeout: float                                = 0.25,
+        verify_poll   : float                                = 0.002
+    ):
         """
         Initialize the board with grid geometry.
 
@@ -92,6 +88,11 @@ class Board:
             size: Grid dimensions (width, height) in pixels.
             size_x: Number of columns.
             size_y: Number of rows.
+            backend: Input backend used for clicks; picked by platform if None.
+            verifier: Callable (x, y) -> bool in grid coordinates that reports
+                whether a stone is visible at that intersection.
+            verify_timeout: Maximum time (seconds) to wait for a click to render.
+            verify_poll: Delay (seconds) between two verifier samples.
 
         Raises:
             ValueError: If size_x, size_y, or size are invalid.
@@ -110,6 +111,17 @@ class Board:
         self.__dis_x    = self.__w / (size_x - 1) if size_x > 1 else 0
         self.__dis_y    = self.__h / (size_y - 1) if size_y > 1 else 0
 
+        self.__backend        = backend if backend is not None else InputBackendFactory.create()
+        self.__verifier       = verifier
+        self.__verify_timeout = verify_timeout
+        self.__verify_poll    = verify_poll
+
+    @property
+    def backend(self) -> IInputBackend:
+        """Return the input backend used for clicks."""
+        return self.__backend
+
+    @traced('Board.click')
     def click(self, x: int, y: int) -> None:
         """
         Simulate a left mouse click at the given screen coordinates.
@@ -122,13 +134,89 @@ class Board:
             RuntimeError: If clicking is not supported on the platform.
         """
         try:
-            win32api.SetCursorPos((round(x), round(y)))
-            win32api.mouse_event(win32con.MOUSEEVENTF_LEFTDOWN, 0, 0)
-            win32api.mouse_event(win32con.MOUSEEVENTF_LEFTUP, 0, 0)
-            time.sleep(0.05)
+            self.__backend.click(round(x), round(y))
         except Exception as e:
             raise RuntimeError(f"Failed to simulate click at ({x}, {y}): {e}")
 
+    def click_many(self, coords: Sequence[Tuple[int, int]]) -> None:
+        """
+        Simulate left clicks at several screen coordinates in a single batch.
+
+        Args:
+            coords: Screen coordinates to click, in order.
+
+        Raises:
+            RuntimeError: If the backend failed to deliver the batch.
+        """
+        try:
+            self.__backend.click_many([(round(x), round(y)) for x, y in coords])
+        except Exception as e:
+            raise RuntimeError(f"Failed to simulate {len(coords)} clicks: {e}")
+
+    def verify(self, x: int, y: int, timeout: Optional[float] = None) -> bool:
+        """
+        Poll the target intersection until a stone appears or the timeout expires.
+
+        Args:
+            x: Grid x-coordinate (column).
+            y: Grid y-coordinate (row).
+            timeout: Maximum time to wait (seconds); defaults to verify_timeout.
+
+        Returns:
+            True if the stone was seen (or no verifier is set), False on timeout.
+        """
+        if self.__verifier is None:
+            return True
+        deadline = time.perf_counter() + (self.__verify_timeout if timeout is None else timeout)
+        while True:
+            if self.__verifier(x, y):
+                return True
+            if time.perf_counter() >= deadline:
+                return False
+            time.sleep(self.__verify_poll)
+
+    def play(self, x: int, y: int) -> bool:
+        """
+        Click a grid intersection and confirm that the stone was placed.
+
+        Args:
+            x: Grid x-coordinate (column).
+            y: Grid y-coordinate (row).
+
+        Returns:
+            True if the click was confirmed by the verifier, False otherwise.
+        """
+        self.click(*self.move_to_coord(x, y))
+        return self.verify(x, y)
+
+    def play_confirmed(self, x: int, y: int, attempts: int = 3, backoff: float = 2.0) -> float:
+        """
+        Click a grid intersection until the stone is seen, retrying with backoff.
+
+        Each attempt clicks once and polls the intersection; the verification window
+        grows by `backoff` after every miss.
+
+        Args:
+            x: Grid x-coordinate (column).
+            y: Grid y-coordinate (row).
+            attempts: Maximum number of clicks to send.
+            backoff: Multiplier applied to the verification window after a miss.
+
+        Returns:
+            Click-to-render latency (seconds) of the successful attempt.
+
+        Raises:
+            RuntimeError: If the stone did not appear after all attempts.
+        """
+        timeout = self.__verify_timeout
+        for _ in range(max(attempts, 1)):
+            start = time.perf_counter()
+            self.click(*self.move_to_coord(x, y))
+            if self.verify(x, y, timeout):
+                return time.perf_counter() - start
+            timeout *= backoff
+        raise RuntimeError(f"Click on ({x}, {y}) was not confirmed after {attempts} attempts")
+
     def move_to_coord(self, x: int, y: int) -> Tuple[int, int]:
         """
         Convert grid coordinates to screen coordinates.
@@ -148,9 +236,19 @@ class Board:
         """
         Simulate clicks for a string of moves.
 
+        Without a verifier the whole sequence is sent as one batch; with a verifier
+        each move is confirmed before the next one is clicked.
+
         Args:
             move_string: String of moves (e.g., 'a1b2c3').
+
+        Raises:
+            RuntimeError: If a move could not be confirmed on the board.
         """
-        moves = get(move_string, self.__size_x, self.__size_y)
+        moves = parse_moves(move_string, self.__size_x, self.__size_y).tolist()
+        if self.__verifier is None:
+            self.click_many([self.move_to_coord(*move) for move in moves])
+            return
         for move in moves:
-            self.click(*self.move_to_coord(*move))
\ No newline at end of file
+            if not self.play(*move):
+                raise RuntimeError(f"Click on {move} was not confirmed on the board")
\ No newline at end of file
@@ -0,0 +1,240 @@
+"""One screen grab per tick, shared by every consumer without copies.
+
+A single thread grabs a fixed region at a fixed tick into one of two
+preallocated buffers. Consumers read the latest frame as read-only numpy views
+of their own sub-regions, tagged with the frame's sequence number and capture
+time. A buffer is never overwritten while a consumer still reads it: if the
+back buffer is held when a tick comes, that tick is skipped.
+"""
+
+import logging
+import threading
+import time
+import cv2
+import numpy as np
+from contextlib        import contextmanager
+from typing            import Callable, Dict, Iterator, NamedTuple, Optional, Sequence, Tuple
+from common.resources  import pin_current_thread
+from common.tracing    import span
+from .helper           import _get_sct
+
+
+Region = Tuple[int, int, int, int]  # left, top, width, height (screen_box coordinates)
+
+
+class Frame(NamedTuple):
+    """A view of one captured frame.
+
+    Attributes:
+        seq: Frame sequence number, starting at 1.
+        timestamp_ns: perf_counter_ns when the grab started.
+        image: Read-only RGB view (height, width, 3) of the requested region.
+        region: Screen region of `image` (left, top, width, height).
+    """
+    seq         : int
+    timestamp_ns: int
+    image       : np.ndarray
+    region      : Region
+
+
+def grab_into(region: Region, out: np.ndarray) -> None:
+    """Grab a screen region with mss and convert it to RGB in place into `out`."""
+    sct    = _get_sct()
+    origin = sct.monitors[0]
+    left, top, width, height = region
+    shot   = sct.grab({'left': origin['left'] + left, 'top': origin['top'] + top, 'width': width, 'height': height})
+    bgra   = np.frombuffer(shot.raw, dtype=np.uint8).reshape(height, width, 4)
+    cv2.cvtColor(bgra, cv2.COLOR_BGRA2RGB, dst=out)
+
+
+def screen_region() -> Region:
+    """Return the region covering every monitor."""
+    monitor = _get_sct().monitors[0]
+    return 0, 0, monitor['width'], monitor['height']
+
+
+class CaptureService:
+    """Grabs a screen region at a fixed tick and shares the frames.
+
+    Example:
+        capture = CaptureService((left, top, width, height))
+        capture.start()
+        with capture.read(board_region, after=seq) as frame:
+            move = detect_move(..., image=frame.image)
+            seq  = frame.seq
+    """
+
+    def __init__(
+        self,
+        region : Optional[Region]                     = None,
+        tick_ms: float                                = 16.0,
+        grab   : Callable[[Region, np.ndarray], None] = grab_into,
+        cpus   : Optional[Sequence[int]]              = None
+    ):
+        """
+        Args:
+            region: Screen region to grab; every monitor if None.
+            tick_ms: Capture period in milliseconds.
+            grab: Callable filling a preallocated (height, width, 3) RGB array
+                with the region; defaults to an mss grab.
+            cpus: CPUs the capture thread is pinned to, if given.
+
+        Raises:
+            ValueError: If the region is empty or the tick is not positive.
+        """
+        region = tuple(int(v) for v in (region if region is not None else screen_region()))
+        if region[2] <= 0 or region[3] <= 0:
+            raise ValueError(f"Invalid capture region: {region}")
+        if tick_ms <= 0:
+            raise ValueError("tick_ms must be positive")
+        self._region   : Region = region
+        self._tick_ns  = int(tick_ms * 1_000_000)
+        self._grab     = grab
+        self._cpus     = list(cpus) if cpus else None
+        self._buffers  = [np.zeros((region[3], region[2], 3), dtype=np.uint8) for _ in range(2)]
+        self._views    = [buffer.view() for buffer in self._buffers]
+        for view in self._views:
+            view.setflags(write=False)
+        self._readers  = [0, 0]
+        self._front    = -1
+        self._seq      = 0
+        self._stamp    = 0
+        self._cond     = threading.Condition()
+        self._running  = False
+        self._thread   : Optional[threading.Thread] = None
+        self._skipped  = 0
+        self._late     = 0
+        self._errors   = 0
+
+    @property
+    def region(self) -> Region:
+        return self._region
+
+    @property
+    def seq(self) -> int:
+        """Sequence number of the latest frame (0 before the first one)."""
+        return self._seq
+
+    def is_running(self) -> bool:
+        return self._running
+
+    def start(self) -> None:
+        """Start the capture thread.
+
+        Raises:
+            RuntimeError: If the service is already running.
+        """
+        if self._running:
+            raise RuntimeError("Capture service is already running")
+        self._running = True
+        self._thread  = threading.Thread(target=self._loop, name="CaptureService", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 1.0) -> None:
+        """Stop the capture thread and wake every waiting reader."""
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def __enter__(self) -> "CaptureService":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.stop()
+
+    def _crop(self, index: int, region: Optional[Region]) -> Tuple[np.ndarray, Region]:
+        if region is None:
+            return self._views[index], self._region
+        left, top, width, height = (int(v) for v in region)
+        x, y = left - self._region[0], top - self._region[1]
+        if x < 0 or y < 0 or x + width > self._region[2] or y + height > self._region[3]:
+            raise ValueError(f"Region {region} is outside the captured region {self._region}")
+        return self._views[index][y:y + height, x:x + width], (left, top, width, height)
+
+    @contextmanager
+    def read(
+        self,
+        region : Optional[Region] = None,
+        after  : int              = 0,
+        timeout: Optional[float]  = None
+    ) -> Iterator[Optional[Frame]]:
+        """Borrow the latest frame newer than `after`, as a view of `region`.
+
+        The view is only valid inside the block; copy it to keep it. Holding it
+        for long makes the capture thread skip ticks.
+
+        Args:
+            region: Screen region to view; the whole captured region if None.
+            after: Only return frames with a higher sequence number.
+            timeout: Maximum time (seconds) to wait for such a frame.
+
+        Yields:
+            The frame, or None on timeout or when the service stopped.
+
+        Raises:
+            ValueError: If the region is not inside the captured region.
+        """
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._seq > after or not self._running, timeout) \
+                    or self._seq <= after:
+                index = -1
+            else:
+                index, seq, stamp     = self._front, self._seq, self._stamp
+                self._readers[index] += 1
+        if index < 0:
+            yield None
+            return
+        try:
+            image, region = self._crop(index, region)
+            yield Frame(seq, stamp, image, region)
+        finally:
+            with self._cond:
+                self._readers[index] -= 1
+
+    def snapshot(self, region: Optional[Region] = None) -> Optional[Frame]:
+        """Return a copy of the latest frame (for consumers that keep frames, e.g. debug viewers)."""
+        with self.read(region, timeout=0) as frame:
+            if frame is None:
+                return None
+            return frame._replace(image=frame.image.copy())
+
+    def stats(self) -> Dict[str, int]:
+        """Return frames grabbed, ticks skipped because a reader held the buffer, late ticks and grab errors."""
+        return {"frames": self._seq, "skipped": self._skipped, "late": self._late, "errors": self._errors}
+
+    def _loop(self) -> None:
+        if self._cpus:
+            pin_current_thread(self._cpus)
+        next_tick = time.perf_counter_ns()
+        while self._running:
+            back = 0 if self._front < 0 else 1 - self._front
+            with self._cond:
+                busy = self._readers[back] > 0
+            if busy:
+                self._skipped += 1
+            else:
+                stamp = time.perf_counter_ns()
+                try:
+                    with span("CaptureService.grab"):
+                        self._grab(self._region, self._buffers[back])
+                except Exception as e:
+                    self._errors += 1
+                    logging.warning(f"Screen capture failed: {e}")
+                else:
+                    with self._cond:
+                        self._front  = back
+                        self._stamp  = stamp
+                        self._seq   += 1
+                        self._cond.notify_all()
+            next_tick += self._tick_ns
+            delay      = next_tick - time.perf_counter_ns()
+            if delay > 0:
+                time.sleep(delay / 1e9)
+            else:
+                # Fell behind: realign instead of grabbing a burst of frames
+                self._late += 1
+                next_tick   = time.perf_counter_ns()
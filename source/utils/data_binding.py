@@ -1,32 +1,150 @@
+import itertools
+import threading
 from ttkbootstrap import Variable
 from tkinter      import TclError
+from typing       import Any, Callable, Dict, List, Optional
+
+
+# Shared across bindings so every published value gets a unique, increasing version
+_versions = itertools.count(1)
 
 
 class DataBinding:
+    """
+    Two-way binding between a model value and a Tk variable.
+
+    The value is published by swapping a single reference, so any thread can read
+    it with get() without touching Tk. Only the UI thread (the one that called
+    subscribe) reads or writes the Tk variable; values set from other threads are
+    pushed to the widget by a short `after` poll on the UI thread.
+    """
+
+    SYNC_INTERVAL_MS = 100
+
     def __init__(self, initial_value=None, model_var=None):
-        self.__value              = initial_value
-        self.__variable: Variable = None
+        self.__value                                  = initial_value
+        self.__version  : int                         = next(_versions)
+        self.__synced   : int                         = 0
+        self.__variable : Variable                    = None
+        self.__ui_thread: Optional[int]               = None
+        self.__watchers : List[Callable[[Any], None]] = []
 
     def subscribe(self, variable: Variable):
-        self.__variable = variable
+        self.__variable  = variable
+        self.__ui_thread = threading.get_ident()
         self.__variable.trace_add('write', self.__on_change)
         if not self.__variable.get():
             self.update()
+        self.__synced    = self.__version
+        self.__variable._root.after(self.SYNC_INTERVAL_MS, self.__sync)
+
+    def watch(self, callback: Callable[[Any], None]):
+        """Call `callback(value)` on the publishing thread whenever the value changes."""
+        self.__watchers.append(callback)
+
+    def __publish(self, value):
+        self.__value   = value
+        self.__version = next(_versions)
+        for callback in self.__watchers:
+            callback(value)
 
     def __on_change(self, *_):
         try:
             if self.__variable and (value := self.__variable.get()) != self.__value and value != '':
-                self.__value = value
+                self.__publish(value)
+                self.__synced = self.__version
         except (TclError, ValueError):
             return
 
+    def __sync(self):
+        # UI thread only: push values published by worker threads into the Tk variable
+        try:
+            if self.__synced != self.__version:
+                self.update()
+            self.__variable._root.after(self.SYNC_INTERVAL_MS, self.__sync)
+        except TclError:
+            # Window destroyed
+            return
+
     def update(self):
+        self.__synced = self.__version
         self.__variable.set(self.__value)
 
     def set(self, value):
         if value != self.__value:
-            self.__value = value
-            self.update()
+            self.__publish(value)
+            if self.__variable is not None and threading.get_ident() == self.__ui_thread:
+                self.update()
 
     def get(self):
-        return self.__value
\ No newline at end of file
+        return self.__value
+
+    @property
+    def version(self) -> int:
+        """Version of the current value; changes every time a new value is published."""
+        return self.__version
+
+
+class Snapshot:
+    """Immutable view of several bindings taken at one version."""
+
+    __slots__ = ('_values', '_version')
+
+    def __init__(self, values: Dict[str, Any], version: int):
+        object.__setattr__(self, '_values' , dict(values))
+        object.__setattr__(self, '_version', version)
+
+    def __getattr__(self, name: str):
+        try:
+            return self._values[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __getitem__(self, name: str):
+        return self._values[name]
+
+    def __setattr__(self, name, value):
+        raise AttributeError('Snapshot is immutable')
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def as_dict(self) -> Dict[str, Any]:
+        return dict(self._values)
+
+    def __repr__(self) -> str:
+        return f'Snapshot(version={self._version}, {self._values})'
+
+
+class Settings:
+    """
+    Publishes immutable snapshots of a group of bindings.
+
+    Every change of a binding rebuilds the snapshot and swaps it in with a single
+    reference assignment, so worker threads read a consistent set of values with
+    snapshot() and never call into Tk.
+    """
+
+    def __init__(self, **bindings: DataBinding):
+        self.__bindings = bindings
+        self.__lock     = threading.Lock()
+        self.__snapshot = self.__build()
+        for binding in bindings.values():
+            binding.watch(self.__on_change)
+
+    def __build(self) -> Snapshot:
+        return Snapshot({name: binding.get() for name, binding in self.__bindings.items()},
+                        max(binding.version for binding in self.__bindings.values()))
+
+    def __on_change(self, _):
+        # Writers are rare (UI edits); the lock only orders concurrent rebuilds
+        with self.__lock:
+            self.__snapshot = self.__build()
+
+    def snapshot(self) -> Snapshot:
+        return self.__snapshot
+
+    @property
+    def version(self) -> int:
+        return self.__snapshot.version
@@ -1,11 +1,12 @@
 import cv2
 import os
 import numpy as np
-from typing    import Tuple, Optional
-from PIL       import Image
-from .contours import group_overlapping_contours
-from .helper   import screenshot_region
-from .helper   import ArrangedArr, CustomArr
+from typing         import Tuple, Optional
+from PIL            import Image
+from common.tracing import traced
+from .contours      import group_overlapping_contours
+from .helper        import screenshot_region, screenshot_box
+from .helper        import ArrangedArr, CustomArr
 
 
 # Load color configuration
@@ -87,9 +88,12 @@ def detect_board(
     return cur_info
 
 
-def detect_opening(left: int, top: int, width: int, height: int, distance: int) -> CustomArr:    
-    # Step 1: Screenshot board
-    image = screenshot_region(left, top, height, width)
+@traced('detect_opening')
+def detect_opening(left: int, top: int, width: int, height: int, distance: int,
+                   image: Optional[np.ndarray] = None) -> CustomArr:    
+    # Step 1: Screenshot board (unless the caller already captured it)
+    if image is None:
+        image = screenshot_region(left, top, height, width)
     image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
     image = Image.fromarray(image)
     
@@ -111,8 +115,11 @@ def detect_opening(left: int, top: int, width: int, height: int, distance: int)
     return list_coord.get()
             
 
-def detect_move(left: int, top: int, width: int, height: int, distance: int) -> Tuple[int, int] | None:
-    image = screenshot_region(left, top, height, width)
+@traced('detect_move')
+def detect_move(left: int, top: int, width: int, height: int, distance: int,
+                image: Optional[np.ndarray] = None) -> Tuple[int, int] | None:
+    if image is None:
+        image = screenshot_region(left, top, height, width)
     
     image = Image.fromarray(image)
 
@@ -129,4 +136,39 @@ def detect_move(left: int, top: int, width: int, height: int, distance: int) ->
                 print(coord)
                 return coord
     cv2.waitKey(1)
-    return None
\ No newline at end of file
+    return None
+
+
+@traced('detect_stone')
+def detect_stone(left: int, top: int, distance: float, x: int, y: int, radius: int = 2,
+                 image: Optional[np.ndarray] = None) -> bool:
+    """
+    Check whether a stone (or the last-move spot) is visible at one intersection.
+
+    Only a (2 * radius + 1)-pixel square around the intersection is grabbed, so this
+    is cheap enough to poll right after a click. With `image` (the board region of a
+    shared frame, see CaptureService) the square is sampled from it instead.
+
+    Args:
+        left: Board left position on screen.
+        top: Board top position on screen.
+        distance: Distance between two grid lines in pixels.
+        x: Grid x-coordinate (column).
+        y: Grid y-coordinate (row, 0 at the bottom).
+        radius: Half-size of the sampled square in pixels.
+        image: Optional RGB image of the board region whose origin is (left, top).
+
+    Returns:
+        True if any sampled pixel matches a stone or spot color.
+    """
+    cx     = int(round(x * distance)) - 1
+    cy     = int(round((14 - y) * distance)) - 1
+    if image is None:
+        image = screenshot_box(left + cx - radius, top + cy - radius, 2 * radius + 1, 2 * radius + 1)
+    else:
+        image = image[max(cy - radius, 0):cy + radius + 1, max(cx - radius, 0):cx + radius + 1]
+    pixels = image.reshape(-1, 3)
+    for color in colors:
+        if np.any(np.all(pixels == color, axis=1)):
+            return True
+    return False
@@ -1,7 +1,26 @@
 import cv2
 import numpy as np
 import mss
+import threading
+import queue
+import logging
+import logging.handlers
+import tkinter as tk
+from collections           import deque
+from typing                import Deque, Optional
 from ttkbootstrap.scrolled import ScrolledText
+from common.tracing        import traced
+
+
+# mss handles are not safe to share between threads; keep one per thread
+_sct_local = threading.local()
+
+
+def _get_sct() -> "mss.base.MSSBase":
+    sct = getattr(_sct_local, 'sct', None)
+    if sct is None:
+        sct = _sct_local.sct = mss.mss()
+    return sct
 
 
 class CustomArr:
@@ -72,6 +91,7 @@ def screenshot():
     return image
 
 
+@traced('screenshot_region')
 def screenshot_region(x1, y1, h, w):
     """
     Capture a screenshot of a specific region of the primary monitor.
@@ -90,6 +110,27 @@ def screenshot_region(x1, y1, h, w):
     return image
 
 
+def screenshot_box(x1, y1, h, w):
+    """
+    Capture only a small region of the screen, without grabbing the full monitor.
+
+    Intended for high-frequency probes such as click verification.
+
+    Args:
+        x1 (int): The x-coordinate of the top-left corner of the region.
+        y1 (int): The y-coordinate of the top-left corner of the region.
+        h  (int): The height of the region.
+        w  (int): The width of the region.
+
+    Returns:
+        numpy.ndarray: The captured region as an RGB image.
+    """
+    sct     = _get_sct()
+    origin  = sct.monitors[0]
+    region  = {'left': origin['left'] + int(x1), 'top': origin['top'] + int(y1), 'width': int(w), 'height': int(h)}
+    return cv2.cvtColor(np.array(sct.grab(region)), cv2.COLOR_BGRA2RGB)
+
+
 def convert_time(milliseconds: float) -> str:
     # Convert milliseconds -> minute:second(ms)
     seconds = int(milliseconds // 1000)
@@ -100,17 +141,93 @@ def convert_time(milliseconds: float) -> str:
 
 
 class LogText:
-    def __init__(self):        
+    """
+    Thread-safe log sink for the Tk log box.
+
+    Producers (game thread, hotkey callbacks) only enqueue records; the Tk main loop
+    drains the queue every `interval_ms` with `after` and inserts each batch with one
+    widget update. The widget keeps at most `max_lines` lines, and every line is also
+    written to a rotating log file by a background listener thread.
+    """
+
+    def __init__(
+        self,
+        max_lines   : int           = 500,
+        interval_ms : int           = 50,
+        log_file    : Optional[str] = 'autogomoku.log',
+        max_bytes   : int           = 1 << 20,
+        backup_count: int           = 3
+    ):
+        """
+        Args:
+            max_lines: Maximum number of lines kept in the widget.
+            interval_ms: Period of the Tk drain loop.
+            log_file: Rotating log file path, or None to disable file logging.
+            max_bytes: Size at which the log file is rotated.
+            backup_count: Number of rotated files kept.
+        """
         self.__log_text_box: ScrolledText = None
+        self.__records     : queue.SimpleQueue = queue.SimpleQueue()
+        self.__max_lines   = max_lines
+        self.__interval_ms = interval_ms
+        self.__listener    : Optional[logging.handlers.QueueListener] = None
+        self.__logger      = logging.getLogger(f'autogomoku.log.{id(self)}')
+        self.__logger.propagate = False
+        self.__logger.setLevel(logging.INFO)
+        if log_file:
+            file_handler = logging.handlers.RotatingFileHandler(log_file, maxBytes=max_bytes,
+                                                                backupCount=backup_count, encoding='utf-8')
+            file_handler.setFormatter(logging.Formatter('%(asctime)s %(message)s'))
+            log_queue    = queue.SimpleQueue()
+            self.__logger.addHandler(logging.handlers.QueueHandler(log_queue))
+            self.__listener = logging.handlers.QueueListener(log_queue, file_handler)
+            self.__listener.start()
 
     def subscribe(self, text_box: ScrolledText):
         self.__log_text_box = text_box
+        text_box.after(self.__interval_ms, self.__drain)
 
+    @traced('LogText.set')
     def set(self, *text):
-        assert isinstance(self.__log_text_box, ScrolledText)
-        self.__log_text_box.insert('end', ' '.join(text) + '\n')
-        self.__log_text_box.see('end')
+        line = ' '.join(map(str, text))
+        self.__records.put(line)
+        self.__logger.info(line)
 
     def clear(self):
-        assert isinstance(self.__log_text_box, ScrolledText)
-        self.__log_text_box.delete('0.0', 'end')
\ No newline at end of file
+        self.__records.put(None)
+
+    def close(self):
+        """Flush and stop the file logger."""
+        if self.__listener is not None:
+            self.__listener.stop()
+            self.__listener = None
+
+    def __drain(self):
+        # Runs on the Tk main loop: take everything queued, keep only what fits on screen
+        pending: Deque[str] = deque(maxlen=self.__max_lines)
+        cleared = False
+        while True:
+            try:
+                record = self.__records.get_nowait()
+            except queue.Empty:
+                break
+            if record is None:
+                cleared = True
+                pending.clear()
+            else:
+                pending.append(record)
+
+        text_box = self.__log_text_box
+        try:
+            if cleared:
+                text_box.delete('1.0', 'end')
+            if pending:
+                text_box.insert('end', '\n'.join(pending) + '\n')
+                lines = int(text_box.index('end-1c').split('.')[0]) - 1
+                if lines > self.__max_lines:
+                    text_box.delete('1.0', f'{lines - self.__max_lines + 1}.0')
+                text_box.see('end')
+            text_box.after(self.__interval_ms, self.__drain)
+        except tk.TclError:
+            # Widget destroyed: the window is closing
+            pass
@@ -0,0 +1,209 @@
+"""Pluggable mouse input backends used by Board to click on the screen."""
+
+import sys
+import ctypes
+from abc       import ABC, abstractmethod
+from threading import Lock
+from typing    import List, Sequence, Tuple
+
+
+Point = Tuple[int, int]
+
+
+class _MouseInput(ctypes.Structure):
+    _fields_ = [
+        ("dx"         , ctypes.c_long),
+        ("dy"         , ctypes.c_long),
+        ("mouseData"  , ctypes.c_ulong),
+        ("dwFlags"    , ctypes.c_ulong),
+        ("time"       , ctypes.c_ulong),
+        ("dwExtraInfo", ctypes.c_void_p),
+    ]
+
+
+class _InputUnion(ctypes.Union):
+    # Only mouse input is sent; the padding covers KEYBDINPUT/HARDWAREINPUT
+    _fields_ = [("mi", _MouseInput), ("_pad", ctypes.c_byte * 32)]
+
+
+class _Input(ctypes.Structure):
+    _fields_ = [("type", ctypes.c_ulong), ("u", _InputUnion)]
+
+
+class IInputBackend(ABC):
+    """Abstract interface for synthetic mouse input."""
+
+    @abstractmethod
+    def click(self, x: int, y: int) -> None:
+        """Left-click once at screen coordinates (x, y)."""
+        pass
+
+    def click_many(self, points: Sequence[Point]) -> None:
+        """
+        Left-click a sequence of screen coordinates.
+
+        Backends that can submit several input events at once override this to
+        send the whole sequence in a single batch.
+
+        Args:
+            points: Screen coordinates to click, in order.
+        """
+        for x, y in points:
+            self.click(x, y)
+
+
+class Win32InputBackend(IInputBackend):
+    """Windows backend that batches move/down/up events through SendInput."""
+
+    _INPUT_MOUSE          = 0
+    _MOUSEEVENTF_MOVE     = 0x0001
+    _MOUSEEVENTF_LEFTDOWN = 0x0002
+    _MOUSEEVENTF_LEFTUP   = 0x0004
+    _MOUSEEVENTF_VIRTDESK = 0x4000
+    _MOUSEEVENTF_ABSOLUTE = 0x8000
+    _SM_XVIRTUALSCREEN    = 76
+    _SM_YVIRTUALSCREEN    = 77
+    _SM_CXVIRTUALSCREEN   = 78
+    _SM_CYVIRTUALSCREEN   = 79
+
+    def __init__(self):
+        """
+        Raises:
+            RuntimeError: If not running on Windows.
+        """
+        if not sys.platform.startswith("win"):
+            raise RuntimeError("Win32InputBackend is only available on Windows")
+        self._user32 = ctypes.windll.user32
+        self._user32.SendInput.argtypes = (ctypes.c_uint, ctypes.c_void_p, ctypes.c_int)
+        self._user32.SendInput.restype  = ctypes.c_uint
+
+    def _normalize(self, x: int, y: int) -> Point:
+        """Map screen pixels to the 0..65535 virtual-desktop range SendInput expects."""
+        left   = self._user32.GetSystemMetrics(self._SM_XVIRTUALSCREEN)
+        top    = self._user32.GetSystemMetrics(self._SM_YVIRTUALSCREEN)
+        width  = max(self._user32.GetSystemMetrics(self._SM_CXVIRTUALSCREEN) - 1, 1)
+        height = max(self._user32.GetSystemMetrics(self._SM_CYVIRTUALSCREEN) - 1, 1)
+        return (round((x - left) * 65535 / width),
+                round((y - top) * 65535 / height))
+
+    def _mouse_input(self, flags: int, dx: int = 0, dy: int = 0) -> _Input:
+        event              = _Input(type=self._INPUT_MOUSE)
+        event.u.mi.dx      = dx
+        event.u.mi.dy      = dy
+        event.u.mi.dwFlags = flags
+        return event
+
+    def click(self, x: int, y: int) -> None:
+        self.click_many([(x, y)])
+
+    def click_many(self, points: Sequence[Point]) -> None:
+        """
+        Send every move/down/up event of the sequence in one SendInput call.
+
+        Raises:
+            RuntimeError: If Windows rejected part of the batch (e.g. UIPI).
+        """
+        events = []
+        move   = self._MOUSEEVENTF_MOVE | self._MOUSEEVENTF_ABSOLUTE | self._MOUSEEVENTF_VIRTDESK
+        for x, y in points:
+            dx, dy = self._normalize(round(x), round(y))
+            events.append(self._mouse_input(move, dx, dy))
+            events.append(self._mouse_input(self._MOUSEEVENTF_LEFTDOWN))
+            events.append(self._mouse_input(self._MOUSEEVENTF_LEFTUP))
+        if not events:
+            return
+        batch = (_Input * len(events))(*events)
+        sent  = self._user32.SendInput(len(events), batch, ctypes.sizeof(_Input))
+        if sent != len(events):
+            raise RuntimeError(f"SendInput accepted {sent}/{len(events)} events")
+
+
+class XTestInputBackend(IInputBackend):
+    """Linux/X11 backend built on the XTest extension (python-xlib)."""
+
+    def __init__(self, display: str = None):
+        """
+        Args:
+            display: X display name; defaults to $DISPLAY.
+
+        Raises:
+            RuntimeError: If python-xlib is missing or the display has no XTest.
+        """
+        try:
+            from Xlib     import X, display as xdisplay
+            from Xlib.ext import xtest
+        except ImportError as e:
+            raise RuntimeError(f"XTestInputBackend requires python-xlib: {e}")
+        self._X       = X
+        self._xtest   = xtest
+        self._display = xdisplay.Display(display)
+        if not self._display.has_extension("XTEST"):
+            raise RuntimeError("X server does not support the XTEST extension")
+
+    def click(self, x: int, y: int) -> None:
+        self.click_many([(x, y)])
+
+    def click_many(self, points: Sequence[Point]) -> None:
+        """Queue all fake events and flush them to the X server once."""
+        for x, y in points:
+            self._xtest.fake_input(self._display, self._X.MotionNotify, x=round(x), y=round(y))
+            self._xtest.fake_input(self._display, self._X.ButtonPress, 1)
+            self._xtest.fake_input(self._display, self._X.ButtonRelease, 1)
+        self._display.sync()
+
+
+class RecordingInputBackend(IInputBackend):
+    """Backend that only records clicks; used for dry runs and tests."""
+
+    def __init__(self):
+        self._lock                 = Lock()
+        self._clicks : List[Point] = []
+        self.batches : List[int]   = []
+
+    def click(self, x: int, y: int) -> None:
+        self.click_many([(x, y)])
+
+    def click_many(self, points: Sequence[Point]) -> None:
+        with self._lock:
+            self._clicks.extend((round(x), round(y)) for x, y in points)
+            self.batches.append(len(points))
+
+    @property
+    def clicks(self) -> List[Point]:
+        """Return a copy of every recorded click, in order."""
+        with self._lock:
+            return list(self._clicks)
+
+    def clear(self) -> None:
+        """Forget recorded clicks."""
+        with self._lock:
+            self._clicks.clear()
+            self.batches.clear()
+
+
+class InputBackendFactory:
+    """Factory for creating input backend instances."""
+
+    @staticmethod
+    def create(backend_type: str = "auto") -> IInputBackend:
+        """
+        Create an input backend.
+
+        Args:
+            backend_type: 'win32', 'xtest', 'recording' or 'auto' (pick by platform).
+
+        Returns:
+            An IInputBackend instance.
+
+        Raises:
+            ValueError: If the backend type is unsupported.
+        """
+        if backend_type == "auto":
+            backend_type = "win32" if sys.platform.startswith("win") else "xtest"
+        if backend_type == "win32":
+            return Win32InputBackend()
+        if backend_type == "xtest":
+            return XTestInputBackend()
+        if backend_type == "recording":
+            return RecordingInputBackend()
+        raise ValueError(f"Unsupported input backend: {backend_type}")
@@ -0,0 +1,205 @@
+"""Pluggable keyboard event sources used by Listener."""
+
+import json
+import time
+from abc    import ABC, abstractmethod
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence
+
+
+class KeyEvent(NamedTuple):
+    """A key transition; `time` is in seconds (only relative times matter)."""
+    event_type: str
+    scan_code : int
+    time      : float = 0.0
+
+
+EventCallback = Callable[[KeyEvent], None]
+
+
+# Set-1 scan codes as reported by `keyboard` on Windows; enough for replaying hotkeys
+_DEFAULT_SCAN_CODES: Dict[str, List[int]] = {
+    'esc'  : [1] , 'tab'  : [15], 'enter': [28], 'space': [57],
+    'ctrl' : [29], 'shift': [42, 54], 'alt': [56],
+    **{str(digit): [2 + (digit - 1) % 10] for digit in range(10)},
+    **{key: [16 + idx] for idx, key in enumerate('qwertyuiop')},
+    **{key: [30 + idx] for idx, key in enumerate('asdfghjkl')},
+    **{key: [44 + idx] for idx, key in enumerate('zxcvbnm')},
+    **{f'f{idx + 1}': [59 + idx] for idx in range(10)},
+}
+
+
+class IKeySource(ABC):
+    """Abstract interface for a stream of key events."""
+
+    @abstractmethod
+    def start(self, callback: EventCallback) -> None:
+        """Start delivering events to `callback(event)`."""
+        pass
+
+    @abstractmethod
+    def stop(self) -> None:
+        """Stop delivering events."""
+        pass
+
+    @abstractmethod
+    def scan_codes(self, key_name: str) -> List[int]:
+        """
+        Return every scan code producing a key.
+
+        Raises:
+            ValueError: If the key name is unknown.
+        """
+        pass
+
+
+class KeyboardKeySource(IKeySource):
+    """Real keyboard events through the `keyboard` package's global hook."""
+
+    def __init__(self):
+        import keyboard
+        self._keyboard = keyboard
+        self._hook     = None
+
+    def start(self, callback: EventCallback) -> None:
+        self._hook = self._keyboard.hook(callback)
+
+    def stop(self) -> None:
+        hook, self._hook = self._hook, None
+        if hook is not None:
+            try:
+                self._keyboard.unhook(hook)
+            except (KeyError, ValueError):
+                pass
+
+    def scan_codes(self, key_name: str) -> List[int]:
+        return list(self._keyboard.key_to_scan_codes(key_name))
+
+
+class ReplayKeySource(IKeySource):
+    """
+    Scripted key events for headless tests and benchmarks.
+
+    Events are delivered synchronously by play(), either as fast as possible or
+    paced by their timestamps. Logs are JSON lines:
+        {"t": 0.125, "type": "down", "scan_code": 56}
+    where "key" may be given instead of "scan_code".
+    """
+
+    def __init__(self, events: Iterable[KeyEvent] = (), scan_code_map: Optional[Dict[str, List[int]]] = None):
+        """
+        Args:
+            events: Events replayed by play().
+            scan_code_map: Key name -> scan codes; defaults to a set-1 table.
+        """
+        self._events   : List[KeyEvent]          = list(events)
+        self._map      : Dict[str, List[int]]    = scan_code_map or _DEFAULT_SCAN_CODES
+        self._callback : Optional[EventCallback] = None
+
+    def start(self, callback: EventCallback) -> None:
+        self._callback = callback
+
+    def stop(self) -> None:
+        self._callback = None
+
+    def scan_codes(self, key_name: str) -> List[int]:
+        try:
+            return list(self._map[key_name])
+        except KeyError:
+            raise ValueError(f"Unknown key '{key_name}'") from None
+
+    @property
+    def events(self) -> List[KeyEvent]:
+        return self._events
+
+    def feed(self, event: KeyEvent) -> None:
+        """Deliver one event now."""
+        if self._callback is not None:
+            self._callback(event)
+
+    def play(self, realtime: bool = False, speed: float = 1.0) -> int:
+        """
+        Deliver the scripted events.
+
+        Args:
+            realtime: Sleep between events to honour their timestamps.
+            speed: Playback speed factor when realtime.
+
+        Returns:
+            Number of events delivered.
+        """
+        callback = self._callback
+        if callback is None:
+            return 0
+        if not realtime:
+            for event in self._events:
+                callback(event)
+            return len(self._events)
+
+        origin = time.perf_counter()
+        first  = self._events[0].time if self._events else 0.0
+        for event in self._events:
+            delay = (event.time - first) / speed - (time.perf_counter() - origin)
+            if delay > 0:
+                time.sleep(delay)
+            callback(event)
+        return len(self._events)
+
+    def chord(self, hotkey_str: str, at: float = 0.0, hold: float = 0.05) -> None:
+        """Append press/release events of a chord such as "alt+q"."""
+        codes = [self.scan_codes(name.strip().lower())[0] for name in hotkey_str.split('+') if name.strip()]
+        for code in codes:
+            self._events.append(KeyEvent('down', code, at))
+        for code in reversed(codes):
+            self._events.append(KeyEvent('up', code, at + hold))
+
+    @classmethod
+    def load(cls, path: str, scan_code_map: Optional[Dict[str, List[int]]] = None) -> "ReplayKeySource":
+        """
+        Read a timestamped event log.
+
+        Raises:
+            ValueError: If a line is malformed or names an unknown key.
+        """
+        source = cls(scan_code_map=scan_code_map)
+        with open(path, 'r') as f:
+            for number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                    code   = record['scan_code'] if 'scan_code' in record else source.scan_codes(record['key'])[0]
+                    source._events.append(KeyEvent(record['type'], int(code), float(record.get('t', 0.0))))
+                except (KeyError, TypeError, json.JSONDecodeError) as e:
+                    raise ValueError(f"{path}:{number}: invalid event: {e}") from None
+        return source
+
+    @staticmethod
+    def dump(events: Sequence[KeyEvent], path: str) -> None:
+        """Write events as a log readable by load()."""
+        with open(path, 'w') as f:
+            for event in events:
+                f.write(json.dumps({'t': event.time, 'type': event.event_type, 'scan_code': event.scan_code}) + '\n')
+
+
+class KeySourceFactory:
+    """Factory for creating key event sources."""
+
+    @staticmethod
+    def create(source_type: str = "keyboard") -> IKeySource:
+        """
+        Create a key event source.
+
+        Args:
+            source_type: 'keyboard' or 'replay'.
+
+        Returns:
+            An IKeySource instance.
+
+        Raises:
+            ValueError: If the source type is unsupported.
+        """
+        if source_type == "keyboard":
+            return KeyboardKeySource()
+        if source_type == "replay":
+            return ReplayKeySource()
+        raise ValueError(f"Unsupported key source: {source_type}")
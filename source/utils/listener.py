@@ -1,14 +1,16 @@
-import keyboard
 import time
+import queue
 import logging
+from collections        import deque
 from threading          import Thread, Lock, Event
-from concurrent.futures import ThreadPoolExecutor
-from typing             import Set, Callable
+from typing             import Callable, Deque, Dict, Iterable, List, Optional, Set
+from common.tracing     import tracer
+from .key_source        import IKeySource, KeySourceFactory
 
 # Type aliases for clarity
 ScanCode      = int
 BitIndex      = int
-HashKey       = str
+ChordMask     = int
 CallbackFunc  = Callable[[], None]
 
 
@@ -27,50 +29,127 @@ class HotkeyError(Exception):
     pass
 
 
+class _Hotkey:
+    """A registered chord: its callback and dispatch settings."""
+
+    __slots__ = ("name", "callback", "priority", "debounce_ns", "policy", "last_ns", "queued")
+
+    def __init__(self, name: str, callback: CallbackFunc, priority: bool, debounce_ns: int, policy: str):
+        self.name        = name
+        self.callback    = callback
+        self.priority    = priority
+        self.debounce_ns = debounce_ns
+        self.policy      = policy
+        self.last_ns     = -debounce_ns
+        self.queued      = False
+
+
+class _Lane:
+    """A callback queue with its own workers and wait-time statistics."""
+
+    def __init__(self, name: str, workers: int, maxsize: int, history: int = 1024):
+        self.name    = name
+        self.queue   = queue.Queue(maxsize=maxsize)
+        self.waits   : Deque[int] = deque(maxlen=history)
+        self.dropped = 0
+        self.merged  = 0
+        self.threads = [Thread(target=self._run, name=f'Hotkey{name.title()}-{i}', daemon=True)
+                        for i in range(workers)]
+        for thread in self.threads:
+            thread.start()
+
+    def _run(self) -> None:
+        while (job := self.queue.get()) is not None:
+            hotkey, enqueued_ns = job
+            hotkey.queued       = False
+            started_ns          = time.perf_counter_ns()
+            self.waits.append(started_ns - enqueued_ns)
+            tracer.record(f'hotkey.wait:{self.name}', enqueued_ns, started_ns)
+            try:
+                hotkey.callback()
+            except Exception as e:
+                logging.error(f"Hotkey '{hotkey.name}' callback failed: {e}")
+
+    def close(self) -> None:
+        for _ in self.threads:
+            try:
+                self.queue.put_nowait(None)
+            except queue.Full:
+                # Workers are busy with a full queue; drop queued jobs to make room
+                try:
+                    self.queue.get_nowait()
+                except queue.Empty:
+                    pass
+                self.queue.put_nowait(None)
+
+
 class Listener:
     """
     Listens for keyboard hotkey combinations and executes callbacks in a thread-safe manner.
 
+    Every key used by a hotkey owns one bit; all scan codes of that key map to the
+    same bit in a precomputed table. The hook callback keeps an integer mask of the
+    pressed keys up to date and matches chords with a single int-keyed dict lookup,
+    so no key-name resolution or hashing happens per event.
+
     Features:
-        - Background thread for non-blocking key event monitoring.
-        - Thread-safe hotkey registration and removal.
-        - Non-blocking callback execution via a thread pool.
+        - Event hook instead of a polling thread; matching runs inside the hook.
+        - Thread-safe hotkey registration and removal (copy-on-write tables).
+        - Per-chord debounce windows.
+        - A priority lane with its own worker for critical actions (stop, quit),
+          so they never wait behind a slow callback.
+        - A bounded normal lane; when a chord is already queued it is merged
+          ("merge") and when the queue is full new jobs are dropped.
+        - Queue wait-time metrics per lane (see metrics()).
         - Graceful shutdown and resource cleanup.
         - Context manager support for RAII-style usage.
     """
 
-    def __init__(self, max_callback_workers: int = 1, debounce_ms: int = 500):
+    MAX_KEYS = 64
+    POLICIES = ("merge", "drop")
+
+    def __init__(
+        self,
+        max_callback_workers: int                  = 1,
+        debounce_ms         : int                  = 500,
+        max_queue           : int                  = 8,
+        source              : Optional[IKeySource] = None
+    ):
         """
         Initialize the hotkey listener.
 
         Args:
-            max_callback_workers: Maximum number of threads for callback execution.
-            debounce_ms: Minimum time (ms) between consecutive callback triggers.
+            max_callback_workers: Number of threads running normal callbacks.
+            debounce_ms: Default minimum time (ms) between two triggers of the same hotkey.
+            max_queue: Capacity of the normal callback queue.
+            source: Key event source; defaults to the global `keyboard` hook.
 
         Raises:
-            ValueError: If max_callback_workers or debounce_ms is invalid.
+            ValueError: If max_callback_workers, debounce_ms or max_queue is invalid.
         """
         if max_callback_workers < 1:
             raise ValueError("max_callback_workers must be at least 1")
         if debounce_ms < 0:
             raise ValueError("debounce_ms must be non-negative")
-
-        self._pressed_keys          = set()
-        self._hotkey_map            = {}
-        self._key_to_bit_index      = {}
-        self._available_bit_indices = set(range(64))
+        if max_queue < 1:
+            raise ValueError("max_queue must be at least 1")
+
+        # Read lock-free by the hook; replaced (never mutated) under _lock
+        self._scan_code_bits        : Dict[ScanCode, ChordMask]    = {}
+        self._hotkey_map            : Dict[ChordMask, _Hotkey]      = {}
+        self._key_bits              : Dict[str, ChordMask]          = {}
+        self._key_refs              : Dict[str, int]                = {}
+        self._available_bit_indices : Set[BitIndex]                 = set(range(self.MAX_KEYS))
+        self._pressed_mask          = 0
         self._lock                  = Lock()
         self._stop_event            = Event()
-        self._last_callback_time    = 0
         self._debounce_ms           = debounce_ms
 
-        self._callback_executor     = ThreadPoolExecutor(
-            max_workers             = max_callback_workers,
-            thread_name_prefix      = 'HotkeyCallback'
-        )
-        self._listener_thread       = Thread(target=self._listen_loop, daemon=True)
-        self._listener_thread.start()
-        logging.debug("Hotkey listener thread started")
+        self._normal_lane           = _Lane('normal'  , max_callback_workers, max_queue)
+        self._priority_lane         = _Lane('priority', 1, 0)
+        self._source                = source or KeySourceFactory.create("keyboard")
+        self._source.start(self._on_event)
+        logging.debug("Hotkey hook installed")
 
     def __enter__(self):
         """Enable context manager usage."""
@@ -80,126 +159,161 @@ class Listener:
         """Ensure cleanup on context exit."""
         self.stop()
 
-    def _get_scan_code(self, key_name: str) -> ScanCode:
+    def _get_scan_codes(self, key_name: str) -> List[ScanCode]:
         """
-        Convert a key name to its primary scan code.
+        Convert a key name to all of its scan codes.
 
         Args:
             key_name: The key name (e.g., 'ctrl', 'left ctrl').
 
         Returns:
-            The primary scan code.
+            Every scan code producing the key.
 
         Raises:
             HotkeyError: If the key name is invalid or has no scan code.
         """
         try:
-            scan_codes = keyboard.key_to_scan_codes(key_name)
-            if len(scan_codes) > 1:
-                logging.debug(f"Multiple scan codes for '{key_name}': {scan_codes}, using {scan_codes[0]}")
-            return scan_codes[0]
+            scan_codes = self._source.scan_codes(key_name)
         except ValueError as e:
             raise HotkeyError(f"Invalid key name '{key_name}': {e}")
         except Exception as e:
             raise HotkeyError(f"Error resolving scan code for '{key_name}': {e}")
+        if not scan_codes:
+            raise HotkeyError(f"Key '{key_name}' has no scan code")
+        return scan_codes
 
-    def _calculate_hash(self, scan_codes: Set[ScanCode]) -> HashKey:
-        """
-        Calculate a hash for a set of scan codes.
-
-        Args:
-            scan_codes: Set of scan codes to hash.
-
-        Returns:
-            A hexadecimal string representing the hash.
+    @staticmethod
+    def _parse_hotkey(hotkey_str: str) -> List[str]:
+        key_names = [key.strip().lower() for key in hotkey_str.split('+') if key.strip()]
+        if not key_names:
+            raise HotkeyError("Hotkey string cannot be empty")
+        return key_names
+
+    def _rebuild_scan_code_table(self) -> None:
+        """Recompute the scan-code -> bit table from the registered keys (holding _lock)."""
+        table = {}
+        for name, bit in self._key_bits.items():
+            for scan_code in self._get_scan_codes(name):
+                table[scan_code] = table.get(scan_code, 0) | bit
+        self._scan_code_bits = table
+
+    def _chord_mask(self, key_names: Iterable[str]) -> ChordMask:
+        mask = 0
+        for name in key_names:
+            mask |= self._key_bits[name]
+        return mask
+
+    def _on_event(self, event) -> None:
         """
-        current_hash = 0
-        for code in scan_codes:
-            if code in self._key_to_bit_index:
-                current_hash |= (1 << self._key_to_bit_index[code])
-        return hex(current_hash)
-
-    def _listen_loop(self):
+        Keyboard hook: update the pressed mask and dispatch a matching chord.
+        Runs on the keyboard library's hook thread and must stay cheap.
         """
-        Monitor keyboard events and trigger callbacks for hotkey matches.
-        Uses ThreadPoolExecutor to run callbacks non-blocking.
+        bit = self._scan_code_bits.get(event.scan_code)
+        if not bit:
+            return
+        if event.event_type == 'down':
+            if self._pressed_mask & bit:
+                return  # Auto-repeat
+            self._pressed_mask |= bit
+            hotkey = self._hotkey_map.get(self._pressed_mask)
+            if hotkey is not None:
+                self._dispatch(hotkey)
+        elif event.event_type == 'up':
+            self._pressed_mask &= ~bit
+
+    def _dispatch(self, hotkey: _Hotkey) -> None:
+        now = time.perf_counter_ns()
+        if now - hotkey.last_ns < hotkey.debounce_ns or self._stop_event.is_set():
+            return
+        hotkey.last_ns = now
+        lane           = self._priority_lane if hotkey.priority else self._normal_lane
+        if hotkey.queued and hotkey.policy == "merge":
+            lane.merged += 1
+            logging.debug(f"Hotkey '{hotkey.name}' already queued, merged")
+            return
+        try:
+            hotkey.queued = True
+            lane.queue.put_nowait((hotkey, now))
+            logging.info(f"Hotkey triggered: '{hotkey.name}' ({lane.name})")
+        except queue.Full:
+            hotkey.queued = False
+            lane.dropped += 1
+            logging.warning(f"Callback queue full, dropping hotkey '{hotkey.name}'")
+
+    def metrics(self) -> Dict[str, Dict[str, float]]:
         """
-        logging.debug("Listener loop started")
-
-        while not self._stop_event.is_set():
-            try:
-                event = keyboard.read_event(suppress=False)
-
-                if not event.name or event.event_type not in ('down', 'up'):
-                    continue
+        Return queue statistics per lane.
 
-                scan_code = self._get_scan_code(event.name.lower())
-                with self._lock:
-                    is_relevant_key = scan_code in self._key_to_bit_index
-
-                    if event.event_type == 'down' and is_relevant_key and scan_code not in self._pressed_keys:
-                        self._pressed_keys.add(scan_code)
-                        logging.debug(f"Key down: {event.name}, pressed_keys={self._pressed_keys}")
-
-                        current_hash  = self._calculate_hash(self._pressed_keys)
-                        current_time  = time.time() * 1000
-
-                        if current_hash in self._hotkey_map and (current_time - self._last_callback_time) >= self._debounce_ms:
-                            callback_to_run = self._hotkey_map[current_hash]
-                            logging.info(f"Hotkey triggered: hash={current_hash}")
-
-                            try:
-                                self._callback_executor.submit(callback_to_run)
-                                logging.debug(f"Submitted callback for hash={current_hash}")
-                                self._last_callback_time = current_time
-                            except RuntimeError:
-                                logging.warning(f"Callback queue full, skipping hotkey: hash={current_hash}")
-
-                    elif event.event_type == 'up' and scan_code in self._pressed_keys:
-
-                        self._pressed_keys.discard(scan_code)
-                        logging.debug(f"Key up: {event.name}, pressed_keys={self._pressed_keys}")
-
-            except HotkeyError:
-                continue
-            except Exception as e:
-                if not self._stop_event.is_set():
-                    logging.error(f"Listener loop error: {e}")
-                    time.sleep(0.05)
-
-        logging.debug("Listener loop stopped")
-        self._callback_executor.shutdown(wait=False, cancel_futures=True)
-
-    def add_hotkey(self, hotkey_str: str, callback: CallbackFunc) -> None:
+        Returns:
+            For each lane: number of dispatched jobs in the recent history, p50/p99/max
+            queue wait (ms), jobs currently queued, dropped and merged counts.
+        """
+        result = {}
+        for lane in (self._priority_lane, self._normal_lane):
+            waits = sorted(lane.waits)
+            pick  = lambda q: waits[min(int(q * len(waits)), len(waits) - 1)] / 1e6 if waits else 0.0
+            result[lane.name] = {
+                'n'      : len(waits),
+                'p50'    : pick(0.50),
+                'p99'    : pick(0.99),
+                'max'    : waits[-1] / 1e6 if waits else 0.0,
+                'queued' : lane.queue.qsize(),
+                'dropped': lane.dropped,
+                'merged' : lane.merged,
+            }
+        return result
+
+    def add_hotkey(
+        self,
+        hotkey_str : str,
+        callback   : CallbackFunc,
+        priority   : bool          = False,
+        debounce_ms: Optional[int] = None,
+        policy     : str           = "merge"
+    ) -> None:
         """
         Register a hotkey combination and its callback.
 
         Args:
             hotkey_str: Hotkey string (e.g., "ctrl+shift+a").
             callback: Function to call when the hotkey is pressed.
+            priority: Run on the priority lane (for critical actions like stop/quit).
+            debounce_ms: Debounce window of this hotkey; defaults to the listener's.
+            policy: "merge" ignores a trigger while the hotkey is still queued,
+                "drop" queues every trigger (dropped only when the queue is full).
 
         Raises:
             HotkeyError: If the hotkey string is invalid or contains invalid keys.
+            ValueError: If the policy or debounce_ms is invalid.
         """
-        key_names = [key.strip().lower() for key in hotkey_str.split('+') if key.strip()]
-        if not key_names:
-            raise HotkeyError("Hotkey string cannot be empty")
-        scan_codes = set()
+        if policy not in self.POLICIES:
+            raise ValueError(f"Unsupported policy '{policy}'. Valid options: {', '.join(self.POLICIES)}")
+        debounce_ms = self._debounce_ms if debounce_ms is None else debounce_ms
+        if debounce_ms < 0:
+            raise ValueError("debounce_ms must be non-negative")
+        key_names = self._parse_hotkey(hotkey_str)
         with self._lock:
             for name in key_names:
-                scan_code = self._get_scan_code(name)
-                scan_codes.add(scan_code)
-                if scan_code not in self._key_to_bit_index:
-                    if not self._available_bit_indices:
-                        raise HotkeyError("Maximum number of unique keys (64) reached")
-                    bit_index = min(self._available_bit_indices)
-                    self._available_bit_indices.remove(bit_index)
-                    self._key_to_bit_index[scan_code] = bit_index
-            target_hash = self._calculate_hash(scan_codes)
-            if target_hash in self._hotkey_map:
-                logging.warning(f"Overwriting callback for hotkey '{hotkey_str}' (hash={target_hash})")
-            self._hotkey_map[target_hash] = callback
-            logging.info(f"Registered hotkey '{hotkey_str}' (hash={target_hash})")
+                self._get_scan_codes(name)  # Validate before touching any table
+            new_keys = [name for name in dict.fromkeys(key_names) if name not in self._key_bits]
+            if len(new_keys) > len(self._available_bit_indices):
+                raise HotkeyError(f"Maximum number of unique keys ({self.MAX_KEYS}) reached")
+            for name in new_keys:
+                bit_index = min(self._available_bit_indices)
+                self._available_bit_indices.remove(bit_index)
+                self._key_bits[name] = 1 << bit_index
+            if new_keys:
+                self._rebuild_scan_code_table()
+
+            mask = self._chord_mask(key_names)
+            if mask in self._hotkey_map:
+                logging.warning(f"Overwriting callback for hotkey '{hotkey_str}' (mask={mask:#x})")
+            else:
+                for name in set(key_names):
+                    self._key_refs[name] = self._key_refs.get(name, 0) + 1
+            hotkey           = _Hotkey(hotkey_str, callback, priority, debounce_ms * 1_000_000, policy)
+            self._hotkey_map = {**self._hotkey_map, mask: hotkey}
+            logging.info(f"Registered hotkey '{hotkey_str}' (mask={mask:#x})")
 
     def remove_hotkey(self, hotkey_str: str) -> None:
         """
@@ -211,18 +325,27 @@ class Listener:
         Raises:
             HotkeyError: If the hotkey string is invalid or not registered.
         """
-        key_names = [key.strip().lower() for key in hotkey_str.split('+') if key.strip()]
-        if not key_names:
-            raise HotkeyError("Hotkey string cannot be empty")
-        scan_codes = set()
+        key_names = self._parse_hotkey(hotkey_str)
         with self._lock:
-            for name in key_names:
-                scan_codes.add(self._get_scan_code(name))
-            target_hash = self._calculate_hash(scan_codes)
-            if target_hash not in self._hotkey_map:
-                raise HotkeyError(f"Hotkey '{hotkey_str}' (hash={target_hash}) not found")
-            del self._hotkey_map[target_hash]
-            logging.info(f"Removed hotkey '{hotkey_str}' (hash={target_hash})")
+            if any(name not in self._key_bits for name in key_names):
+                raise HotkeyError(f"Hotkey '{hotkey_str}' not found")
+            mask = self._chord_mask(key_names)
+            if mask not in self._hotkey_map:
+                raise HotkeyError(f"Hotkey '{hotkey_str}' (mask={mask:#x}) not found")
+            hotkey_map = dict(self._hotkey_map)
+            del hotkey_map[mask]
+            self._hotkey_map = hotkey_map
+
+            # Release the bits of keys no other hotkey uses
+            for name in set(key_names):
+                self._key_refs[name] -= 1
+                if not self._key_refs[name]:
+                    del self._key_refs[name]
+                    bit                 = self._key_bits.pop(name)
+                    self._pressed_mask &= ~bit
+                    self._available_bit_indices.add(bit.bit_length() - 1)
+            self._rebuild_scan_code_table()
+            logging.info(f"Removed hotkey '{hotkey_str}' (mask={mask:#x})")
 
     def signal_stop(self) -> None:
         """
@@ -239,12 +362,13 @@ class Listener:
         Stop the listener and clean up resources.
         """
         self.signal_stop()
-        if self._listener_thread.is_alive():
-            logging.debug("Waiting for listener thread to stop")
-            self._listener_thread.join(timeout=1.0)
-            if self._listener_thread.is_alive():
-                logging.warning("Listener thread did not stop within timeout")
-        self._callback_executor.shutdown(wait=False, cancel_futures=True)
+        source, self._source = getattr(self, '_source', None), None
+        if source is not None:
+            source.stop()
+        for lane in (getattr(self, '_normal_lane', None), getattr(self, '_priority_lane', None)):
+            if lane is not None:
+                lane.close()
+        self._normal_lane = self._priority_lane = None
         logging.debug("Listener stopped")
 
     def __del__(self):
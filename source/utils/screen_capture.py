@@ -11,6 +11,9 @@ def dark_image(image: np.ndarray, alpha: float = 1.0) -> np.ndarray:
     """
     Apply a darkening filter to an image by scaling pixel values.
 
+    Uses a saturating per-pixel scale (no convolution), so the cost is a single
+    pass over the buffer regardless of the image size.
+
     Args:
         image: Input image as a numpy array (e.g., RGB uint8).
         alpha: Scaling factor (0.0 to 1.0 darkens, >1.0 brightens).
@@ -26,16 +29,13 @@ def dark_image(image: np.ndarray, alpha: float = 1.0) -> np.ndarray:
     if alpha < 0:
         raise ValueError("Alpha must be non-negative")
 
-    kernel      = np.array([[0,   0,   0],
-                            [0, alpha, 0],
-                            [0,   0,   0]])
-    result      = cv2.filter2D(image, -1, kernel)
-    return result
+    return cv2.convertScaleAbs(image, alpha=alpha, beta=0)
 
 
 def get_screen_size():
+    """Return the primary monitor size (SM_CXSCREEN, SM_CYSCREEN), the monitor ScreenCapture grabs."""
     user32 = windll.user32
-    return user32.GetSystemMetrics(78), user32.GetSystemMetrics(79)
+    return user32.GetSystemMetrics(0), user32.GetSystemMetrics(1)
 
 
 class ScreenCapture(tk.Toplevel):
@@ -61,6 +61,8 @@ class ScreenCapture(tk.Toplevel):
         self.__rect     = None
         self.__img      = None
         self.__img_tk   = None
+        self.__scale_x  = 1.0
+        self.__scale_y  = 1.0
 
         self.__w, self.__h = get_screen_size()
         self.attributes('-topmost', True)
@@ -77,7 +79,18 @@ class ScreenCapture(tk.Toplevel):
         monitor     = self.sct.monitors[1]  # Primary monitor
         screenshot  = np.array(self.sct.grab(monitor))
         self.__img  = cv2.cvtColor(screenshot, cv2.COLOR_BGR2RGB)
-        darkened    = dark_image(self.__img, 0.6)
+
+        # mss makes the process DPI-aware, so window and grab are normally both
+        # in physical pixels of the primary monitor. If the process is not
+        # DPI-aware the window is in logical pixels: scale the preview once so
+        # Tk never has to resample it while dragging.
+        img_h, img_w  = self.__img.shape[:2]
+        preview       = self.__img
+        if (img_w, img_h) != (self.__w, self.__h) and self.__w > 0 and self.__h > 0:
+            self.__scale_x = img_w / self.__w
+            self.__scale_y = img_h / self.__h
+            preview        = cv2.resize(self.__img, (self.__w, self.__h), interpolation=cv2.INTER_AREA)
+        darkened      = dark_image(preview, 0.6)
         self.__img_tk = ImageTk.PhotoImage(Image.fromarray(darkened))
         self.canvas.create_image(0, 0, image=self.__img_tk, anchor='nw')
 
@@ -94,6 +107,17 @@ class ScreenCapture(tk.Toplevel):
         """
         self.__start_x = event.x
         self.__start_y = event.y
+        if self.__rect is None:
+            self.__rect = self.canvas.create_rectangle(
+                event.x,
+                event.y,
+                event.x,
+                event.y,
+                outline = '#ffffff',
+                width   = 3
+            )
+        else:
+            self.canvas.coords(self.__rect, event.x, event.y, event.x, event.y)
 
     def __on_mouse_hold(self, event: tk.Event) -> None:
         """
@@ -102,18 +126,9 @@ class ScreenCapture(tk.Toplevel):
         Args:
             event: Tkinter event with mouse coordinates.
         """
-        if self.__start_x is None or self.__start_y is None:
+        if self.__start_x is None or self.__start_y is None or self.__rect is None:
             return
-        if self.__rect:
-            self.canvas.delete(self.__rect)
-        self.__rect = self.canvas.create_rectangle(
-            self.__start_x,
-            self.__start_y,
-            event.x,
-            event.y,
-            outline = '#ffffff',
-            width   = 3
-        )
+        self.canvas.coords(self.__rect, self.__start_x, self.__start_y, event.x, event.y)
 
     def __on_mouse_release(self, event: tk.Event) -> None:
         """
@@ -122,21 +137,27 @@ class ScreenCapture(tk.Toplevel):
         Args:
             event: Tkinter event with mouse coordinates.
         """
-        x1 = min(self.__start_x, event.x)
-        y1 = min(self.__start_y, event.y)
-        x2 = max(self.__start_x, event.x)
-        y2 = max(self.__start_y, event.y)
+        if self.__start_x is None or self.__start_y is None:
+            return
+        # Map canvas (logical) coordinates back to the captured (physical) image
+        x1 = round(min(self.__start_x, event.x) * self.__scale_x)
+        y1 = round(min(self.__start_y, event.y) * self.__scale_y)
+        x2 = round(max(self.__start_x, event.x) * self.__scale_x)
+        y2 = round(max(self.__start_y, event.y) * self.__scale_y)
 
         self.__start_x = x1
         self.__start_y = y1
 
         self.canvas.delete("all")
+        self.__rect = None
         self.after(100, self.__screenshot, x1, y1, x2, y2)
 
     def __screenshot(self, x1: int, y1: int, x2: int, y2: int) -> None:
         """
         Crop the selected region and close the window.
 
+        Coordinates are in captured-image pixels (already scaled for HiDPI).
+
         Args:
             x1: Left x-coordinate of the rectangle.
             y1: Top y-coordinate of the rectangle.
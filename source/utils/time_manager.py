@@ -0,0 +1,152 @@
+import time
+import statistics
+from collections    import deque
+from contextlib     import contextmanager
+from typing         import Deque, Dict, Iterator, Optional
+from common.tracing import tracer
+
+
+NS_PER_MS = 1_000_000
+
+
+class TimeManager:
+    """
+    Tracks our game clock in milliseconds and the overhead spent outside the engine.
+
+    A turn starts when the opponent's move is captured and ends once our move is
+    confirmed on the board. Every turn records how long each phase took (capture,
+    detect, engine, click, ...); everything except the engine phase is overhead the
+    engine cannot see. The time handed to the engine is the clock minus a safety
+    margin learned from the recent overhead (mean + k * stdev).
+    """
+
+    ENGINE_PHASE = 'engine'
+
+    def __init__(
+        self,
+        match_ms         : int,
+        increment_ms     : int           = 0,
+        turn_ms          : Optional[int] = None,
+        min_margin_ms    : int           = 30,
+        initial_margin_ms: int           = 200,
+        margin_sigma     : float         = 3.0,
+        history          : int           = 32
+    ):
+        """
+        Initialize the clock.
+
+        Args:
+            match_ms: Total time for the game in milliseconds.
+            increment_ms: Time added after each of our moves in milliseconds.
+            turn_ms: Optional per-turn limit in milliseconds.
+            min_margin_ms: Lower bound of the safety margin.
+            initial_margin_ms: Margin used until overhead has been measured.
+            margin_sigma: Standard deviations of overhead added to its mean.
+            history: Number of recent turns used to learn the margin.
+
+        Raises:
+            ValueError: If match_ms is not positive or increment_ms is negative.
+        """
+        if match_ms <= 0:
+            raise ValueError("match_ms must be positive")
+        if increment_ms < 0:
+            raise ValueError("increment_ms must be non-negative")
+
+        self.__clock_ns        = int(match_ms) * NS_PER_MS
+        self.__increment_ns    = int(increment_ms) * NS_PER_MS
+        self.__turn_ms         = turn_ms
+        self.__min_margin_ms   = min_margin_ms
+        self.__initial_margin  = initial_margin_ms
+        self.__margin_sigma    = margin_sigma
+        self.__overheads_ms    : Deque[float]            = deque(maxlen=history)
+        self.__phases_ms       : Dict[str, Deque[float]] = {}
+        self.__history         = history
+        self.__turn_start_ns   : Optional[int]           = None
+        self.__turn_phases_ns  : Dict[str, int]          = {}
+
+    @staticmethod
+    def now_ns() -> int:
+        """Return the monotonic clock used for all measurements."""
+        return time.perf_counter_ns()
+
+    def start_turn(self, at_ns: Optional[int] = None) -> None:
+        """
+        Start our clock.
+
+        Args:
+            at_ns: When the turn began (e.g. the start of the capture that saw the
+                opponent's move); defaults to now.
+        """
+        self.__turn_start_ns  = self.now_ns() if at_ns is None else at_ns
+        self.__turn_phases_ns = {}
+
+    def in_turn(self) -> bool:
+        """Return True while our clock is running."""
+        return self.__turn_start_ns is not None
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """
+        Measure a phase of the game loop.
+
+        Phases measured outside a turn (e.g. polling captures while waiting for the
+        opponent) are recorded in the statistics but are not charged to the clock.
+        """
+        start = self.now_ns()
+        try:
+            yield
+        finally:
+            end     = self.now_ns()
+            elapsed = end - start
+            tracer.record(f'phase:{name}', start, end)
+            self.__phases_ms.setdefault(name, deque(maxlen=self.__history)).append(elapsed / NS_PER_MS)
+            if self.__turn_start_ns is not None:
+                self.__turn_phases_ns[name] = self.__turn_phases_ns.get(name, 0) + elapsed
+
+    def end_turn(self) -> int:
+        """
+        Stop our clock, charge the elapsed time and add the increment.
+
+        Returns:
+            Elapsed turn time in milliseconds.
+        """
+        if self.__turn_start_ns is None:
+            return 0
+        elapsed_ns           = self.now_ns() - self.__turn_start_ns
+        engine_ns            = self.__turn_phases_ns.get(self.ENGINE_PHASE, 0)
+        self.__clock_ns     += self.__increment_ns - elapsed_ns
+        self.__overheads_ms.append(max(elapsed_ns - engine_ns, 0) / NS_PER_MS)
+        self.__turn_start_ns = None
+        return elapsed_ns // NS_PER_MS
+
+    def time_left(self) -> int:
+        """Return the remaining clock in milliseconds, including a running turn."""
+        clock_ns = self.__clock_ns
+        if self.__turn_start_ns is not None:
+            clock_ns -= self.now_ns() - self.__turn_start_ns
+        return max(clock_ns // NS_PER_MS, 0)
+
+    def margin(self) -> int:
+        """Return the safety margin (ms) learned from the overhead of recent turns."""
+        if not self.__overheads_ms:
+            return self.__initial_margin
+        mean  = statistics.fmean(self.__overheads_ms)
+        stdev = statistics.pstdev(self.__overheads_ms) if len(self.__overheads_ms) > 1 else mean
+        return max(int(mean + self.__margin_sigma * stdev), self.__min_margin_ms)
+
+    def engine_time_left(self) -> int:
+        """Return the time_left (ms) to hand to the engine."""
+        return max(self.time_left() - self.margin(), 0)
+
+    def engine_turn_time(self) -> Optional[int]:
+        """Return the turn_time (ms) to hand to the engine, or None without a turn limit."""
+        if self.__turn_ms is None:
+            return None
+        return max(min(self.__turn_ms, self.time_left()) - self.margin(), 0)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Return mean/max (ms) of each phase over the recent history."""
+        return {
+            name: {'mean': statistics.fmean(samples), 'max': max(samples), 'n': len(samples)}
+            for name, samples in self.__phases_ms.items() if samples
+        }